@@ -0,0 +1,467 @@
+"""
+Nearest-Neighbor Index
+
+02_k_nearest_neighbors.ipynb classifies Social Network Ads with
+KNeighborsClassifier(n_neighbors=5): every prediction scans the stored
+training set, and trying another K means another full query. This module
+keeps neighbors in a reusable, persistent index:
+
+1. Exact backends: KD-tree and ball tree (scikit-learn), plus brute force
+   for reference
+2. An approximate backend: a forest of random-projection trees with
+   median splits; candidates from every tree's leaf are re-ranked exactly
+3. Queries are answered in fixed-size batches, so memory stays bounded
+4. Built indexes are saved as .npy / joblib files and reopened
+   memory-mapped, without rebuilding or loading the data into RAM
+5. k_sweep queries once at the largest K and scores every smaller K from
+   the same neighbor lists
+
+Usage:
+    python neighbor_index.py
+    python neighbor_index.py --points 200000 --dims 16
+"""
+
+import json
+import time
+import argparse
+import joblib
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from typing import Dict, Sequence, Tuple, Union
+from sklearn.neighbors import KDTree, BallTree
+
+DEFAULT_DATA_PATH = Path(__file__).parent.parent / "data" / "social_network_ads.csv"
+
+BACKENDS = ('kd_tree', 'ball_tree', 'brute', 'rp_forest')
+
+
+class RandomProjectionForest:
+    """
+    Approximate neighbor search with random-projection trees (Annoy-style)
+    """
+
+    def __init__(self, n_trees: int = 16, leaf_size: int = 64, random_state: int = 0):
+        """
+        Initialize the forest
+
+        Args:
+            n_trees (int): Trees searched per query; more trees raise recall
+            leaf_size (int): Largest leaf; candidates per query are at most n_trees * leaf_size
+            random_state (int): Random seed
+        """
+        self.n_trees = n_trees
+        self.leaf_size = leaf_size
+        self.random_state = random_state
+        self.trees = []
+
+    def fit(self, X: np.ndarray) -> 'RandomProjectionForest':
+        """
+        Build the trees
+
+        Args:
+            X (np.ndarray): Indexed points
+
+        Returns:
+            RandomProjectionForest: self
+        """
+        rng = np.random.default_rng(self.random_state)
+        self.trees = [self._build_tree(X, rng) for _ in range(self.n_trees)]
+        return self
+
+    def _build_tree(self, X: np.ndarray, rng: np.random.Generator) -> Dict[str, np.ndarray]:
+        """One tree as flat arrays: split directions / thresholds, children and padded leaves"""
+        directions, thresholds, children, leaves = [], [], [], []
+        stack = [(np.arange(len(X)), None, 0)]
+        while stack:
+            members, parent, side = stack.pop()
+            if len(members) <= self.leaf_size:
+                node = -len(leaves) - 1
+                leaves.append(np.pad(members, (0, self.leaf_size - len(members)), constant_values=-1))
+            else:
+                # Split on a random direction at the median, so every leaf is between half and full size
+                direction = rng.normal(size=X.shape[1])
+                projection = X[members] @ direction
+                threshold = np.median(projection)
+                left = projection <= threshold
+                if left.all() or not left.any():
+                    left = np.zeros(len(members), dtype=bool)
+                    left[rng.permutation(len(members))[:len(members) // 2]] = True
+
+                node = len(directions)
+                directions.append(direction)
+                thresholds.append(threshold)
+                children.append([0, 0])
+                stack.append((members[left], node, 0))
+                stack.append((members[~left], node, 1))
+
+            if parent is not None:
+                children[parent][side] = node
+            elif node < 0:
+                # The whole data set fits in one leaf
+                directions.append(np.zeros(X.shape[1]))
+                thresholds.append(np.inf)
+                children.append([node, node])
+
+        return {
+            'directions': np.array(directions),
+            'thresholds': np.array(thresholds),
+            'children': np.array(children, dtype=np.int64),
+            'leaves': np.array(leaves, dtype=np.int64)
+        }
+
+    def candidates(self, Q: np.ndarray) -> np.ndarray:
+        """
+        Candidate neighbors of a query batch: the members of its leaf in every tree
+
+        Args:
+            Q (np.ndarray): Query points
+
+        Returns:
+            np.ndarray: (n_queries, n_trees * leaf_size) indices, -1 for padding
+        """
+        found = []
+        for tree in self.trees:
+            node = np.zeros(len(Q), dtype=np.int64)
+            active = node >= 0
+            while active.any():
+                rows = np.flatnonzero(active)
+                current = node[rows]
+                goes_right = np.einsum('ij,ij->i', Q[rows], tree['directions'][current]) > tree['thresholds'][current]
+                node[rows] = tree['children'][current, goes_right.astype(np.int64)]
+                active = node >= 0
+            found.append(tree['leaves'][-node - 1])
+        return np.concatenate(found, axis=1)
+
+    def arrays(self) -> Dict[str, np.ndarray]:
+        """All tree arrays, keyed for saving"""
+        return {f'tree{i}_{name}': array for i, tree in enumerate(self.trees) for name, array in tree.items()}
+
+    def load_arrays(self, arrays: Dict[str, np.ndarray]):
+        """Restore trees from arrays()"""
+        self.trees = [{name: arrays[f'tree{i}_{name}'] for name in ('directions', 'thresholds', 'children', 'leaves')}
+                      for i in range(self.n_trees)]
+
+
+class NeighborIndex:
+    """
+    Persistent k-nearest-neighbor index with exact and approximate backends
+    """
+
+    def __init__(self, backend: str = 'kd_tree', leaf_size: int = 40, n_trees: int = 16, rp_leaf_size: int = 64,
+                 batch_size: int = 4096, random_state: int = 0):
+        """
+        Initialize the index
+
+        Args:
+            backend (str): 'kd_tree', 'ball_tree', 'brute' or 'rp_forest' (approximate)
+            leaf_size (int): Leaf size of the KD / ball tree
+            n_trees (int): Trees of the random-projection forest
+            rp_leaf_size (int): Leaf size of the random-projection trees
+            batch_size (int): Queries answered per batch
+            random_state (int): Seed of the random-projection forest
+        """
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown backend '{backend}'. Choose from {list(BACKENDS)}")
+
+        self.backend = backend
+        self.leaf_size = leaf_size
+        self.n_trees = n_trees
+        self.rp_leaf_size = rp_leaf_size
+        self.batch_size = batch_size
+        self.random_state = random_state
+
+        self.X = None
+        self.labels = None
+        self.classes = None
+        self._tree = None
+        self._forest = None
+
+    def fit(self, X: np.ndarray, y: np.ndarray = None) -> 'NeighborIndex':
+        """
+        Build the index
+
+        Args:
+            X (np.ndarray): Points to index (already scaled)
+            y (np.ndarray): Optional labels, needed for predict and k_sweep
+
+        Returns:
+            NeighborIndex: self
+        """
+        self.X = np.ascontiguousarray(X, dtype=np.float64)
+        if y is not None:
+            self.classes, self.labels = np.unique(y, return_inverse=True)
+
+        if self.backend == 'kd_tree':
+            self._tree = KDTree(self.X, leaf_size=self.leaf_size)
+        elif self.backend == 'ball_tree':
+            self._tree = BallTree(self.X, leaf_size=self.leaf_size)
+        elif self.backend == 'rp_forest':
+            self._forest = RandomProjectionForest(self.n_trees, self.rp_leaf_size, self.random_state).fit(self.X)
+        return self
+
+    def kneighbors(self, Q: np.ndarray, k: int = 5) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Nearest neighbors of many queries, answered in batches
+
+        Args:
+            Q (np.ndarray): Query points
+            k (int): Neighbors per query
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Euclidean distances and indices, nearest first
+        """
+        Q = np.atleast_2d(np.asarray(Q, dtype=np.float64))
+        distances = np.empty((len(Q), k))
+        indices = np.empty((len(Q), k), dtype=np.int64)
+        for start in range(0, len(Q), self.batch_size):
+            batch = slice(start, start + self.batch_size)
+            distances[batch], indices[batch] = self._query_batch(Q[batch], k)
+        return distances, indices
+
+    def _query_batch(self, Q: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Neighbors of one query batch"""
+        if self._tree is not None:
+            return self._tree.query(Q, k=k)
+
+        if self.backend == 'brute':
+            candidates = None
+            squared = _squared_distances(Q, self.X)
+        else:
+            candidates = self._forest.candidates(Q)
+            squared = np.full(candidates.shape, np.inf)
+            valid = candidates >= 0
+            rows = np.nonzero(valid)[0]
+            squared[valid] = np.einsum('ij,ij->i', Q[rows] - self.X[candidates[valid]],
+                                       Q[rows] - self.X[candidates[valid]])
+            # A point found by several trees counts once
+            order = np.argsort(candidates, axis=1)
+            ordered = np.take_along_axis(candidates, order, axis=1)
+            repeated = np.zeros_like(valid)
+            repeated[:, 1:] = ordered[:, 1:] == ordered[:, :-1]
+            np.put_along_axis(squared, order, np.where(repeated, np.inf, np.take_along_axis(squared, order, axis=1)),
+                              axis=1)
+
+        k_available = min(k, squared.shape[1])
+        nearest = np.argpartition(squared, k_available - 1, axis=1)[:, :k_available]
+        nearest_squared = np.take_along_axis(squared, nearest, axis=1)
+        order = np.argsort(nearest_squared, axis=1, kind='stable')
+        nearest = np.take_along_axis(nearest, order, axis=1)
+        nearest_squared = np.take_along_axis(nearest_squared, order, axis=1)
+        if candidates is not None:
+            nearest = np.where(np.isfinite(nearest_squared), np.take_along_axis(candidates, nearest, axis=1), -1)
+
+        if k_available < k:
+            nearest = np.pad(nearest, ((0, 0), (0, k - k_available)), constant_values=-1)
+            nearest_squared = np.pad(nearest_squared, ((0, 0), (0, k - k_available)), constant_values=np.inf)
+        return np.sqrt(np.maximum(nearest_squared, 0)), nearest
+
+    def predict(self, Q: np.ndarray, k: int = 5) -> np.ndarray:
+        """
+        Majority vote of the k nearest labels (ties go to the smallest class, as in scikit-learn)
+
+        Args:
+            Q (np.ndarray): Query points
+            k (int): Neighbors per vote
+
+        Returns:
+            np.ndarray: Predicted labels
+        """
+        _, indices = self.kneighbors(Q, k)
+        return self.classes[vote_counts(self._neighbor_labels(indices), len(self.classes))[-1].argmax(axis=1)]
+
+    def _neighbor_labels(self, indices: np.ndarray) -> np.ndarray:
+        """Class codes of neighbor indices (-1 where the approximate backend found too few)"""
+        if self.labels is None:
+            raise ValueError("The index was built without labels")
+        return np.where(indices >= 0, self.labels[np.maximum(indices, 0)], -1)
+
+    def save(self, directory: Union[str, Path]):
+        """
+        Write the index to a directory
+
+        Args:
+            directory: Output directory
+        """
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        np.save(directory / 'X.npy', self.X)
+        if self.labels is not None:
+            np.save(directory / 'labels.npy', self.labels)
+            np.save(directory / 'classes.npy', self.classes)
+        if self._tree is not None:
+            joblib.dump(self._tree, directory / 'tree.joblib')
+        if self._forest is not None:
+            for name, array in self._forest.arrays().items():
+                np.save(directory / f'{name}.npy', array)
+
+        settings = {key: getattr(self, key) for key in ('backend', 'leaf_size', 'n_trees', 'rp_leaf_size',
+                                                       'batch_size', 'random_state')}
+        (directory / 'index.json').write_text(json.dumps(settings))
+
+    @classmethod
+    def load(cls, directory: Union[str, Path], mmap: bool = True) -> 'NeighborIndex':
+        """
+        Open a saved index
+
+        Args:
+            directory: Directory written by save()
+            mmap (bool): Memory-map the arrays instead of reading them into RAM
+
+        Returns:
+            NeighborIndex: Ready-to-query index
+        """
+        directory = Path(directory)
+        mmap_mode = 'r' if mmap else None
+        index = cls(**json.loads((directory / 'index.json').read_text()))
+        index.X = np.load(directory / 'X.npy', mmap_mode=mmap_mode)
+        if (directory / 'labels.npy').exists():
+            index.labels = np.load(directory / 'labels.npy', mmap_mode=mmap_mode)
+            index.classes = np.load(directory / 'classes.npy', allow_pickle=True)
+        if (directory / 'tree.joblib').exists():
+            index._tree = joblib.load(directory / 'tree.joblib', mmap_mode=mmap_mode)
+        if index.backend == 'rp_forest':
+            index._forest = RandomProjectionForest(index.n_trees, index.rp_leaf_size, index.random_state)
+            index._forest.load_arrays({path.stem: np.load(path, mmap_mode=mmap_mode)
+                                       for path in directory.glob('tree*_*.npy')})
+        return index
+
+
+def _squared_distances(Q: np.ndarray, X: np.ndarray) -> np.ndarray:
+    """Pairwise squared Euclidean distances"""
+    squared = (Q ** 2).sum(axis=1)[:, None] + (X ** 2).sum(axis=1)[None, :] - 2 * Q @ X.T
+    return np.maximum(squared, 0)
+
+
+def vote_counts(neighbor_labels: np.ndarray, n_classes: int) -> np.ndarray:
+    """
+    Votes per class for every neighborhood size 1..K at once
+
+    Args:
+        neighbor_labels (np.ndarray): (n, K) class codes, nearest first (-1 is ignored)
+        n_classes (int): Number of classes
+
+    Returns:
+        np.ndarray: (K, n, n_classes) vote counts using the first k neighbors
+    """
+    one_hot = (neighbor_labels[:, :, None] == np.arange(n_classes)).astype(np.int32)
+    return np.cumsum(one_hot, axis=1).transpose(1, 0, 2)
+
+
+def k_sweep(index: NeighborIndex, X: np.ndarray, y: np.ndarray, k_values: Sequence[int] = range(1, 26),
+            exclude_self: bool = False) -> pd.DataFrame:
+    """
+    Accuracy for many K from a single neighbor query at the largest K
+
+    With an exact backend the accuracies equal KNeighborsClassifier's for
+    every K, up to the order of equidistant neighbors.
+
+    Args:
+        index (NeighborIndex): Index built with labels
+        X (np.ndarray): Validation points
+        y (np.ndarray): Validation labels
+        k_values (Sequence[int]): Neighborhood sizes to score
+        exclude_self (bool): X is the indexed set itself (leave-one-out); drop each point's own match
+
+    Returns:
+        pd.DataFrame: k, accuracy and error rate
+    """
+    k_values = sorted(k_values)
+    k_max = k_values[-1] + int(exclude_self)
+    _, indices = index.kneighbors(X, k_max)
+    if exclude_self:
+        own = indices == np.arange(len(X))[:, None]
+        # Drop the own match, or the farthest neighbor when duplicates hid it
+        own[~own.any(axis=1), -1] = True
+        indices = indices[~own].reshape(len(X), k_max - 1)
+
+    counts = vote_counts(index._neighbor_labels(indices), len(index.classes))
+    predictions = index.classes[counts[np.array(k_values) - 1].argmax(axis=2)]
+    accuracy = (predictions == np.asarray(y)[None, :]).mean(axis=1)
+    return pd.DataFrame({'k': k_values, 'accuracy': accuracy, 'error_rate': 1 - accuracy})
+
+
+def load_ads(path: Union[str, Path] = DEFAULT_DATA_PATH) -> Tuple:
+    """
+    Social Network Ads, split and scaled as in the notebook
+
+    Args:
+        path: CSV file with Age, EstimatedSalary, Purchased
+
+    Returns:
+        Tuple: X_train, X_test, y_train, y_test and the fitted StandardScaler
+    """
+    from sklearn.model_selection import train_test_split
+    from sklearn.preprocessing import StandardScaler
+
+    dataset = pd.read_csv(path)
+    X = dataset.iloc[:, :-1].to_numpy(dtype=np.float64)
+    y = dataset.iloc[:, -1].to_numpy()
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.25, random_state=0)
+    sc = StandardScaler()
+    return sc.fit_transform(X_train), sc.transform(X_test), y_train, y_test, sc
+
+
+def benchmark(n_points: int = 200_000, n_dims: int = 16, n_queries: int = 2000, k: int = 10,
+              random_state: int = 0) -> pd.DataFrame:
+    """
+    Build time, query throughput and recall of every backend on synthetic customers
+
+    Args:
+        n_points (int): Indexed points
+        n_dims (int): Features per point
+        n_queries (int): Query points
+        k (int): Neighbors per query
+        random_state (int): Random seed
+
+    Returns:
+        pd.DataFrame: One row per backend
+    """
+    from sklearn.datasets import make_blobs
+
+    X, _ = make_blobs(n_points + n_queries, n_features=n_dims, centers=50, cluster_std=2.0,
+                      random_state=random_state)
+    X, Q = X[:n_points], X[n_points:]
+
+    rows, exact = [], None
+    for backend in ('brute', 'kd_tree', 'ball_tree', 'rp_forest'):
+        start_time = time.perf_counter()
+        index = NeighborIndex(backend, batch_size=512).fit(X)
+        build_seconds = time.perf_counter() - start_time
+
+        start_time = time.perf_counter()
+        _, indices = index.kneighbors(Q, k)
+        query_seconds = time.perf_counter() - start_time
+
+        exact = indices if exact is None else exact
+        recall = np.mean([len(np.intersect1d(found, truth)) / k for found, truth in zip(indices, exact)])
+        rows.append({'backend': backend, 'build_seconds': build_seconds,
+                     'queries_per_second': n_queries / query_seconds, f'recall@{k}': recall})
+    return pd.DataFrame(rows).round(3)
+
+
+def main():
+    """
+    Command line entry point: K-sweep on Social Network Ads and a backend benchmark
+    """
+    parser = argparse.ArgumentParser(description="Indexed nearest-neighbor search and K-sweep")
+    parser.add_argument('--data', default=str(DEFAULT_DATA_PATH))
+    parser.add_argument('--points', type=int, default=200_000)
+    parser.add_argument('--dims', type=int, default=16)
+    parser.add_argument('--k-max', type=int, default=25)
+    args = parser.parse_args()
+
+    X_train, X_test, y_train, y_test, sc = load_ads(args.data)
+    index = NeighborIndex('kd_tree').fit(X_train, y_train)
+    sweep = k_sweep(index, X_test, y_test, range(1, args.k_max + 1))
+    best = sweep.loc[sweep['accuracy'].idxmax()]
+    print(f"🎯 K-sweep 1..{args.k_max} from one query: best k={int(best['k'])} "
+          f"(accuracy {best['accuracy'] * 100:.1f} %), k=5 accuracy "
+          f"{sweep.loc[sweep['k'] == 5, 'accuracy'].iloc[0] * 100:.1f} %")
+    print(f"🔮 Age 30, salary 87000 -> {index.predict(sc.transform([[30, 87000]]))[0]}")
+
+    print(f"⚡ {args.points:,} points x {args.dims} features:")
+    print(benchmark(args.points, args.dims).to_string(index=False))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,352 @@
+"""
+Incremental Association Rule Store
+
+This module keeps association rules up to date as new days of baskets
+arrive, instead of re-mining all transactions on every run. It follows
+the FUP (Fast UPdate) approach:
+
+1. The store tracks the support count of every itemset whose support is at
+   least margin * min_support, a little below the publishing threshold
+2. When a delta arrives, tracked counts are updated by counting only the
+   delta's transactions
+3. An untracked itemset can only reach the tracking threshold if it is
+   frequent within the delta itself. Only those candidates are re-counted
+   over the stored history
+4. Rules are regenerated from the tracked counts, sorted by lift, and
+   indexed by antecedent item for fast lookups
+
+Usage:
+    python rule_store.py --days 7
+"""
+
+import time
+import argparse
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+try:
+    from .market_basket import (ItemEncoder, TransactionMatrix, DEFAULT_DATA_PATH, load_transactions,
+                                mine_frequent_itemsets, mine_rules, generate_rules, popcount_rows)
+except ImportError:
+    from market_basket import (ItemEncoder, TransactionMatrix, DEFAULT_DATA_PATH, load_transactions,
+                               mine_frequent_itemsets, mine_rules, generate_rules, popcount_rows)
+
+
+class RuleStore:
+    """
+    Association rules maintained incrementally over daily deltas
+    """
+
+    def __init__(self, min_support: float = 0.003, min_confidence: float = 0.2,
+                 min_lift: float = 3.0, max_length: Optional[int] = 2, margin: float = 0.5):
+        """
+        Initialize an empty store
+
+        Args:
+            min_support (float): Minimum support of published rules
+            min_confidence (float): Minimum confidence of published rules
+            min_lift (float): Minimum lift of published rules
+            max_length (int): Largest itemset size
+            margin (float): Itemsets are tracked down to margin * min_support;
+                a lower margin means fewer history re-counts per update
+        """
+        if not 0 < margin <= 1:
+            raise ValueError("margin must be in (0, 1]")
+
+        self.min_support = min_support
+        self.min_confidence = min_confidence
+        self.min_lift = min_lift
+        self.max_length = max_length
+        self.track_support = margin * min_support
+
+        self.encoder = ItemEncoder()
+        self.history = []
+        self.n_transactions = 0
+        self.counts = {}
+
+        self.rules = pd.DataFrame()
+        self._antecedent_index = {}
+
+    def update(self, delta: TransactionMatrix) -> Dict[str, int]:
+        """
+        Add a batch of transactions and refresh the rules
+
+        Args:
+            delta (TransactionMatrix): New transactions
+
+        Returns:
+            Dict: Sizes of the update and of the candidate re-check
+        """
+        start_time = time.perf_counter()
+        delta = self._encode(delta)
+        n_old = self.n_transactions
+        self.n_transactions += delta.n_transactions
+
+        # 1. Tracked itemsets: add their counts within the delta
+        tracked = list(self.counts)
+        if tracked:
+            for itemset, count in zip(tracked, count_itemsets(delta, tracked)):
+                self.counts[itemset] += int(count)
+
+        # 2. Untracked itemsets frequent within the delta are the only ones
+        # that can have crossed the tracking threshold; re-count them over history
+        if delta.n_transactions:
+            delta_frequent = mine_frequent_itemsets(delta, self.track_support, self.max_length)
+        else:
+            delta_frequent = pd.DataFrame({'itemset': [], 'count': []})
+        candidates = [itemset for itemset in map(_sorted_tuple, delta_frequent['itemset'])
+                      if itemset not in self.counts]
+        if candidates:
+            history_counts = np.zeros(len(candidates), dtype=np.int64)
+            if n_old:
+                for matrix in self.history:
+                    history_counts += count_itemsets(matrix, candidates)
+            delta_counts = dict(zip(map(_sorted_tuple, delta_frequent['itemset']), delta_frequent['count']))
+            for itemset, count in zip(candidates, history_counts):
+                self.counts[itemset] = int(count) + int(delta_counts[itemset])
+
+        # 3. Stop tracking itemsets that fell below the tracking threshold
+        min_track_count = self.track_support * self.n_transactions - 1e-9
+        dropped = [itemset for itemset, count in self.counts.items() if count < min_track_count]
+        for itemset in dropped:
+            del self.counts[itemset]
+
+        self.history.append(delta)
+        n_rules_before = len(self.rules)
+        self.publish()
+
+        return {
+            'transactions': delta.n_transactions,
+            'total_transactions': self.n_transactions,
+            'tracked_itemsets': len(self.counts),
+            'rechecked_candidates': len(candidates),
+            'dropped_itemsets': len(dropped),
+            'rules': len(self.rules),
+            'rules_change': len(self.rules) - n_rules_before,
+            'seconds': round(time.perf_counter() - start_time, 4)
+        }
+
+    def publish(self) -> pd.DataFrame:
+        """
+        Regenerate the lift-sorted rule table and its antecedent index
+
+        Returns:
+            pd.DataFrame: Current rules
+        """
+        min_count = self.min_support * self.n_transactions - 1e-9
+        frequent = [(itemset, count) for itemset, count in self.counts.items() if count >= min_count]
+        itemsets = pd.DataFrame({
+            'itemset': [itemset for itemset, _ in frequent],
+            'count': np.array([count for _, count in frequent], dtype=np.int64)
+        })
+
+        self.rules = generate_rules(itemsets, self.encoder.items, max(self.n_transactions, 1),
+                                    self.min_confidence, self.min_lift)
+        self._antecedent_index = build_item_index(self.rules['antecedent'])
+        return self.rules
+
+    def rules_with_antecedent(self, item: str) -> pd.DataFrame:
+        """
+        Get the rules whose antecedent contains an item
+
+        Args:
+            item (str): Item name
+
+        Returns:
+            pd.DataFrame: Matching rules, sorted by lift
+        """
+        rows = self._antecedent_index.get(item)
+        if rows is None:
+            return self.rules.iloc[:0]
+        return self.rules.iloc[rows]
+
+    def _encode(self, matrix: TransactionMatrix) -> TransactionMatrix:
+        """Re-encode a matrix with the store's item ids"""
+        mapping = np.array([self.encoder.encode(item) for item in matrix.items], dtype=np.int32)
+        indices = mapping[matrix.indices] if len(mapping) else matrix.indices
+        return TransactionMatrix(matrix.indptr, indices, self.encoder.items)
+
+    def save(self, path: Union[str, Path]):
+        """
+        Save the store (history, tracked counts and settings) to an .npz file
+
+        Args:
+            path: Output file
+        """
+        indptr, indices, day_sizes = _join_history(self.history)
+        width = max((len(itemset) for itemset in self.counts), default=1)
+        itemsets = np.full((len(self.counts), width), -1, dtype=np.int32)
+        for row, itemset in enumerate(self.counts):
+            itemsets[row, :len(itemset)] = itemset
+
+        settings = [self.min_support, self.min_confidence, self.min_lift,
+                    -1 if self.max_length is None else self.max_length,
+                    self.track_support / self.min_support]
+        np.savez(path, items=np.array(self.encoder.items, dtype=str), indptr=indptr, indices=indices,
+                 day_sizes=day_sizes, itemsets=itemsets,
+                 counts=np.array(list(self.counts.values()), dtype=np.int64),
+                 settings=np.array(settings, dtype=np.float64))
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> 'RuleStore':
+        """
+        Load a store saved with save()
+
+        Args:
+            path: .npz file
+
+        Returns:
+            RuleStore: Store with its rules published
+        """
+        with np.load(path) as data:
+            min_support, min_confidence, min_lift, max_length, margin = data['settings'].tolist()
+            store = cls(min_support, min_confidence, min_lift,
+                        None if max_length < 0 else int(max_length), margin)
+            store.encoder = ItemEncoder(data['items'].tolist())
+
+            indptr, indices = data['indptr'], data['indices']
+            starts = np.concatenate([[0], np.cumsum(data['day_sizes'])])
+            for start, stop in zip(starts[:-1], starts[1:]):
+                day_indptr = indptr[start:stop + 1]
+                store.history.append(TransactionMatrix(day_indptr - day_indptr[0],
+                                                       indices[day_indptr[0]:day_indptr[-1]],
+                                                       store.encoder.items))
+            store.n_transactions = int(starts[-1])
+
+            for row, count in zip(data['itemsets'], data['counts']):
+                store.counts[tuple(int(item) for item in row if item >= 0)] = int(count)
+
+        store.publish()
+        return store
+
+
+def count_itemsets(matrix: TransactionMatrix, itemsets: List[Tuple[int, ...]],
+                   block_size: int = 1024) -> np.ndarray:
+    """
+    Count the transactions containing each itemset with bitset ANDs
+
+    Args:
+        matrix (TransactionMatrix): Transactions
+        itemsets (List[Tuple[int, ...]]): Itemsets of item ids
+        block_size (int): Itemsets intersected at once (bounds memory)
+
+    Returns:
+        np.ndarray: Count per itemset
+    """
+    counts = np.zeros(len(itemsets), dtype=np.int64)
+    if not itemsets or matrix.n_transactions == 0:
+        return counts
+
+    items = np.unique(np.concatenate([np.asarray(itemset) for itemset in itemsets]))
+    items = items[items < matrix.n_items]
+    bitsets = matrix.to_bitsets(items)
+    empty = np.zeros((1, bitsets.shape[1]), dtype=np.uint64)
+    bitsets = np.vstack([bitsets, empty])
+
+    lengths = np.array([len(itemset) for itemset in itemsets])
+    for length in np.unique(lengths):
+        rows = np.flatnonzero(lengths == length)
+        # Items never seen in this matrix map to the empty bitset
+        members = np.array([itemsets[row] for row in rows]).reshape(len(rows), length)
+        positions = np.searchsorted(items, members)
+        positions = np.where((positions < len(items)) & (items[np.minimum(positions, len(items) - 1)] == members),
+                             positions, len(items))
+
+        for start in range(0, len(rows), block_size):
+            block = positions[start:start + block_size]
+            joint = bitsets[block[:, 0]]
+            for k in range(1, length):
+                joint = joint & bitsets[block[:, k]]
+            counts[rows[start:start + block_size]] = popcount_rows(joint)
+
+    return counts
+
+
+def build_item_index(itemsets: pd.Series) -> Dict[str, np.ndarray]:
+    """
+    Build an inverted index from item to the rows whose itemset contains it
+
+    Args:
+        itemsets (pd.Series): Tuple of item names per row
+
+    Returns:
+        Dict[str, np.ndarray]: Row positions per item, in row order
+    """
+    exploded = itemsets.reset_index(drop=True).explode()
+    if exploded.empty:
+        return {}
+    return {item: rows.to_numpy() for item, rows in
+            pd.Series(exploded.index, index=exploded.to_numpy()).groupby(level=0)}
+
+
+def _sorted_tuple(itemset) -> Tuple[int, ...]:
+    """Canonical key of an itemset"""
+    return tuple(sorted(int(item) for item in itemset))
+
+
+def _join_history(history: List[TransactionMatrix]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Concatenate daily matrices (with one indptr per day) for saving"""
+    if not history:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int32), np.zeros(0, dtype=np.int64)
+
+    offsets = np.cumsum([0] + [len(matrix.indices) for matrix in history])
+    indptr = np.concatenate([matrix.indptr[:-1].astype(np.int64) + offset
+                             for matrix, offset in zip(history, offsets)] + [[offsets[-1]]])
+    indices = np.concatenate([matrix.indices for matrix in history])
+    day_sizes = np.array([matrix.n_transactions for matrix in history], dtype=np.int64)
+    return indptr, indices, day_sizes
+
+
+def split_days(matrix: TransactionMatrix, n_days: int) -> List[TransactionMatrix]:
+    """
+    Split a matrix into consecutive blocks to simulate daily deltas
+
+    Args:
+        matrix (TransactionMatrix): Transactions
+        n_days (int): Number of blocks
+
+    Returns:
+        List[TransactionMatrix]: One matrix per day
+    """
+    bounds = np.linspace(0, matrix.n_transactions, n_days + 1).astype(int)
+    days = []
+    for start, stop in zip(bounds[:-1], bounds[1:]):
+        indptr = matrix.indptr[start:stop + 1]
+        days.append(TransactionMatrix(indptr - indptr[0], matrix.indices[indptr[0]:indptr[-1]], matrix.items))
+    return days
+
+
+def main():
+    """
+    Command line entry point: replay the dataset as daily deltas
+    """
+    parser = argparse.ArgumentParser(description="Maintain association rules over daily basket deltas")
+    parser.add_argument('--data', default=str(DEFAULT_DATA_PATH))
+    parser.add_argument('--days', type=int, default=7)
+    parser.add_argument('--margin', type=float, default=0.5)
+    parser.add_argument('--item', default='pasta', help="Item to look up in the antecedent index")
+    args = parser.parse_args()
+
+    matrix = load_transactions(args.data)
+    store = RuleStore(margin=args.margin)
+
+    for day, delta in enumerate(split_days(matrix, args.days), 1):
+        summary = store.update(delta)
+        print(f"📅 Day {day}: +{summary['transactions']:,} transactions | "
+              f"{summary['rechecked_candidates']} re-checked | {summary['rules']} rules "
+              f"({summary['rules_change']:+d}) in {summary['seconds']}s")
+
+    full = mine_rules(matrix)
+    def rule_keys(rules):
+        return {(frozenset(a), frozenset(c)) for a, c in zip(rules['antecedent'], rules['consequent'])}
+
+    same = rule_keys(full) == rule_keys(store.rules)
+    print(f"{'✅' if same else '❌'} Incremental rules {'match' if same else 'differ from'} a full re-mine")
+
+    print(f"\n🔎 Rules with '{args.item}' in the antecedent:")
+    print(store.rules_with_antecedent(args.item).to_string())
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,292 @@
+"""
+K-Means Elbow Sweep
+
+This module replaces the notebook's elbow loop, which cold-starts a new
+KMeans for every k one after another:
+
+1. Each k is warm-started from the k-1 solution plus one new centroid
+   chosen by k-means++ (D²) sampling, so later fits converge in a few steps
+2. The k range is split into contiguous blocks that run in parallel worker
+   processes; each block warm-starts internally
+3. A Mini-Batch mode handles customer tables with millions of rows
+4. WCSS, a sampled silhouette score and timings are returned per k
+
+Workers read the data through a memory-mapped .npy file instead of
+receiving a pickled copy each.
+
+Usage:
+    python kmeans_sweep.py --k-max 10
+    python kmeans_sweep.py --synthetic 2000000 --mini-batch --workers 4
+"""
+
+import os
+import time
+import tempfile
+import argparse
+import numpy as np
+import pandas as pd
+import multiprocessing as mp
+from pathlib import Path
+from typing import Dict, List, Sequence, Union
+from sklearn.cluster import KMeans, MiniBatchKMeans
+from sklearn.metrics import silhouette_score
+from threadpoolctl import threadpool_limits
+
+DEFAULT_DATA_PATH = Path(__file__).parent.parent / "data" / "mall_customers.csv"
+
+# Annual Income (k$), Spending Score (1-100), as in the notebooks
+DEFAULT_COLUMNS = [3, 4]
+
+
+def load_customers(path: Union[str, Path] = DEFAULT_DATA_PATH,
+                   columns: Sequence[Union[int, str]] = DEFAULT_COLUMNS) -> np.ndarray:
+    """
+    Load the clustering features of a customer table
+
+    Args:
+        path: CSV file
+        columns: Column positions or names to use as features
+
+    Returns:
+        np.ndarray: C-contiguous float64 feature matrix
+    """
+    data = pd.read_csv(path)
+    if all(isinstance(c, int) for c in columns):
+        features = data.iloc[:, list(columns)]
+    else:
+        features = data[list(columns)]
+    return np.ascontiguousarray(features.to_numpy(dtype=np.float64))
+
+
+def next_center(X: np.ndarray, centers: np.ndarray, rng: np.random.Generator,
+                n_trials: int = None) -> np.ndarray:
+    """
+    Choose one more centroid with greedy k-means++ (D²) sampling
+
+    Args:
+        X (np.ndarray): Points to sample from (a subsample for large tables)
+        centers (np.ndarray): Current centroids
+        rng (np.random.Generator): Random generator
+        n_trials (int): Candidates tried; the one lowering the potential most wins
+
+    Returns:
+        np.ndarray: The new centroid
+    """
+    n_trials = n_trials or 2 + int(np.log(len(centers) + 1))
+    closest = _squared_distances(X, centers).min(axis=1)
+    total = closest.sum()
+    if total <= 0:
+        return X[rng.integers(len(X))]
+
+    candidates = rng.choice(len(X), size=n_trials, p=closest / total)
+    candidate_distances = _squared_distances(X, X[candidates])
+    potentials = np.minimum(closest[:, None], candidate_distances).sum(axis=0)
+    return X[candidates[np.argmin(potentials)]]
+
+
+def _squared_distances(X: np.ndarray, centers: np.ndarray) -> np.ndarray:
+    """Squared Euclidean distances between points and centers"""
+    distances = (X * X).sum(axis=1)[:, None] - 2 * X @ centers.T + (centers * centers).sum(axis=1)[None, :]
+    return np.maximum(distances, 0)
+
+
+def sweep_block(X: np.ndarray, k_values: Sequence[int], mini_batch: bool = False,
+                batch_size: int = 4096, silhouette_sample: int = 10_000,
+                init_sample: int = 100_000, random_state: int = 42,
+                max_iter: int = 300, n_init: int = 1) -> List[Dict]:
+    """
+    Fit consecutive k values, warm-starting each from the previous solution
+
+    Args:
+        X (np.ndarray): Feature matrix
+        k_values (Sequence[int]): Increasing k values
+        mini_batch (bool): Use MiniBatchKMeans instead of KMeans
+        batch_size (int): Mini-batch size
+        silhouette_sample (int): Points used for the silhouette score
+        init_sample (int): Points used to choose new centroids
+        random_state (int): Random seed
+        max_iter (int): Maximum iterations per fit
+        n_init (int): Fits per k: the warm start plus n_init - 1 cold k-means++
+            restarts, keeping the lowest WCSS (warm starts can settle in a
+            worse local minimum than a cold start)
+
+    Returns:
+        List[Dict]: k, wcss, silhouette, n_iter, fit_seconds, silhouette_seconds, warm_start
+    """
+    rng = np.random.default_rng(random_state + k_values[0])
+    sample = X if len(X) <= init_sample else X[np.sort(rng.choice(len(X), init_sample, replace=False))]
+
+    results = []
+    centers = None
+    for k in k_values:
+        warm_start = centers is not None and len(centers) == k - 1
+        inits = ['k-means++'] * n_init
+        if warm_start:
+            inits[0] = np.vstack([centers, next_center(sample, centers, rng)])
+
+        start_time = time.perf_counter()
+        model = None
+        for i, init in enumerate(inits):
+            if mini_batch:
+                candidate = MiniBatchKMeans(n_clusters=k, init=init, n_init=1, batch_size=batch_size,
+                                            max_iter=max_iter, random_state=random_state + i)
+            else:
+                candidate = KMeans(n_clusters=k, init=init, n_init=1, max_iter=max_iter,
+                                   random_state=random_state + i)
+            candidate.fit(X)
+            if model is None or candidate.inertia_ < model.inertia_:
+                model = candidate
+        fit_seconds = time.perf_counter() - start_time
+        centers = model.cluster_centers_
+
+        start_time = time.perf_counter()
+        if 1 < k < len(X):
+            silhouette = silhouette_score(X, model.labels_, sample_size=min(silhouette_sample, len(X)),
+                                          random_state=random_state)
+        else:
+            silhouette = np.nan
+        silhouette_seconds = time.perf_counter() - start_time
+
+        results.append({
+            'k': k,
+            'wcss': float(model.inertia_),
+            'silhouette': float(silhouette),
+            'n_iter': int(model.n_iter_),
+            'fit_seconds': round(fit_seconds, 4),
+            'silhouette_seconds': round(silhouette_seconds, 4),
+            'warm_start': warm_start
+        })
+    return results
+
+
+def _sweep_block_worker(data_path: str, k_values: List[int], threads: int, kwargs: Dict) -> List[Dict]:
+    """Worker process entry: memory-map the data and sweep one block"""
+    X = np.load(data_path, mmap_mode='r')
+    with threadpool_limits(threads):
+        return sweep_block(np.asarray(X), k_values, **kwargs)
+
+
+def elbow_sweep(X: np.ndarray, k_values: Sequence[int] = range(1, 11), n_workers: int = 1,
+                mini_batch: bool = False, batch_size: int = 4096,
+                silhouette_sample: int = 10_000, random_state: int = 42,
+                max_iter: int = 300, n_init: int = 1) -> pd.DataFrame:
+    """
+    Sweep k for the elbow method
+
+    With one worker every k warm-starts from k-1. With several workers the
+    k range is split into contiguous blocks (each cold-starts its first k)
+    that run in separate processes.
+
+    Args:
+        X (np.ndarray): Feature matrix
+        k_values (Sequence[int]): k values to fit
+        n_workers (int): Worker processes
+        mini_batch (bool): Use MiniBatchKMeans (for tables with millions of rows)
+        batch_size (int): Mini-batch size
+        silhouette_sample (int): Points used for the silhouette score
+        random_state (int): Random seed
+        max_iter (int): Maximum iterations per fit
+        n_init (int): Fits per k (warm start + cold restarts)
+
+    Returns:
+        pd.DataFrame: One row per k
+    """
+    X = np.ascontiguousarray(X, dtype=np.float64)
+    k_values = sorted(k_values)
+
+    kwargs = {'mini_batch': mini_batch, 'batch_size': batch_size, 'silhouette_sample': silhouette_sample,
+              'random_state': random_state, 'max_iter': max_iter, 'n_init': n_init}
+
+    n_workers = max(1, min(n_workers, len(k_values)))
+    if n_workers == 1:
+        results = sweep_block(X, k_values, **kwargs)
+    else:
+        blocks = [block.tolist() for block in np.array_split(k_values, n_workers)]
+        threads = max(1, (os.cpu_count() or 1) // n_workers)
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            data_path = os.path.join(tmp_dir, 'X.npy')
+            np.save(data_path, X)
+
+            context = mp.get_context('spawn')
+            with context.Pool(n_workers) as pool:
+                block_results = pool.starmap(_sweep_block_worker,
+                                             [(data_path, block, threads, kwargs) for block in blocks])
+        results = [row for block in block_results for row in block]
+
+    return pd.DataFrame(results).sort_values('k', ignore_index=True)
+
+
+def cold_sweep(X: np.ndarray, k_values: Sequence[int] = range(1, 11), random_state: int = 42) -> pd.DataFrame:
+    """
+    Reference sweep: the notebook's serial, cold-started loop
+
+    Args:
+        X (np.ndarray): Feature matrix
+        k_values (Sequence[int]): k values to fit
+        random_state (int): Random seed
+
+    Returns:
+        pd.DataFrame: k, wcss, n_iter and fit_seconds per k
+    """
+    results = []
+    for k in k_values:
+        start_time = time.perf_counter()
+        kmeans = KMeans(n_clusters=k, init='k-means++', random_state=random_state).fit(X)
+        results.append({'k': k, 'wcss': float(kmeans.inertia_), 'n_iter': int(kmeans.n_iter_),
+                        'fit_seconds': round(time.perf_counter() - start_time, 4)})
+    return pd.DataFrame(results)
+
+
+def make_segment_table(n_rows: int, n_features: int = 2, n_segments: int = 5,
+                       random_state: int = 42) -> np.ndarray:
+    """
+    Generate a large synthetic segment table shaped like the mall customers
+
+    Args:
+        n_rows (int): Number of customers
+        n_features (int): Number of features
+        n_segments (int): Number of true segments
+        random_state (int): Random seed
+
+    Returns:
+        np.ndarray: (n_rows, n_features) features on a 0-140 scale
+    """
+    rng = np.random.default_rng(random_state)
+    centers = rng.uniform(15, 125, size=(n_segments, n_features))
+    segments = rng.integers(n_segments, size=n_rows)
+    return centers[segments] + rng.normal(scale=8.0, size=(n_rows, n_features))
+
+
+def main():
+    """
+    Command line entry point for the elbow sweep
+    """
+    parser = argparse.ArgumentParser(description="Parallel warm-started K-Means elbow sweep")
+    parser.add_argument('--data', default=str(DEFAULT_DATA_PATH))
+    parser.add_argument('--synthetic', type=int, default=0, help="Use a synthetic table with this many rows")
+    parser.add_argument('--k-max', type=int, default=10)
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--mini-batch', action='store_true')
+    parser.add_argument('--n-init', type=int, default=1)
+    parser.add_argument('--compare', action='store_true', help="Also time the notebook's cold loop")
+    args = parser.parse_args()
+
+    X = make_segment_table(args.synthetic) if args.synthetic else load_customers(args.data)
+    k_values = range(1, args.k_max + 1)
+    print(f"👥 {len(X):,} customers x {X.shape[1]} features")
+
+    start_time = time.perf_counter()
+    results = elbow_sweep(X, k_values, n_workers=args.workers, mini_batch=args.mini_batch,
+                          n_init=args.n_init)
+    print(results.to_string(index=False))
+    print(f"⏱️ Sweep: {time.perf_counter() - start_time:.2f}s with {args.workers} worker(s)")
+
+    if args.compare:
+        start_time = time.perf_counter()
+        cold = cold_sweep(X, k_values)
+        print(f"⏱️ Cold serial loop: {time.perf_counter() - start_time:.2f}s "
+              f"({cold['n_iter'].sum()} iterations vs {results['n_iter'].sum()} warm)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,356 @@
+"""
+Scalable Hierarchical Customer Segmentation
+
+The hierarchical clustering notebook builds the Ward linkage twice
+(sch.linkage for the dendrogram, AgglomerativeClustering for the labels),
+and both use O(n²) memory. This module:
+
+1. Summarizes large tables into at most a few thousand weighted
+   micro-clusters (MiniBatchKMeans or BIRCH); small tables are used as is
+2. Builds the Ward linkage of the micro-clusters once with the
+   nearest-neighbor chain algorithm, in O(m) memory
+3. Reuses that linkage for both the dendrogram and any flat cut
+4. Labels segments with business profiles through np.select
+
+On tables up to max_exact rows there is no summarization, and the linkage
+is the same as sch.linkage(X, method='ward') up to the order in which tied
+distances are merged.
+
+Usage:
+    python segmentation.py
+    python segmentation.py --synthetic 1000000
+"""
+
+import time
+import argparse
+import numpy as np
+import pandas as pd
+import scipy.cluster.hierarchy as sch
+from typing import Dict, List, Tuple
+from sklearn.cluster import Birch, MiniBatchKMeans
+from sklearn.metrics import adjusted_rand_score
+
+try:
+    from .kmeans_sweep import load_customers, make_segment_table, DEFAULT_DATA_PATH
+except ImportError:
+    from kmeans_sweep import load_customers, make_segment_table, DEFAULT_DATA_PATH
+
+BUSINESS_PROFILES = [
+    "High-value customers - Focus on premium products & VIP service",
+    "Wealthy conservatives - Emphasize quality & value propositions",
+    "Price-sensitive spenders - Offer affordable luxury & payment plans",
+    "Budget shoppers - Focus on discounts & essential products"
+]
+DEFAULT_PROFILE = "Balanced customers - Standard marketing & product mix"
+
+
+def business_profiles(income: np.ndarray, spending: np.ndarray) -> np.ndarray:
+    """
+    Label income / spending pairs with the notebook's business profiles
+
+    Args:
+        income (np.ndarray): Annual income (k$)
+        spending (np.ndarray): Spending score (1-100)
+
+    Returns:
+        np.ndarray: Business profile per pair
+    """
+    income = np.asarray(income)
+    spending = np.asarray(spending)
+    conditions = [
+        (income > 70) & (spending > 60),
+        (income > 70) & (spending < 40),
+        (income < 40) & (spending > 60),
+        (income < 40) & (spending < 40)
+    ]
+    return np.select(conditions, BUSINESS_PROFILES, default=DEFAULT_PROFILE)
+
+
+def summarize(X: np.ndarray, method: str = 'minibatch', n_micro_clusters: int = 1000,
+              birch_threshold: float = 1.0, random_state: int = 42) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Compress points into weighted micro-clusters
+
+    Args:
+        X (np.ndarray): Feature matrix
+        method (str): 'minibatch' (MiniBatchKMeans) or 'birch'
+        n_micro_clusters (int): Micro-clusters for 'minibatch', and the most 'birch' may produce
+        birch_threshold (float): Starting subcluster radius for 'birch' (grown as needed)
+        random_state (int): Random seed
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray, np.ndarray]: Micro-cluster of every
+        point, micro-cluster centroids and point counts
+    """
+    if method == 'minibatch':
+        model = MiniBatchKMeans(n_clusters=n_micro_clusters, batch_size=4096, n_init=1,
+                                random_state=random_state).fit(X)
+        labels = model.labels_
+    elif method == 'birch':
+        labels = _birch_labels(X, birch_threshold, n_micro_clusters, random_state)
+    else:
+        raise ValueError(f"Unknown summarization method '{method}'. Choose 'minibatch' or 'birch'")
+
+    # Drop empty micro-clusters and use exact means of the assigned points
+    used, labels = np.unique(labels, return_inverse=True)
+    weights = np.bincount(labels, minlength=len(used)).astype(np.float64)
+    centroids = np.stack([np.bincount(labels, weights=X[:, j], minlength=len(used))
+                          for j in range(X.shape[1])], axis=1) / weights[:, None]
+    return labels.astype(np.int32), centroids, weights
+
+
+def _birch_labels(X: np.ndarray, threshold: float, max_subclusters: int, random_state: int,
+                  sample_size: int = 20_000) -> np.ndarray:
+    """
+    BIRCH subcluster of every point, with the number of subclusters bounded
+
+    A fixed radius lets the subcluster count (and the O(m²) linkage after it)
+    grow with the table, so the radius is first grown on a sample until the
+    sample yields at most half of max_subclusters. If the full table still
+    exceeds the bound, its subclusters are merged with a weighted MiniBatchKMeans.
+    """
+    rng = np.random.default_rng(random_state)
+    sample = X[rng.choice(len(X), min(len(X), sample_size), replace=False)]
+    while len(Birch(threshold=threshold, n_clusters=None).fit(sample).subcluster_centers_) > max_subclusters // 2:
+        threshold *= 1.5
+
+    birch = Birch(threshold=threshold, n_clusters=None).fit(X)
+    labels = birch.labels_
+    n_subclusters = len(birch.subcluster_centers_)
+    if n_subclusters > max_subclusters:
+        counts = np.bincount(labels, minlength=n_subclusters)
+        merged = MiniBatchKMeans(n_clusters=max_subclusters, batch_size=4096, n_init=1, random_state=random_state
+                                 ).fit(birch.subcluster_centers_, sample_weight=counts).labels_
+        labels = merged[labels]
+    return labels
+
+
+def ward_linkage(centroids: np.ndarray, weights: np.ndarray = None) -> np.ndarray:
+    """
+    Ward linkage of weighted points with the nearest-neighbor chain algorithm
+
+    The Ward distance between clusters A and B is
+    sqrt(2 |A| |B| / (|A| + |B|)) * ||c_A - c_B||, as in scipy, where |A|
+    counts the points (weights) in A. The fourth column of the result counts
+    centroids (leaves), as scipy expects.
+
+    Args:
+        centroids (np.ndarray): (m, d) point or micro-cluster centroids
+        weights (np.ndarray): Points per centroid (1 each by default)
+
+    Returns:
+        np.ndarray: (m - 1, 4) linkage matrix in scipy format
+    """
+    centers = np.array(centroids, dtype=np.float64)
+    m = len(centers)
+    sizes = np.ones(m) if weights is None else np.array(weights, dtype=np.float64)
+    active = np.ones(m, dtype=bool)
+
+    merges = []
+    chain = []
+    while len(merges) < m - 1:
+        if not chain:
+            chain.append(int(np.argmax(active)))
+        a = chain[-1]
+
+        diff = centers - centers[a]
+        distances = np.sqrt(2 * sizes * sizes[a] / (sizes + sizes[a]) * np.einsum('ij,ij->i', diff, diff))
+        distances[~active] = np.inf
+        distances[a] = np.inf
+
+        b = int(np.argmin(distances))
+        # On ties, prefer the previous chain element so the chain terminates
+        if len(chain) > 1 and distances[chain[-2]] <= distances[b]:
+            b = chain[-2]
+
+        if len(chain) > 1 and b == chain[-2]:
+            chain.pop()
+            chain.pop()
+            # The merged cluster lives on in slot b
+            total = sizes[a] + sizes[b]
+            centers[b] = (sizes[a] * centers[a] + sizes[b] * centers[b]) / total
+            sizes[b] = total
+            active[a] = False
+            merges.append((a, b, distances[b]))
+        else:
+            chain.append(b)
+
+    return _label_merges(merges, m)
+
+
+def _label_merges(merges: List[Tuple[int, int, float]], m: int) -> np.ndarray:
+    """Sort merges by height and number the new clusters like scipy"""
+    order = sorted(range(len(merges)), key=lambda i: merges[i][2])
+    cluster_of_slot = np.arange(m)
+    leaves_of_slot = np.ones(m)
+    Z = np.empty((len(merges), 4))
+    for row, i in enumerate(order):
+        a, b, distance = merges[i]
+        first, second = sorted((cluster_of_slot[a], cluster_of_slot[b]))
+        leaves_of_slot[b] += leaves_of_slot[a]
+        Z[row] = (first, second, distance, leaves_of_slot[b])
+        cluster_of_slot[b] = m + row
+    return Z
+
+
+class HierarchicalSegmenter:
+    """
+    Ward hierarchical segmentation that scales to large customer tables
+    """
+
+    def __init__(self, n_clusters: int = 5, max_exact: int = 5000, summarizer: str = 'minibatch',
+                 n_micro_clusters: int = 1000, birch_threshold: float = 1.0, random_state: int = 42):
+        """
+        Initialize the segmenter
+
+        Args:
+            n_clusters (int): Default number of segments for the flat cut
+            max_exact (int): Largest table clustered without summarization
+            summarizer (str): 'minibatch' or 'birch' for larger tables
+            n_micro_clusters (int): Micro-clusters for 'minibatch', and the most 'birch' may produce
+            birch_threshold (float): Starting subcluster radius for 'birch' (grown as needed)
+            random_state (int): Random seed
+        """
+        self.n_clusters = n_clusters
+        self.max_exact = max_exact
+        self.summarizer = summarizer
+        self.n_micro_clusters = n_micro_clusters
+        self.birch_threshold = birch_threshold
+        self.random_state = random_state
+
+        self.linkage_ = None
+        self.micro_labels_ = None
+        self.micro_centroids_ = None
+        self.micro_weights_ = None
+
+    def fit(self, X: np.ndarray) -> 'HierarchicalSegmenter':
+        """
+        Summarize the data if needed and build the linkage once
+
+        Args:
+            X (np.ndarray): Feature matrix
+
+        Returns:
+            HierarchicalSegmenter: self
+        """
+        X = np.asarray(X, dtype=np.float64)
+        if len(X) <= self.max_exact:
+            self.micro_labels_ = np.arange(len(X), dtype=np.int32)
+            self.micro_centroids_ = X.copy()
+            self.micro_weights_ = np.ones(len(X))
+        else:
+            self.micro_labels_, self.micro_centroids_, self.micro_weights_ = summarize(
+                X, self.summarizer, self.n_micro_clusters, self.birch_threshold, self.random_state)
+
+        self.linkage_ = ward_linkage(self.micro_centroids_, self.micro_weights_)
+        return self
+
+    def labels(self, n_clusters: int = None) -> np.ndarray:
+        """
+        Cut the linkage into flat segments and label every point
+
+        Args:
+            n_clusters (int): Number of segments (default: self.n_clusters)
+
+        Returns:
+            np.ndarray: Segment (0 to n_clusters - 1) of every point
+        """
+        micro_segments = sch.fcluster(self.linkage_, t=n_clusters or self.n_clusters, criterion='maxclust') - 1
+        return micro_segments[self.micro_labels_]
+
+    def fit_predict(self, X: np.ndarray) -> np.ndarray:
+        """
+        Fit and return the default flat cut
+
+        Args:
+            X (np.ndarray): Feature matrix
+
+        Returns:
+            np.ndarray: Segment of every point
+        """
+        return self.fit(X).labels()
+
+    def cut_height(self, n_clusters: int = None) -> float:
+        """
+        Get a dendrogram height that separates n_clusters segments
+
+        Args:
+            n_clusters (int): Number of segments (default: self.n_clusters)
+
+        Returns:
+            float: Midpoint between the last kept and first cut merge
+        """
+        n_clusters = n_clusters or self.n_clusters
+        heights = self.linkage_[:, 2]
+        return float((heights[-n_clusters] + heights[-n_clusters + 1]) / 2) if n_clusters > 1 else float(heights[-1])
+
+    def dendrogram(self, **kwargs) -> Dict:
+        """
+        Draw the dendrogram from the stored linkage
+
+        Args:
+            **kwargs: Passed to scipy.cluster.hierarchy.dendrogram
+
+        Returns:
+            Dict: scipy's dendrogram data
+        """
+        if len(self.linkage_) > 500:
+            kwargs.setdefault('truncate_mode', 'lastp')
+            kwargs.setdefault('p', 30)
+        return sch.dendrogram(self.linkage_, **kwargs)
+
+
+def profile_segments(X: np.ndarray, labels: np.ndarray,
+                     feature_names: List[str] = ('Annual Income (k$)', 'Spending Score (1-100)')) -> pd.DataFrame:
+    """
+    Summarize every segment and give it a business profile
+
+    Args:
+        X (np.ndarray): Feature matrix (income and spending first)
+        labels (np.ndarray): Segment of every point
+        feature_names (List[str]): Names of the feature columns
+
+    Returns:
+        pd.DataFrame: Size, share, mean features and business profile per segment
+    """
+    counts = np.bincount(labels)
+    means = np.stack([np.bincount(labels, weights=X[:, j]) for j in range(X.shape[1])], axis=1) / counts[:, None]
+
+    profile = pd.DataFrame(means, columns=list(feature_names)[:X.shape[1]])
+    profile.insert(0, 'customers', counts)
+    profile.insert(1, 'share', counts / counts.sum())
+    profile['business_profile'] = business_profiles(means[:, 0], means[:, 1])
+    profile.index.name = 'segment'
+    return profile
+
+
+def main():
+    """
+    Command line entry point: segment the mall customers or a synthetic table
+    """
+    parser = argparse.ArgumentParser(description="Scalable Ward segmentation of customer tables")
+    parser.add_argument('--data', default=str(DEFAULT_DATA_PATH))
+    parser.add_argument('--synthetic', type=int, default=0, help="Use a synthetic table with this many rows")
+    parser.add_argument('--clusters', type=int, default=5)
+    parser.add_argument('--summarizer', choices=['minibatch', 'birch'], default='minibatch')
+    args = parser.parse_args()
+
+    X = make_segment_table(args.synthetic) if args.synthetic else load_customers(args.data)
+
+    start_time = time.perf_counter()
+    segmenter = HierarchicalSegmenter(args.clusters, summarizer=args.summarizer).fit(X)
+    labels = segmenter.labels()
+    elapsed = time.perf_counter() - start_time
+
+    print(f"👥 {len(X):,} customers -> {len(segmenter.micro_weights_):,} leaves in the linkage")
+    print(f"⏱️ Linkage + cut: {elapsed:.2f}s | cut height for {args.clusters} segments: "
+          f"{segmenter.cut_height():.1f}")
+    print(profile_segments(X, labels).to_string())
+
+    if len(X) <= segmenter.max_exact:
+        reference = sch.fcluster(sch.linkage(X, method='ward'), t=args.clusters, criterion='maxclust')
+        agreement = adjusted_rand_score(reference, labels)
+        print(f"{'✅' if agreement == 1 else '⚠️'} Adjusted Rand index vs sch.linkage(X, method='ward') cut: {agreement:.3f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,462 @@
+"""
+Multi-Armed Bandit Simulator
+
+This module turns the UCB and Thompson sampling notebooks into a reusable,
+vectorized simulator. The reward matrix from ads_ctr_optimization.csv is
+loaded once as a contiguous array, every policy scores all arms with NumPy at
+each round, and many independent replications run side by side as
+(replications, arms) arrays. Replication 0 replays the CSV in its original
+order, so its UCB selections are identical to the notebook's.
+
+Policies can also be run in delayed batch mode, where B impressions are
+assigned from the same posterior snapshot before any reward is seen.
+"""
+
+import math
+import time
+import random
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from typing import Dict, List, Union
+
+DEFAULT_DATA_PATH = Path(__file__).parent.parent / "data" / "ads_ctr_optimization.csv"
+
+
+def load_reward_matrix(path: Union[str, Path] = DEFAULT_DATA_PATH) -> np.ndarray:
+    """
+    Load the (rounds, arms) reward matrix as a contiguous array
+
+    Args:
+        path: CSV file with one column per arm and one row per round
+
+    Returns:
+        np.ndarray: C-contiguous uint8 reward matrix
+    """
+    return np.ascontiguousarray(pd.read_csv(path).to_numpy(dtype=np.uint8))
+
+
+class UCBPolicy:
+    """
+    Upper Confidence Bound policy, as in 01_upper_confidence_bound.ipynb
+    """
+
+    name = 'UCB'
+
+    def __init__(self, confidence: float = 3/2):
+        """
+        Initialize the policy
+
+        Args:
+            confidence (float): Multiplier of log(n + 1) in the confidence width
+        """
+        self.confidence = confidence
+
+    def select(self, counts: np.ndarray, sums: np.ndarray, n: int,
+               rng: np.random.Generator) -> np.ndarray:
+        """
+        Choose one arm per replication
+
+        Args:
+            counts (np.ndarray): (replications, arms) number of selections
+            sums (np.ndarray): (replications, arms) sum of rewards
+            n (int): Current round
+            rng (np.random.Generator): Random generator (unused by UCB)
+
+        Returns:
+            np.ndarray: Selected arm per replication
+        """
+        with np.errstate(divide='ignore', invalid='ignore'):
+            upper_bounds = sums / counts + np.sqrt(self.confidence * math.log(n + 1) / counts)
+        upper_bounds[counts == 0] = np.inf
+
+        # argmax keeps the first maximum, like the notebook's strict '>' comparison
+        return upper_bounds.argmax(axis=1)
+
+    def select_batch(self, counts: np.ndarray, sums: np.ndarray, n: int,
+                     rng: np.random.Generator, batch_size: int) -> np.ndarray:
+        """
+        Choose arms for a batch of impressions from one snapshot
+
+        UCB is deterministic, so every impression in the batch gets the same arm.
+
+        Args:
+            counts (np.ndarray): (replications, arms) number of selections
+            sums (np.ndarray): (replications, arms) sum of rewards
+            n (int): Round of the first impression in the batch
+            rng (np.random.Generator): Random generator (unused by UCB)
+            batch_size (int): Impressions per snapshot
+
+        Returns:
+            np.ndarray: (replications, batch_size) selected arms
+        """
+        arms = self.select(counts, sums, n, rng)
+        return np.repeat(arms[:, None], batch_size, axis=1)
+
+
+class ThompsonSamplingPolicy:
+    """
+    Beta-Bernoulli Thompson sampling, as in 02_thompson_sampling.ipynb
+    """
+
+    name = 'Thompson Sampling'
+
+    def __init__(self, prior_alpha: float = 1.0, prior_beta: float = 1.0):
+        """
+        Initialize the policy
+
+        Args:
+            prior_alpha (float): Beta prior pseudo-count of rewards equal to 1
+            prior_beta (float): Beta prior pseudo-count of rewards equal to 0
+        """
+        self.prior_alpha = prior_alpha
+        self.prior_beta = prior_beta
+
+    def select(self, counts: np.ndarray, sums: np.ndarray, n: int,
+               rng: np.random.Generator) -> np.ndarray:
+        """
+        Choose one arm per replication with one vectorized Beta draw
+
+        Args:
+            counts (np.ndarray): (replications, arms) number of selections
+            sums (np.ndarray): (replications, arms) sum of rewards
+            n (int): Current round
+            rng (np.random.Generator): Random generator
+
+        Returns:
+            np.ndarray: Selected arm per replication
+        """
+        samples = rng.beta(sums + self.prior_alpha, counts - sums + self.prior_beta)
+        return samples.argmax(axis=1)
+
+    def select_batch(self, counts: np.ndarray, sums: np.ndarray, n: int,
+                     rng: np.random.Generator, batch_size: int) -> np.ndarray:
+        """
+        Choose arms for a batch of impressions from one posterior snapshot
+
+        Each impression gets its own posterior sample; all samples of the
+        batch come from a single NumPy call.
+
+        Args:
+            counts (np.ndarray): (replications, arms) number of selections
+            sums (np.ndarray): (replications, arms) sum of rewards
+            n (int): Round of the first impression in the batch
+            rng (np.random.Generator): Random generator
+            batch_size (int): Impressions per snapshot
+
+        Returns:
+            np.ndarray: (replications, batch_size) selected arms
+        """
+        alpha = (sums + self.prior_alpha)[:, None, :]
+        beta = (counts - sums + self.prior_beta)[:, None, :]
+        shape = (counts.shape[0], batch_size, counts.shape[1])
+        return rng.beta(alpha, beta, size=shape).argmax(axis=2)
+
+
+class RandomPolicy:
+    """
+    Uniformly random baseline policy
+    """
+
+    name = 'Random'
+
+    def select(self, counts: np.ndarray, sums: np.ndarray, n: int,
+               rng: np.random.Generator) -> np.ndarray:
+        """
+        Choose one random arm per replication
+
+        Args:
+            counts (np.ndarray): (replications, arms) number of selections
+            sums (np.ndarray): (replications, arms) sum of rewards
+            n (int): Current round
+            rng (np.random.Generator): Random generator
+
+        Returns:
+            np.ndarray: Selected arm per replication
+        """
+        return rng.integers(0, counts.shape[1], size=counts.shape[0])
+
+    def select_batch(self, counts: np.ndarray, sums: np.ndarray, n: int,
+                     rng: np.random.Generator, batch_size: int) -> np.ndarray:
+        """
+        Choose random arms for a batch of impressions
+
+        Args:
+            counts (np.ndarray): (replications, arms) number of selections
+            sums (np.ndarray): (replications, arms) sum of rewards
+            n (int): Round of the first impression in the batch
+            rng (np.random.Generator): Random generator
+            batch_size (int): Impressions per snapshot
+
+        Returns:
+            np.ndarray: (replications, batch_size) selected arms
+        """
+        return rng.integers(0, counts.shape[1], size=(counts.shape[0], batch_size))
+
+
+class BanditSimulator:
+    """
+    Replay a reward matrix against bandit policies
+    """
+
+    def __init__(self, rewards: np.ndarray = None):
+        """
+        Initialize the simulator
+
+        Args:
+            rewards (np.ndarray): (rounds, arms) reward matrix
+                (default: ads_ctr_optimization.csv)
+        """
+        if rewards is None:
+            rewards = load_reward_matrix()
+        self.rewards = np.ascontiguousarray(rewards)
+        self.n_rounds, self.n_arms = self.rewards.shape
+        self.arm_means = self.rewards.mean(axis=0)
+
+    def make_round_orders(self, n_replications: int, n_rounds: int, seed: int = 0) -> np.ndarray:
+        """
+        Build the order in which each replication replays the rounds
+
+        Replication 0 uses the original order; the others use independent
+        random permutations of the rounds.
+
+        Args:
+            n_replications (int): Number of replications
+            n_rounds (int): Number of rounds per replication
+            seed (int): Random seed for the permutations
+
+        Returns:
+            np.ndarray: (replications, rounds) row indices into the reward matrix
+        """
+        rng = np.random.default_rng(seed)
+        orders = np.empty((n_replications, n_rounds), dtype=np.int64)
+        orders[0] = np.arange(n_rounds)
+        for r in range(1, n_replications):
+            orders[r] = rng.permutation(self.n_rounds)[:n_rounds]
+        return orders
+
+    def run(self, policy, n_rounds: int = None, n_replications: int = 1,
+            seed: int = 0, batch_size: int = 1) -> Dict[str, np.ndarray]:
+        """
+        Run a policy over many replications at once
+
+        Args:
+            policy: Policy with select(counts, sums, n, rng) and
+                select_batch(counts, sums, n, rng, batch_size) methods
+            n_rounds (int): Rounds per replication (default: all rows)
+            n_replications (int): Number of independent replications
+            seed (int): Random seed for round orders and the policy
+            batch_size (int): Impressions assigned per posterior snapshot;
+                rewards are only applied after the whole batch (1 = update
+                after every impression, as in the notebooks)
+
+        Returns:
+            Dict: selections and rewards (replications, rounds), total_reward
+            (replications,), cumulative_regret (replications, rounds) and the
+            final counts and sums per arm
+        """
+        n_rounds = n_rounds or self.n_rounds
+        orders = self.make_round_orders(n_replications, n_rounds, seed)
+        rng = np.random.default_rng(seed + 1)
+
+        counts = np.zeros((n_replications, self.n_arms), dtype=np.int64)
+        sums = np.zeros((n_replications, self.n_arms), dtype=np.float64)
+        selections = np.empty((n_replications, n_rounds), dtype=np.int64)
+        rewards = np.empty((n_replications, n_rounds), dtype=np.uint8)
+        replications = np.arange(n_replications)
+
+        if batch_size == 1:
+            for n in range(n_rounds):
+                arms = policy.select(counts, sums, n, rng)
+                reward = self.rewards[orders[:, n], arms]
+
+                counts[replications, arms] += 1
+                sums[replications, arms] += reward
+                selections[:, n] = arms
+                rewards[:, n] = reward
+        else:
+            n_cells = n_replications * self.n_arms
+            for start in range(0, n_rounds, batch_size):
+                stop = min(start + batch_size, n_rounds)
+                arms = policy.select_batch(counts, sums, start, rng, stop - start)
+                reward = self.rewards[orders[:, start:stop], arms]
+
+                # Delayed update: apply the whole batch to the posterior at once
+                cells = (replications[:, None] * self.n_arms + arms).ravel()
+                counts += np.bincount(cells, minlength=n_cells).reshape(counts.shape)
+                sums += np.bincount(cells, weights=reward.ravel(), minlength=n_cells).reshape(sums.shape)
+                selections[:, start:stop] = arms
+                rewards[:, start:stop] = reward
+
+        return {
+            'policy': getattr(policy, 'name', type(policy).__name__),
+            'selections': selections,
+            'rewards': rewards,
+            'total_reward': rewards.sum(axis=1, dtype=np.int64),
+            'cumulative_regret': self.cumulative_regret(selections),
+            'counts': counts,
+            'sums': sums
+        }
+
+    def benchmark(self, policy, n_rounds: int = None, n_replications: int = 1,
+                  seed: int = 0, batch_size: int = 1) -> Dict[str, float]:
+        """
+        Measure policy throughput in decisions per second
+
+        Args:
+            policy: Policy to benchmark
+            n_rounds (int): Rounds per replication
+            n_replications (int): Number of replications
+            seed (int): Random seed
+            batch_size (int): Impressions per posterior snapshot
+
+        Returns:
+            Dict: decisions, seconds, decisions_per_second and mean total reward
+        """
+        start_time = time.perf_counter()
+        result = self.run(policy, n_rounds, n_replications, seed, batch_size)
+        elapsed = time.perf_counter() - start_time
+        decisions = result['selections'].size
+
+        return {
+            'policy': result['policy'],
+            'batch_size': batch_size,
+            'decisions': decisions,
+            'seconds': round(elapsed, 4),
+            'decisions_per_second': round(decisions / elapsed, 1),
+            'mean_total_reward': float(result['total_reward'].mean())
+        }
+
+    def cumulative_regret(self, selections: np.ndarray) -> np.ndarray:
+        """
+        Expected regret against always showing the best arm
+
+        Args:
+            selections (np.ndarray): (replications, rounds) selected arms
+
+        Returns:
+            np.ndarray: (replications, rounds) cumulative regret
+        """
+        gaps = self.arm_means.max() - self.arm_means
+        return np.cumsum(gaps[selections], axis=1)
+
+    def compare(self, policies: List, n_rounds: int = None, n_replications: int = 100,
+                seed: int = 0, batch_size: int = 1) -> pd.DataFrame:
+        """
+        Run several policies on the same replications and summarize them
+
+        Args:
+            policies (List): Policies to compare
+            n_rounds (int): Rounds per replication
+            n_replications (int): Number of replications
+            seed (int): Random seed shared by all policies
+            batch_size (int): Impressions per posterior snapshot
+
+        Returns:
+            pd.DataFrame: Mean/std total reward and final regret per policy
+        """
+        summary = []
+        for policy in policies:
+            result = self.run(policy, n_rounds, n_replications, seed, batch_size)
+            final_regret = result['cumulative_regret'][:, -1]
+            summary.append({
+                'policy': result['policy'],
+                'mean_total_reward': result['total_reward'].mean(),
+                'std_total_reward': result['total_reward'].std(),
+                'mean_final_regret': final_regret.mean(),
+                'std_final_regret': final_regret.std()
+            })
+        return pd.DataFrame(summary).set_index('policy')
+
+
+def run_notebook_ucb(rewards: np.ndarray, n_rounds: int = None) -> List[int]:
+    """
+    Reference implementation copied from 01_upper_confidence_bound.ipynb
+
+    Args:
+        rewards (np.ndarray): (rounds, arms) reward matrix
+        n_rounds (int): Number of rounds (default: all rows)
+
+    Returns:
+        List[int]: Selected ad per round
+    """
+    N = n_rounds or rewards.shape[0]
+    d = rewards.shape[1]
+    ads_selected = []
+    numbers_of_selections = [0] * d
+    sums_of_rewards = [0] * d
+    for n in range(0, N):
+        ad = 0
+        max_upper_bound = 0
+        for i in range(0, d):
+            if (numbers_of_selections[i] > 0):
+                average_reward = sums_of_rewards[i] / numbers_of_selections[i]
+                delta_i = math.sqrt(3/2 * math.log(n + 1) / numbers_of_selections[i])
+                upper_bound = average_reward + delta_i
+            else:
+                upper_bound = 1e400
+            if upper_bound > max_upper_bound:
+                max_upper_bound = upper_bound
+                ad = i
+        ads_selected.append(ad)
+        numbers_of_selections[ad] = numbers_of_selections[ad] + 1
+        sums_of_rewards[ad] = sums_of_rewards[ad] + int(rewards[n, ad])
+    return ads_selected
+
+
+def run_notebook_thompson(rewards: np.ndarray, n_rounds: int = None, seed: int = 0) -> List[int]:
+    """
+    Reference implementation copied from 02_thompson_sampling.ipynb
+
+    Args:
+        rewards (np.ndarray): (rounds, arms) reward matrix
+        n_rounds (int): Number of rounds (default: all rows)
+        seed (int): Seed for the random module
+
+    Returns:
+        List[int]: Selected ad per round
+    """
+    random.seed(seed)
+    N = n_rounds or rewards.shape[0]
+    d = rewards.shape[1]
+    ads_selected = []
+    numbers_of_rewards_1 = [0] * d
+    numbers_of_rewards_0 = [0] * d
+    for n in range(0, N):
+        ad = 0
+        max_random = 0
+        for i in range(0, d):
+            random_beta = random.betavariate(numbers_of_rewards_1[i] + 1, numbers_of_rewards_0[i] + 1)
+            if random_beta > max_random:
+                max_random = random_beta
+                ad = i
+        ads_selected.append(ad)
+        if rewards[n, ad] == 1:
+            numbers_of_rewards_1[ad] = numbers_of_rewards_1[ad] + 1
+        else:
+            numbers_of_rewards_0[ad] = numbers_of_rewards_0[ad] + 1
+    return ads_selected
+
+
+if __name__ == "__main__":
+    simulator = BanditSimulator()
+
+    # Replication 0 reproduces the notebook exactly
+    result = simulator.run(UCBPolicy(), n_replications=1)
+    reference = run_notebook_ucb(simulator.rewards)
+    assert result['selections'][0].tolist() == reference
+    print(f"✅ UCB selections match the notebook (total reward: {result['total_reward'][0]})")
+
+    print("\n📊 Policy comparison over 100 replications:")
+    print(simulator.compare([UCBPolicy(), ThompsonSamplingPolicy(), RandomPolicy()], n_replications=100))
+
+    # Thompson sampling throughput: notebook loop vs vectorized draws
+    start_time = time.perf_counter()
+    run_notebook_thompson(simulator.rewards, seed=0)
+    notebook_rate = simulator.n_rounds / (time.perf_counter() - start_time)
+    print(f"\n⏱️ Notebook Thompson sampling: {notebook_rate:,.0f} decisions/s")
+
+    for batch_size in [1, 10, 100]:
+        stats = simulator.benchmark(ThompsonSamplingPolicy(), n_replications=100, seed=0, batch_size=batch_size)
+        print(f"⏱️ Vectorized, batch size {batch_size}: {stats['decisions_per_second']:,.0f} decisions/s "
+              f"(mean total reward {stats['mean_total_reward']:.0f})")
@@ -0,0 +1,364 @@
+"""
+Online Bandit Decision Service
+
+This module serves live arm choices with the same UCB and Thompson sampling
+rules as the notebooks. Per-arm impression and reward counters live in a
+shared memory block so that several worker processes can serve the same
+bandit. Each worker only ever writes its own row of counters, so updates
+need no locks; choose() reads the column sums over all workers.
+
+Rewards may arrive after the choice. Until they do, the impression counts as
+a miss (reward 0), which is how the ads_ctr_optimization.csv data is encoded.
+
+Usage:
+    python decision_service.py --workers 4 --policy thompson
+"""
+
+import os
+import time
+import argparse
+import threading
+import numpy as np
+import multiprocessing as mp
+from multiprocessing import shared_memory
+from pathlib import Path
+from typing import Dict, Optional, Union
+
+try:
+    from .bandits import UCBPolicy, ThompsonSamplingPolicy, load_reward_matrix, DEFAULT_DATA_PATH
+except ImportError:
+    from bandits import UCBPolicy, ThompsonSamplingPolicy, load_reward_matrix, DEFAULT_DATA_PATH
+
+POLICIES = {
+    'ucb': UCBPolicy,
+    'thompson': ThompsonSamplingPolicy
+}
+
+
+class SharedArmCounters:
+    """
+    Per-worker arm counters in a shared memory block
+
+    The block holds a (2, n_workers, n_arms) float64 array: impressions and
+    reward sums, one row per worker.
+    """
+
+    def __init__(self, n_arms: int, n_workers: int = 1, name: str = None):
+        """
+        Create a new counter block, or attach to an existing one by name
+
+        Args:
+            n_arms (int): Number of arms
+            n_workers (int): Number of worker rows
+            name (str): Name of an existing block to attach to
+        """
+        self.n_arms = n_arms
+        self.n_workers = n_workers
+        self.owner = name is None
+
+        size = 2 * n_workers * n_arms * np.dtype(np.float64).itemsize
+        if self.owner:
+            self._shm = shared_memory.SharedMemory(create=True, size=size)
+        else:
+            self._shm = shared_memory.SharedMemory(name=name)
+
+        self.array = np.ndarray((2, n_workers, n_arms), dtype=np.float64, buffer=self._shm.buf)
+        if self.owner:
+            self.array.fill(0)
+
+        self.counts = self.array[0]
+        self.sums = self.array[1]
+
+    @property
+    def name(self) -> str:
+        """Name used by other processes to attach"""
+        return self._shm.name
+
+    def totals(self):
+        """
+        Sum the counters over all workers
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Impressions and reward sums per arm
+        """
+        return self.counts.sum(axis=0), self.sums.sum(axis=0)
+
+    def load(self, counts: np.ndarray, sums: np.ndarray):
+        """
+        Replace all counters with aggregated values (stored in worker row 0)
+
+        Args:
+            counts (np.ndarray): Impressions per arm
+            sums (np.ndarray): Reward sums per arm
+        """
+        self.array.fill(0)
+        self.counts[0] = counts
+        self.sums[0] = sums
+
+    def close(self):
+        """Detach from the block, and free it if this process created it"""
+        self.counts = self.sums = self.array = None
+        self._shm.close()
+        if self.owner:
+            self._shm.unlink()
+
+
+class DecisionService:
+    """
+    Serve arm choices and record rewards for one worker
+    """
+
+    def __init__(self, counters: SharedArmCounters, worker_id: int = 0,
+                 policy: str = 'thompson', seed: Optional[int] = None):
+        """
+        Initialize the service
+
+        Args:
+            counters (SharedArmCounters): Shared counters
+            worker_id (int): Row of the counters this worker writes to
+            policy (str): 'ucb' or 'thompson'
+            seed (int): Random seed for Thompson sampling
+        """
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown policy '{policy}'. Choose from {list(POLICIES)}")
+
+        self.counters = counters
+        self.worker_id = worker_id
+        self.policy = POLICIES[policy]()
+        self.rng = np.random.default_rng(seed)
+
+        self._my_counts = counters.counts[worker_id]
+        self._my_sums = counters.sums[worker_id]
+
+    def choose(self) -> int:
+        """
+        Choose an arm and record the impression
+
+        Returns:
+            int: Selected arm
+        """
+        counts, sums = self.counters.totals()
+        n = int(counts.sum())
+        arm = int(self.policy.select(counts[None, :], sums[None, :], n, self.rng)[0])
+        self._my_counts[arm] += 1
+        return arm
+
+    def reward(self, arm: int, value: float = 1.0):
+        """
+        Record the reward of an earlier impression
+
+        Only non-zero rewards need to be reported.
+
+        Args:
+            arm (int): Arm that was shown
+            value (float): Reward received
+        """
+        self._my_sums[arm] += value
+
+    def stats(self) -> Dict[str, np.ndarray]:
+        """
+        Get the aggregated counters
+
+        Returns:
+            Dict: impressions, rewards and observed reward rate per arm
+        """
+        counts, sums = self.counters.totals()
+        with np.errstate(divide='ignore', invalid='ignore'):
+            rates = np.where(counts > 0, sums / counts, 0.0)
+        return {'impressions': counts, 'rewards': sums, 'reward_rate': rates}
+
+
+def save_snapshot(counters: SharedArmCounters, path: Union[str, Path]):
+    """
+    Write the aggregated counters to disk atomically
+
+    Args:
+        counters (SharedArmCounters): Shared counters
+        path: Snapshot file (.npz)
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    counts, sums = counters.totals()
+
+    tmp_path = path.with_name(path.name + '.tmp')
+    with open(tmp_path, 'wb') as f:
+        np.savez(f, counts=counts, sums=sums, saved_at=time.time())
+    os.replace(tmp_path, path)
+
+
+def restore_snapshot(counters: SharedArmCounters, path: Union[str, Path]) -> bool:
+    """
+    Load counters from a snapshot, if one exists
+
+    Args:
+        counters (SharedArmCounters): Shared counters
+        path: Snapshot file (.npz)
+
+    Returns:
+        bool: True if a snapshot was restored
+    """
+    path = Path(path)
+    if not path.exists():
+        return False
+
+    with np.load(path) as snapshot:
+        if snapshot['counts'].shape != (counters.n_arms,):
+            raise ValueError(f"Snapshot has {snapshot['counts'].shape[0]} arms, expected {counters.n_arms}")
+        counters.load(snapshot['counts'], snapshot['sums'])
+    return True
+
+
+class SnapshotWriter(threading.Thread):
+    """
+    Background thread that saves counter snapshots periodically
+    """
+
+    def __init__(self, counters: SharedArmCounters, path: Union[str, Path],
+                 interval_seconds: float = 60.0):
+        """
+        Initialize the writer
+
+        Args:
+            counters (SharedArmCounters): Shared counters
+            path: Snapshot file (.npz)
+            interval_seconds (float): Time between snapshots
+        """
+        super().__init__(daemon=True)
+        self.counters = counters
+        self.path = path
+        self.interval_seconds = interval_seconds
+        self._stop_event = threading.Event()
+
+    def run(self):
+        """Save a snapshot every interval until stopped"""
+        while not self._stop_event.wait(self.interval_seconds):
+            save_snapshot(self.counters, self.path)
+
+    def stop(self):
+        """Stop the thread and save a final snapshot"""
+        self._stop_event.set()
+        self.join()
+        save_snapshot(self.counters, self.path)
+
+
+def replay_worker(shm_name: str, n_arms: int, n_workers: int, worker_id: int,
+                  policy: str, data_path: str, seed: int) -> Dict[str, float]:
+    """
+    Load-test worker: replay its share of the CSV rounds against the service
+
+    Args:
+        shm_name (str): Shared counter block name
+        n_arms (int): Number of arms
+        n_workers (int): Number of workers
+        worker_id (int): This worker's id; it replays rows worker_id::n_workers
+        policy (str): 'ucb' or 'thompson'
+        data_path (str): Reward CSV
+        seed (int): Random seed
+
+    Returns:
+        Dict: Decisions, total reward and choose() latencies in microseconds
+    """
+    rewards = load_reward_matrix(data_path)[worker_id::n_workers]
+    counters = SharedArmCounters(n_arms, n_workers, name=shm_name)
+    service = DecisionService(counters, worker_id, policy, seed=seed + worker_id)
+
+    latencies = np.empty(len(rewards))
+    total_reward = 0
+    start_time = time.perf_counter()
+    for i, row in enumerate(rewards):
+        t0 = time.perf_counter()
+        arm = service.choose()
+        latencies[i] = time.perf_counter() - t0
+
+        if row[arm]:
+            service.reward(arm, 1.0)
+            total_reward += 1
+    elapsed = time.perf_counter() - start_time
+
+    counters.close()
+    return {
+        'decisions': len(rewards),
+        'total_reward': total_reward,
+        'seconds': elapsed,
+        'latencies_us': latencies * 1e6
+    }
+
+
+def run_load_test(n_workers: int = 4, policy: str = 'thompson',
+                  data_path: Union[str, Path] = DEFAULT_DATA_PATH,
+                  snapshot_path: Union[str, Path] = None, snapshot_interval: float = 1.0,
+                  seed: int = 0) -> Dict[str, float]:
+    """
+    Replay ads_ctr_optimization.csv through worker processes sharing one bandit
+
+    Args:
+        n_workers (int): Number of worker processes
+        policy (str): 'ucb' or 'thompson'
+        data_path: Reward CSV
+        snapshot_path: Restore from / periodically save to this snapshot, if given
+        snapshot_interval (float): Seconds between snapshots
+        seed (int): Random seed
+
+    Returns:
+        Dict: Decisions, total reward, throughput and choose() latency percentiles
+    """
+    n_arms = load_reward_matrix(data_path).shape[1]
+    counters = SharedArmCounters(n_arms, n_workers)
+
+    try:
+        snapshot_writer = None
+        if snapshot_path:
+            restore_snapshot(counters, snapshot_path)
+            snapshot_writer = SnapshotWriter(counters, snapshot_path, snapshot_interval)
+            snapshot_writer.start()
+
+        context = mp.get_context('spawn')
+        args = [(counters.name, n_arms, n_workers, worker_id, policy, str(data_path), seed)
+                for worker_id in range(n_workers)]
+
+        with context.Pool(n_workers) as pool:
+            results = pool.starmap(replay_worker, args)
+
+        if snapshot_writer:
+            snapshot_writer.stop()
+        counts, sums = counters.totals()
+    finally:
+        counters.close()
+
+    latencies = np.concatenate([r['latencies_us'] for r in results])
+    decisions = sum(r['decisions'] for r in results)
+    elapsed = max(r['seconds'] for r in results)
+    return {
+        'workers': n_workers,
+        'policy': policy,
+        'decisions': decisions,
+        'total_reward': sum(r['total_reward'] for r in results),
+        'decisions_per_second': round(decisions / elapsed, 1),
+        'p50_us': round(float(np.percentile(latencies, 50)), 1),
+        'p99_us': round(float(np.percentile(latencies, 99)), 1),
+        'impressions_per_arm': counts.astype(int).tolist()
+    }
+
+
+def main():
+    """
+    Command line entry point for the load test
+    """
+    parser = argparse.ArgumentParser(description="Load-test the bandit decision service")
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--policy', choices=list(POLICIES), default='thompson')
+    parser.add_argument('--data', default=str(DEFAULT_DATA_PATH))
+    parser.add_argument('--snapshot', default=None, help="Snapshot file to restore from and save to")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    results = run_load_test(args.workers, args.policy, args.data, args.snapshot, seed=args.seed)
+
+    print(f"🎯 Policy: {results['policy']} | Workers: {results['workers']}")
+    print(f"📊 Decisions: {results['decisions']:,} | Total reward: {results['total_reward']:,}")
+    print(f"⏱️ Throughput: {results['decisions_per_second']:,.0f} decisions/s")
+    print(f"⏱️ choose() latency: p50 {results['p50_us']} µs | p99 {results['p99_us']} µs")
+    print(f"📋 Impressions per arm: {results['impressions_per_arm']}")
+
+if __name__ == "__main__":
+    main()
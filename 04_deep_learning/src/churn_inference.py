@@ -0,0 +1,510 @@
+"""
+Fused Churn ANN Inference
+
+The churn notebook scores a single customer with
+ann.predict(sc.transform([[...]])): a full Keras predict call per row, with
+the encoders and the scaler living separately in the notebook. This module
+exports the trained network into one small NumPy function:
+
+1. The StandardScaler / Normalization step is folded into the first Dense
+   layer (W' = W / scale, b' = b - (mean / scale) W)
+2. The Geography one-hot and Gender label encodings become row lookups in
+   that fused weight matrix, so raw columns go straight in
+3. The whole model is a handful of arrays saved in one .npz file
+4. A micro-batcher groups concurrent requests into one matrix product
+
+Usage:
+    python churn_inference.py --requests 20000 --clients 4 --max-wait-ms 0.05
+"""
+
+import time
+import queue
+import argparse
+import threading
+import numpy as np
+from pathlib import Path
+from concurrent.futures import Future
+from typing import Dict, List, Sequence, Tuple, Union
+
+try:
+    from .churn_pipeline import (ChurnPipeline, DEFAULT_DATA_PATH, FEATURE_NAMES, GENDERS, GEOGRAPHIES,
+                                 NUMERIC_COLUMNS)
+except ImportError:
+    from churn_pipeline import (ChurnPipeline, DEFAULT_DATA_PATH, FEATURE_NAMES, GENDERS, GEOGRAPHIES,
+                                NUMERIC_COLUMNS)
+
+# Positions of the raw columns in the encoded feature vector
+GEOGRAPHY_FEATURES = [FEATURE_NAMES.index(f'Geography_{geography}') for geography in GEOGRAPHIES]
+GENDER_FEATURE = FEATURE_NAMES.index('Gender')
+NUMERIC_FEATURES = [FEATURE_NAMES.index(name) for name in NUMERIC_COLUMNS]
+
+
+class FusedChurnModel:
+    """
+    NumPy churn scorer with encoding and scaling fused into the first layer
+    """
+
+    def __init__(self, weights: Sequence[np.ndarray], biases: Sequence[np.ndarray],
+                 geographies: Sequence[str] = GEOGRAPHIES, genders: Sequence[str] = GENDERS):
+        """
+        Initialize the model
+
+        Args:
+            weights (Sequence[np.ndarray]): Dense kernels; the first takes unscaled encoded features
+            biases (Sequence[np.ndarray]): Dense biases
+            geographies (Sequence[str]): Geography values, in one-hot order
+            genders (Sequence[str]): Gender values, in label-encoding order
+        """
+        self.weights = [np.ascontiguousarray(w, dtype=np.float64) for w in weights]
+        self.biases = [np.asarray(b, dtype=np.float64) for b in biases]
+        self.geographies = list(geographies)
+        self.genders = list(genders)
+
+        first = self.weights[0]
+        self._geography_rows = {name: first[i] for name, i in zip(self.geographies, GEOGRAPHY_FEATURES)}
+        self._gender_rows = {name: code * first[GENDER_FEATURE] for code, name in enumerate(self.genders)}
+        self._geography_table = first[GEOGRAPHY_FEATURES]
+        self._gender_table = np.outer(np.arange(len(self.genders)), first[GENDER_FEATURE])
+        self._numeric_weights = first[NUMERIC_FEATURES]
+
+    @classmethod
+    def from_dense(cls, mean: np.ndarray, scale: np.ndarray, layers: Sequence[Tuple[np.ndarray, np.ndarray]],
+                   geographies: Sequence[str] = GEOGRAPHIES, genders: Sequence[str] = GENDERS) -> 'FusedChurnModel':
+        """
+        Fuse a scaler into the first of a stack of Dense layers
+
+        Args:
+            mean (np.ndarray): Per-feature mean of the scaler
+            scale (np.ndarray): Per-feature divisor of the scaler
+            layers: (kernel, bias) per Dense layer; ReLU hidden layers and a sigmoid output
+            geographies (Sequence[str]): Geography values, in one-hot order
+            genders (Sequence[str]): Gender values, in label-encoding order
+
+        Returns:
+            FusedChurnModel: Fused model
+        """
+        mean = np.asarray(mean, dtype=np.float64).ravel()
+        scale = np.asarray(scale, dtype=np.float64).ravel()
+        kernels = [np.asarray(kernel, dtype=np.float64) for kernel, _ in layers]
+        biases = [np.asarray(bias, dtype=np.float64) for _, bias in layers]
+
+        kernels[0] = kernels[0] / scale[:, None]
+        biases[0] = biases[0] - mean @ kernels[0]
+        return cls(kernels, biases, geographies, genders)
+
+    @classmethod
+    def from_keras(cls, model, mean: np.ndarray = None, scale: np.ndarray = None,
+                   geographies: Sequence[str] = GEOGRAPHIES, genders: Sequence[str] = GENDERS) -> 'FusedChurnModel':
+        """
+        Export a Keras Sequential of Dense layers, optionally led by a Normalization layer
+
+        Args:
+            model: Keras model (the notebook's ann, or ChurnPipeline.model)
+            mean (np.ndarray): Scaler mean when the model has no Normalization layer
+            scale (np.ndarray): Scaler divisor when the model has no Normalization layer
+            geographies (Sequence[str]): Geography values, in one-hot order
+            genders (Sequence[str]): Gender values, in label-encoding order
+
+        Returns:
+            FusedChurnModel: Fused model
+        """
+        import keras
+
+        dense = []
+        for layer in model.layers:
+            if isinstance(layer, keras.layers.Normalization):
+                mean = np.asarray(layer.mean).ravel()
+                scale = np.maximum(np.sqrt(np.asarray(layer.variance).ravel()), keras.config.epsilon())
+            elif isinstance(layer, keras.layers.Dense):
+                dense.append(layer)
+            else:
+                raise ValueError(f"Cannot export layer {layer.name} ({type(layer).__name__})")
+
+        activations = [layer.get_config()['activation'] for layer in dense]
+        if any(activation != 'relu' for activation in activations[:-1]) or activations[-1] != 'sigmoid':
+            raise ValueError(f"Expected ReLU hidden layers and a sigmoid output, got {activations}")
+
+        n_features = dense[0].get_weights()[0].shape[0]
+        mean = np.zeros(n_features) if mean is None else mean
+        scale = np.ones(n_features) if scale is None else scale
+        return cls.from_dense(mean, scale, [tuple(layer.get_weights()) for layer in dense], geographies, genders)
+
+    @classmethod
+    def from_pipeline(cls, pipeline: ChurnPipeline) -> 'FusedChurnModel':
+        """
+        Export a trained ChurnPipeline
+
+        Args:
+            pipeline (ChurnPipeline): Trained pipeline
+
+        Returns:
+            FusedChurnModel: Fused model
+        """
+        return cls.from_keras(pipeline.model, geographies=pipeline.encoder.geographies,
+                              genders=pipeline.encoder.genders)
+
+    @classmethod
+    def from_notebook(cls, ann, sc) -> 'FusedChurnModel':
+        """
+        Export the notebook's ann and StandardScaler
+
+        Args:
+            ann: Trained Keras Sequential
+            sc: StandardScaler fit on the encoded training features
+
+        Returns:
+            FusedChurnModel: Fused model
+        """
+        return cls.from_keras(ann, mean=sc.mean_, scale=sc.scale_)
+
+    def _forward(self, hidden: np.ndarray) -> np.ndarray:
+        """Layers after the fused first product (hidden holds its pre-activation)"""
+        for weights, bias in zip(self.weights[1:], self.biases[1:]):
+            hidden = np.maximum(hidden, 0.0) @ weights + bias
+        return 1.0 / (1.0 + np.exp(-hidden[..., 0]))
+
+    def predict_encoded(self, X: np.ndarray) -> np.ndarray:
+        """
+        Score unscaled encoded rows, as passed to sc.transform in the notebook
+
+        Args:
+            X (np.ndarray): (n, 12) features in the ColumnTransformer layout
+
+        Returns:
+            np.ndarray: Churn probabilities
+        """
+        X = np.atleast_2d(np.asarray(X, dtype=np.float64))
+        return self._forward(X @ self.weights[0] + self.biases[0])
+
+    def predict_columns(self, columns: Dict[str, Sequence]) -> np.ndarray:
+        """
+        Score a batch of raw customers
+
+        Args:
+            columns (Dict[str, Sequence]): Geography, Gender and the numeric columns
+
+        Returns:
+            np.ndarray: Churn probabilities
+        """
+        geography = _category_codes(columns['Geography'], self.geographies)
+        gender = _category_codes(columns['Gender'], self.genders)
+        numeric = np.column_stack([np.asarray(columns[name], dtype=np.float64) for name in NUMERIC_COLUMNS])
+        hidden = (numeric @ self._numeric_weights + self._geography_table[geography]
+                  + self._gender_table[gender] + self.biases[0])
+        return self._forward(hidden)
+
+    def predict_one(self, record: Dict) -> float:
+        """
+        Score one raw customer (the low-latency path)
+
+        Args:
+            record (Dict): Geography, Gender and the numeric columns
+
+        Returns:
+            float: Churn probability
+        """
+        self.validate(record)
+        numeric = np.array([record[name] for name in NUMERIC_COLUMNS], dtype=np.float64)
+        hidden = (numeric @ self._numeric_weights + self._geography_rows[record['Geography']]
+                  + self._gender_rows[record['Gender']] + self.biases[0])
+        return float(self._forward(hidden))
+
+    def validate(self, record: Dict):
+        """
+        Check one raw customer's categories, raising the same error as predict_columns
+
+        Args:
+            record (Dict): Geography, Gender and the numeric columns
+        """
+        unknown = [value for value, known in ((record['Geography'], self._geography_rows),
+                                              (record['Gender'], self._gender_rows)) if value not in known]
+        if unknown:
+            raise ValueError(f"Unknown categories: {sorted(map(str, unknown))}")
+
+    def save(self, path: Union[str, Path]):
+        """
+        Save the fused arrays to an .npz file
+
+        Args:
+            path: Output file
+        """
+        arrays = {f'weight_{i}': w for i, w in enumerate(self.weights)}
+        arrays.update({f'bias_{i}': b for i, b in enumerate(self.biases)})
+        np.savez(path, geographies=np.array(self.geographies), genders=np.array(self.genders), **arrays)
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> 'FusedChurnModel':
+        """
+        Load a model saved with save()
+
+        Args:
+            path: .npz file
+
+        Returns:
+            FusedChurnModel: Loaded model
+        """
+        with np.load(path) as data:
+            n_layers = sum(1 for key in data.files if key.startswith('weight_'))
+            return cls([data[f'weight_{i}'] for i in range(n_layers)], [data[f'bias_{i}'] for i in range(n_layers)],
+                       data['geographies'].tolist(), data['genders'].tolist())
+
+
+def _category_codes(values: Sequence[str], vocabulary: Sequence[str]) -> np.ndarray:
+    """Vectorized vocabulary lookup that rejects unknown values"""
+    values = np.asarray(values)
+    order = np.argsort(vocabulary)
+    ordered = np.asarray(vocabulary)[order]
+    positions = np.searchsorted(ordered, values).clip(max=len(ordered) - 1)
+    unknown = ordered[positions] != values
+    if unknown.any():
+        raise ValueError(f"Unknown categories: {sorted(set(values[unknown].tolist()))}")
+    return order[positions]
+
+
+class MicroBatcher(threading.Thread):
+    """
+    Background thread that scores concurrent requests in small batches
+    """
+
+    def __init__(self, model: FusedChurnModel, max_batch: int = 64, max_wait_ms: float = 0.05):
+        """
+        Initialize the batcher
+
+        Args:
+            model (FusedChurnModel): Model to score with
+            max_batch (int): Largest batch scored at once
+            max_wait_ms (float): Longest time the first request of a batch waits for company;
+                keep it well below the latency target, since it is added to every batch
+        """
+        super().__init__(daemon=True)
+        self.model = model
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self.batch_sizes = []
+        # queue.Queue rather than SimpleQueue: SimpleQueue.get with the very short
+        # batching timeouts was seen to block indefinitely on CPython 3.11
+        self._queue = queue.Queue()
+        self._stop_event = threading.Event()
+
+    def submit(self, record: Dict) -> Future:
+        """
+        Queue one customer for scoring
+
+        Invalid records fail their own future immediately instead of joining a batch.
+
+        Args:
+            record (Dict): Geography, Gender and the numeric columns
+
+        Returns:
+            Future: Resolves to the churn probability
+        """
+        future = Future()
+        try:
+            self.model.validate(record)
+        except (KeyError, ValueError) as error:
+            future.set_exception(error)
+            return future
+        self._queue.put((record, future))
+        return future
+
+    def run(self):
+        """Collect and score batches until stopped"""
+        while not self._stop_event.is_set():
+            try:
+                batch = [self._queue.get(timeout=0.05)]
+            except queue.Empty:
+                continue
+
+            deadline = time.perf_counter() + self.max_wait
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            # Skip requests cancelled while queued; the rest can no longer be cancelled
+            batch = [(record, future) for record, future in batch if future.set_running_or_notify_cancel()]
+            if not batch:
+                continue
+            try:
+                self._score_batch(batch)
+            except Exception as error:
+                # Never let one batch end the thread: later submits would hang
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(error)
+            self.batch_sizes.append(len(batch))
+
+    def _score_batch(self, batch: List[Tuple[Dict, Future]]):
+        """Score a batch in one matrix product, falling back to row by row on error"""
+        try:
+            records = [record for record, _ in batch]
+            columns = {name: [record[name] for record in records] for name in records[0]}
+            probabilities = self.model.predict_columns(columns)
+        except Exception:
+            # Re-score row by row so only the offending requests fail
+            self._score_rows(batch)
+            return
+        for (_, future), probability in zip(batch, probabilities):
+            future.set_result(float(probability))
+
+    def _score_rows(self, batch: List[Tuple[Dict, Future]]):
+        """Score a failed batch one request at a time"""
+        for record, future in batch:
+            try:
+                future.set_result(self.model.predict_one(record))
+            except Exception as error:
+                future.set_exception(error)
+
+    def stop(self):
+        """Stop the thread"""
+        self._stop_event.set()
+        self.join()
+
+
+def summarize_latencies(latencies: List[float]) -> Dict[str, float]:
+    """
+    Latency percentiles in milliseconds
+
+    Args:
+        latencies (List[float]): Request latencies in seconds
+
+    Returns:
+        Dict[str, float]: p50, p99 and max
+    """
+    latencies_ms = np.asarray(latencies) * 1000
+    return {
+        'p50_ms': round(float(np.percentile(latencies_ms, 50)), 4),
+        'p99_ms': round(float(np.percentile(latencies_ms, 99)), 4),
+        'max_ms': round(float(latencies_ms.max()), 4)
+    }
+
+
+def load_records(path: Union[str, Path] = DEFAULT_DATA_PATH) -> List[Dict]:
+    """
+    Raw customers of churn_modelling.csv as request payloads
+
+    Args:
+        path: churn_modelling.csv
+
+    Returns:
+        List[Dict]: One dict of raw columns per customer
+    """
+    import pandas as pd
+
+    columns = ['Geography', 'Gender'] + NUMERIC_COLUMNS
+    return pd.read_csv(path, usecols=columns)[columns].to_dict('records')
+
+
+def keras_inputs(columns: Dict[str, Sequence]) -> Dict:
+    """
+    Raw columns as tensors for the exported Keras model
+
+    Args:
+        columns (Dict[str, Sequence]): Geography, Gender and the numeric columns
+
+    Returns:
+        Dict: One tensor per column
+    """
+    import tensorflow as tf
+
+    return {name: tf.constant(values, dtype=tf.string if name in ('Geography', 'Gender') else tf.float32)
+            for name, values in columns.items()}
+
+
+def benchmark(model: FusedChurnModel, keras_model, records: List[Dict], n_requests: int = 20_000,
+              n_clients: int = 4, n_keras: int = 200, max_wait_ms: float = 0.05) -> Dict[str, Dict[str, float]]:
+    """
+    Per-request latency of Keras predict, the fused single-row path and the micro-batcher
+
+    Args:
+        model (FusedChurnModel): Fused model
+        keras_model: End-to-end Keras model taking raw columns (ChurnPipeline.export())
+        records (List[Dict]): Request payloads
+        n_requests (int): Requests for the fused paths
+        n_clients (int): Concurrent client threads for the micro-batcher
+        n_keras (int): Requests for the (slow) Keras path
+        max_wait_ms (float): Micro-batcher wait for company
+
+    Returns:
+        Dict[str, Dict[str, float]]: Latency percentiles and throughput per path
+    """
+    results = {}
+
+    latencies = []
+    for record in records[:n_keras]:
+        start_time = time.perf_counter()
+        keras_model.predict(keras_inputs({name: [value] for name, value in record.items()}), verbose=0)
+        latencies.append(time.perf_counter() - start_time)
+    results['keras predict'] = summarize_latencies(latencies)
+
+    latencies = []
+    for i in range(n_requests):
+        record = records[i % len(records)]
+        start_time = time.perf_counter()
+        model.predict_one(record)
+        latencies.append(time.perf_counter() - start_time)
+    results['fused predict_one'] = summarize_latencies(latencies)
+
+    batcher = MicroBatcher(model, max_wait_ms=max_wait_ms)
+    batcher.start()
+    client_latencies = [[] for _ in range(n_clients)]
+
+    def client(worker: int):
+        for i in range(worker, n_requests, n_clients):
+            start_time = time.perf_counter()
+            batcher.submit(records[i % len(records)]).result()
+            client_latencies[worker].append(time.perf_counter() - start_time)
+
+    start_time = time.perf_counter()
+    threads = [threading.Thread(target=client, args=(worker,)) for worker in range(n_clients)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start_time
+    batcher.stop()
+
+    results[f'micro-batched x {n_clients} clients'] = {
+        **summarize_latencies([latency for worker in client_latencies for latency in worker]),
+        'requests_per_second': round(n_requests / elapsed),
+        'mean_batch': round(float(np.mean(batcher.batch_sizes)), 1)
+    }
+    return results
+
+
+def main():
+    """
+    Command line entry point: train with ChurnPipeline, export and benchmark
+    """
+    parser = argparse.ArgumentParser(description="Fused NumPy inference for the churn ANN")
+    parser.add_argument('--data', default=str(DEFAULT_DATA_PATH))
+    parser.add_argument('--epochs', type=int, default=20)
+    parser.add_argument('--requests', type=int, default=20_000)
+    parser.add_argument('--clients', type=int, default=4)
+    parser.add_argument('--max-wait-ms', type=float, default=0.05)
+    parser.add_argument('--output', default=None, help="Save the fused model to this .npz file")
+    args = parser.parse_args()
+
+    pipeline = ChurnPipeline()
+    pipeline.fit([args.data], epochs=args.epochs)
+    keras_model = pipeline.export()
+    model = FusedChurnModel.from_pipeline(pipeline)
+    if args.output:
+        model.save(args.output)
+        print(f"💾 Saved fused model to {args.output}")
+
+    records = load_records(args.data)
+    columns = {name: np.array([record[name] for record in records]) for name in records[0]}
+    difference = np.abs(model.predict_columns(columns) - keras_model.predict(keras_inputs(columns), verbose=0).ravel()).max()
+    print(f"✅ Max |fused - Keras| over {len(records):,} customers: {difference:.2e}")
+
+    for path, stats in benchmark(model, keras_model, records, args.requests, args.clients,
+                                       max_wait_ms=args.max_wait_ms).items():
+        print(f"⏱️ {path:<28} " + ', '.join(f"{key}={value}" for key, value in stats.items()))
+
+if __name__ == "__main__":
+    main()
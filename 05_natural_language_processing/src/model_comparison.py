@@ -0,0 +1,297 @@
+"""
+Parallel Model Comparison
+
+The advanced notebooks train MultinomialNB, BernoulliNB, LogisticRegression,
+SVC and RandomForest one after another, re-vectorizing the corpus for every
+model and again inside GridSearchCV. This harness:
+
+1. Vectorizes each cross-validation fold once (fit on the fold's training
+   documents only) and caches the CSR matrices on disk
+2. Runs every model x fold job in a process pool; workers memory-map the
+   cached fold matrices instead of receiving pickled copies
+3. Expands parameter grids into extra models that share the same folds
+4. Returns a leaderboard with accuracy, fit time and per-document predict latency
+
+Usage:
+    python model_comparison.py --documents 20000 --workers 4
+"""
+
+import os
+import json
+import time
+import hashlib
+import argparse
+import joblib
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from scipy import sparse
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Sequence, Union
+from sklearn.base import BaseEstimator, clone
+from sklearn.model_selection import StratifiedKFold, ParameterGrid
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.naive_bayes import MultinomialNB, BernoulliNB
+from sklearn.linear_model import LogisticRegression
+from sklearn.svm import SVC
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.metrics import accuracy_score
+
+try:
+    from .text_preprocessing import TextPreprocessor
+    from .sparse_text_classifier import make_labeled_reviews
+except ImportError:
+    from text_preprocessing import TextPreprocessor
+    from sparse_text_classifier import make_labeled_reviews
+
+DEFAULT_CACHE_DIR = Path(__file__).parent.parent / "cache" / "folds"
+
+# The five algorithms compared in notebooks 03 and 04
+DEFAULT_MODELS = {
+    'Multinomial NB': MultinomialNB(),
+    'Bernoulli NB': BernoulliNB(),
+    'Logistic Regression': LogisticRegression(random_state=42, max_iter=1000),
+    'SVM': SVC(kernel='linear', random_state=42),
+    'Random Forest': RandomForestClassifier(n_estimators=100, random_state=42)
+}
+
+
+def default_vectorizer() -> TfidfVectorizer:
+    """
+    TF-IDF settings of the advanced notebooks, on the shared preprocessor
+
+    Returns:
+        TfidfVectorizer: Unfitted vectorizer
+    """
+    return TfidfVectorizer(tokenizer=TextPreprocessor.from_preset('sentiment').tokenize,
+                           token_pattern=None, lowercase=False, max_features=1000,
+                           ngram_range=(1, 2), dtype=np.float32)
+
+
+def expand_grid(name: str, estimator: BaseEstimator, param_grid: Dict[str, list]) -> Dict[str, BaseEstimator]:
+    """
+    Turn a parameter grid into named model variants
+
+    Args:
+        name (str): Base model name
+        estimator (BaseEstimator): Unfitted estimator
+        param_grid (Dict[str, list]): Parameter values to try, as for GridSearchCV
+
+    Returns:
+        Dict[str, BaseEstimator]: One estimator per parameter combination
+    """
+    variants = {}
+    for params in ParameterGrid(param_grid):
+        label = ', '.join(f"{key}={value}" for key, value in params.items())
+        variants[f"{name} ({label})"] = clone(estimator).set_params(**params)
+    return variants
+
+
+def save_csr(matrix: sparse.csr_matrix, directory: Path, name: str):
+    """Store a CSR matrix as separate .npy arrays that can be memory-mapped"""
+    np.save(directory / f"{name}_data.npy", matrix.data)
+    np.save(directory / f"{name}_indices.npy", matrix.indices)
+    np.save(directory / f"{name}_indptr.npy", matrix.indptr)
+    np.save(directory / f"{name}_shape.npy", np.array(matrix.shape))
+
+
+def load_csr(directory: Union[str, Path], name: str) -> sparse.csr_matrix:
+    """Memory-map a CSR matrix stored by save_csr"""
+    directory = Path(directory)
+    arrays = [np.load(directory / f"{name}_{part}.npy", mmap_mode='r') for part in ('data', 'indices', 'indptr')]
+    shape = tuple(np.load(directory / f"{name}_shape.npy"))
+    return sparse.csr_matrix(tuple(arrays), shape=shape, copy=False)
+
+
+def _cache_key(texts: Sequence[str], labels: np.ndarray, vectorizer: BaseEstimator,
+               n_splits: int, random_state: int) -> str:
+    """Fingerprint of the corpus, labels, vectorizer settings and fold layout"""
+    digest = hashlib.sha1()
+    for text in texts:
+        digest.update(text.encode('utf-8', 'surrogatepass'))
+        digest.update(b'\0')
+    digest.update(np.asarray(labels).tobytes())
+
+    params = {key: _param_fingerprint(key, value) for key, value in sorted(vectorizer.get_params().items())}
+    digest.update(json.dumps([type(vectorizer).__name__, params, n_splits, random_state]).encode())
+    return digest.hexdigest()[:16]
+
+
+def _param_fingerprint(name: str, value) -> str:
+    """
+    Stable text for one vectorizer parameter
+
+    Bound methods (e.g. TextPreprocessor.tokenize) are fingerprinted with their
+    owner's state, so preprocessors with different settings get different keys.
+    Module-level functions are identified by name; other callables (lambdas,
+    closures, callable objects) cannot be fingerprinted and are refused.
+    """
+    if not callable(value) or isinstance(value, type):
+        return repr(value)
+
+    qualname = f"{getattr(value, '__module__', '')}.{getattr(value, '__qualname__', '')}"
+    owner = getattr(value, '__self__', None)
+    if owner is not None and not isinstance(owner, type(joblib)):
+        return f"{qualname}:{joblib.hash(owner)}"
+    if owner is None and hasattr(value, '__qualname__') and '<' not in value.__qualname__:
+        return qualname
+    raise ValueError(f"Cannot fingerprint vectorizer parameter '{name}' ({value!r}) for the fold cache; "
+                     "use a module-level function or a bound method of a picklable object")
+
+
+def prepare_folds(texts: Sequence[str], labels: Sequence, vectorizer: BaseEstimator = None,
+                  n_splits: int = 5, random_state: int = 42,
+                  cache_dir: Union[str, Path] = DEFAULT_CACHE_DIR) -> List[Path]:
+    """
+    Vectorize every fold once and cache the matrices
+
+    Args:
+        texts (Sequence[str]): Raw documents
+        labels (Sequence): Class labels
+        vectorizer (BaseEstimator): Unfitted text vectorizer (default: notebook TF-IDF)
+        n_splits (int): Number of stratified folds
+        random_state (int): Fold shuffling seed
+        cache_dir: Directory for the fold cache
+
+    Returns:
+        List[Path]: One directory per fold
+    """
+    texts = list(texts)
+    labels = np.asarray(labels)
+    vectorizer = vectorizer if vectorizer is not None else default_vectorizer()
+
+    root = Path(cache_dir) / _cache_key(texts, labels, vectorizer, n_splits, random_state)
+    fold_dirs = [root / f"fold_{i}" for i in range(n_splits)]
+    if all((fold_dir / 'done').exists() for fold_dir in fold_dirs):
+        return fold_dirs
+
+    folds = StratifiedKFold(n_splits=n_splits, shuffle=True, random_state=random_state)
+    for fold_dir, (train_index, test_index) in zip(fold_dirs, folds.split(np.zeros(len(labels)), labels)):
+        fold_dir.mkdir(parents=True, exist_ok=True)
+        fold_vectorizer = clone(vectorizer)
+        X_train = fold_vectorizer.fit_transform([texts[i] for i in train_index]).tocsr()
+        X_test = fold_vectorizer.transform([texts[i] for i in test_index]).tocsr()
+
+        save_csr(X_train, fold_dir, 'X_train')
+        save_csr(X_test, fold_dir, 'X_test')
+        np.save(fold_dir / 'y_train.npy', labels[train_index])
+        np.save(fold_dir / 'y_test.npy', labels[test_index])
+        (fold_dir / 'done').touch()
+
+    return fold_dirs
+
+
+def run_job(fold_dir: Union[str, Path], model_name: str, estimator: BaseEstimator) -> Dict:
+    """
+    Fit and score one model on one cached fold
+
+    Args:
+        fold_dir: Fold directory from prepare_folds
+        model_name (str): Leaderboard name of the model
+        estimator (BaseEstimator): Unfitted estimator
+
+    Returns:
+        Dict: accuracy, fit seconds and predict latency for the fold
+    """
+    fold_dir = Path(fold_dir)
+    X_train, X_test = load_csr(fold_dir, 'X_train'), load_csr(fold_dir, 'X_test')
+    y_train, y_test = np.load(fold_dir / 'y_train.npy'), np.load(fold_dir / 'y_test.npy')
+
+    model = clone(estimator)
+    start_time = time.perf_counter()
+    model.fit(X_train, y_train)
+    fit_seconds = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    y_pred = model.predict(X_test)
+    predict_seconds = time.perf_counter() - start_time
+
+    return {
+        'model': model_name,
+        'fold': fold_dir.name,
+        'accuracy': accuracy_score(y_test, y_pred),
+        'fit_seconds': fit_seconds,
+        'predict_us_per_doc': predict_seconds / len(y_test) * 1e6
+    }
+
+
+def compare_models(texts: Sequence[str], labels: Sequence, models: Dict[str, BaseEstimator] = None,
+                   vectorizer: BaseEstimator = None, n_splits: int = 5, n_workers: int = None,
+                   random_state: int = 42, cache_dir: Union[str, Path] = DEFAULT_CACHE_DIR) -> pd.DataFrame:
+    """
+    Cross-validate several models on shared, cached fold matrices
+
+    Args:
+        texts (Sequence[str]): Raw documents
+        labels (Sequence): Class labels
+        models (Dict[str, BaseEstimator]): Named unfitted estimators (default: the notebooks' five)
+        vectorizer (BaseEstimator): Unfitted text vectorizer (default: notebook TF-IDF)
+        n_splits (int): Number of stratified folds
+        n_workers (int): Worker processes (default: one per CPU)
+        random_state (int): Fold shuffling seed
+        cache_dir: Directory for the fold cache
+
+    Returns:
+        pd.DataFrame: Leaderboard sorted by mean accuracy
+    """
+    models = models or DEFAULT_MODELS
+    fold_dirs = prepare_folds(texts, labels, vectorizer, n_splits, random_state, cache_dir)
+    jobs = [(str(fold_dir), name, estimator) for name, estimator in models.items() for fold_dir in fold_dirs]
+
+    n_workers = n_workers or os.cpu_count() or 1
+    if n_workers == 1:
+        results = [run_job(*job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(n_workers) as pool:
+            results = list(pool.map(run_job, *zip(*jobs)))
+
+    return leaderboard(pd.DataFrame(results))
+
+
+def leaderboard(results: pd.DataFrame) -> pd.DataFrame:
+    """
+    Aggregate per-fold results into a leaderboard
+
+    Args:
+        results (pd.DataFrame): One row per model x fold
+
+    Returns:
+        pd.DataFrame: Mean/std accuracy, mean fit seconds and predict latency per model
+    """
+    board = results.groupby('model').agg(
+        accuracy=('accuracy', 'mean'),
+        accuracy_std=('accuracy', 'std'),
+        fit_seconds=('fit_seconds', 'mean'),
+        predict_us_per_doc=('predict_us_per_doc', 'mean')
+    )
+    board = board.sort_values(['accuracy', 'fit_seconds'], ascending=[False, True])
+    board.insert(0, 'rank', np.arange(1, len(board) + 1))
+    return board.round({'accuracy': 4, 'accuracy_std': 4, 'fit_seconds': 4, 'predict_us_per_doc': 2})
+
+
+def main():
+    """
+    Command line entry point: compare the notebook models on synthetic reviews
+    """
+    parser = argparse.ArgumentParser(description="Parallel cross-validated model comparison")
+    parser.add_argument('--documents', type=int, default=20_000)
+    parser.add_argument('--folds', type=int, default=5)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--grid', action='store_true', help="Add a LogisticRegression C grid")
+    args = parser.parse_args()
+
+    texts, labels = make_labeled_reviews(args.documents)
+    models = dict(DEFAULT_MODELS)
+    if args.grid:
+        models.update(expand_grid('Logistic Regression', models.pop('Logistic Regression'),
+                                  {'C': [0.1, 1.0, 10.0]}))
+
+    start_time = time.perf_counter()
+    board = compare_models(texts, labels, models, n_splits=args.folds, n_workers=args.workers)
+    elapsed = time.perf_counter() - start_time
+
+    print(f"🏆 {len(models)} models x {args.folds} folds on {len(texts):,} documents in {elapsed:.1f}s")
+    print(board.to_string())
+
+if __name__ == "__main__":
+    main()
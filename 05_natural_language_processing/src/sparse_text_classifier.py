@@ -0,0 +1,352 @@
+"""
+Sparse Text Classification
+
+The notebooks turn the bag-of-words matrix dense with .toarray() before
+training, which needs n_documents * n_features floats. This module keeps
+the CSR matrix sparse from vectorizer to model:
+
+1. SparseTextClassifier: CountVectorizer / TfidfVectorizer feeding a
+   sparse-aware model (MultinomialNB, ComplementNB, LogisticRegression,
+   LinearSVC or SGDClassifier)
+2. StreamingTextClassifier: a stateless HashingVectorizer and partial_fit
+   over chunks, so a corpus larger than memory can be trained out-of-core
+
+Usage:
+    python sparse_text_classifier.py --documents 1000000
+"""
+
+import time
+import argparse
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from scipy import sparse
+from typing import Dict, Iterable, Iterator, List, Sequence, Tuple, Union
+from sklearn.pipeline import Pipeline
+from sklearn.feature_extraction.text import CountVectorizer, TfidfVectorizer, HashingVectorizer
+from sklearn.naive_bayes import MultinomialNB, ComplementNB
+from sklearn.linear_model import LogisticRegression, SGDClassifier
+from sklearn.svm import LinearSVC
+from sklearn.metrics import accuracy_score, confusion_matrix
+from sklearn.model_selection import train_test_split
+
+try:
+    from .text_preprocessing import TextPreprocessor
+except ImportError:
+    from text_preprocessing import TextPreprocessor
+
+MODELS = {
+    'multinomial_nb': lambda: MultinomialNB(),
+    'complement_nb': lambda: ComplementNB(),
+    'logistic_regression': lambda: LogisticRegression(max_iter=1000, solver='liblinear'),
+    'linear_svc': lambda: LinearSVC(),
+    'sgd': lambda: SGDClassifier(loss='log_loss', random_state=0)
+}
+
+# Models that can learn incrementally with partial_fit
+STREAMING_MODELS = {
+    'multinomial_nb': lambda: MultinomialNB(),
+    'complement_nb': lambda: ComplementNB(),
+    'sgd': lambda: SGDClassifier(loss='log_loss', random_state=0)
+}
+
+
+def sparse_nbytes(matrix: sparse.spmatrix) -> int:
+    """
+    Memory used by a CSR/CSC matrix
+
+    Args:
+        matrix (sparse.spmatrix): Sparse matrix
+
+    Returns:
+        int: Bytes of data, indices and indptr
+    """
+    return matrix.data.nbytes + matrix.indices.nbytes + matrix.indptr.nbytes
+
+
+class SparseTextClassifier:
+    """
+    Bag-of-words text classifier that never densifies the feature matrix
+    """
+
+    def __init__(self, vectorizer: str = 'count', model: str = 'multinomial_nb',
+                 max_features: int = 1500, ngram_range: Tuple[int, int] = (1, 1),
+                 preset: str = 'restaurant_reviews'):
+        """
+        Initialize the classifier
+
+        Args:
+            vectorizer (str): 'count' or 'tfidf'
+            model (str): One of MODELS
+            max_features (int): Vocabulary size (None for no limit)
+            ngram_range (Tuple[int, int]): n-gram range
+            preset (str): TextPreprocessor preset (None to use raw tokens)
+        """
+        if vectorizer not in ('count', 'tfidf'):
+            raise ValueError("vectorizer must be 'count' or 'tfidf'")
+        if model not in MODELS:
+            raise ValueError(f"Unknown model '{model}'. Choose from {list(MODELS)}")
+
+        tokenizer = TextPreprocessor.from_preset(preset).tokenize if preset else None
+        vectorizer_class = CountVectorizer if vectorizer == 'count' else TfidfVectorizer
+        self.pipeline = Pipeline([
+            ('vectorizer', vectorizer_class(tokenizer=tokenizer, lowercase=tokenizer is None,
+                                            token_pattern=None if tokenizer else r"(?u)\b\w\w+\b",
+                                            max_features=max_features, ngram_range=ngram_range,
+                                            dtype=np.float32)),
+            ('model', MODELS[model]())
+        ])
+
+    def fit(self, texts: Sequence[str], labels: Sequence) -> 'SparseTextClassifier':
+        """
+        Fit the vectorizer and model
+
+        Args:
+            texts (Sequence[str]): Raw documents
+            labels (Sequence): Class labels
+
+        Returns:
+            SparseTextClassifier: self
+        """
+        self.pipeline.fit(texts, labels)
+        return self
+
+    def predict(self, texts: Sequence[str]) -> np.ndarray:
+        """
+        Predict class labels
+
+        Args:
+            texts (Sequence[str]): Raw documents
+
+        Returns:
+            np.ndarray: Predicted labels
+        """
+        return self.pipeline.predict(texts)
+
+    def transform(self, texts: Sequence[str]) -> sparse.csr_matrix:
+        """
+        Vectorize documents with the fitted vocabulary
+
+        Args:
+            texts (Sequence[str]): Raw documents
+
+        Returns:
+            sparse.csr_matrix: Feature matrix
+        """
+        return self.pipeline.named_steps['vectorizer'].transform(texts)
+
+    def evaluate(self, texts: Sequence[str], labels: Sequence, test_size: float = 0.2,
+                 random_state: int = 0) -> Dict:
+        """
+        Train/test split, fit and score, as in the notebooks
+
+        Args:
+            texts (Sequence[str]): Raw documents
+            labels (Sequence): Class labels
+            test_size (float): Fraction held out
+            random_state (int): Split seed
+
+        Returns:
+            Dict: accuracy, confusion matrix, timings and feature matrix memory
+        """
+        X_train, X_test, y_train, y_test = train_test_split(list(texts), np.asarray(labels),
+                                                            test_size=test_size, random_state=random_state)
+        start_time = time.perf_counter()
+        self.fit(X_train, y_train)
+        fit_seconds = time.perf_counter() - start_time
+
+        start_time = time.perf_counter()
+        y_pred = self.predict(X_test)
+        predict_seconds = time.perf_counter() - start_time
+
+        features = self.transform(X_test)
+        return {
+            'accuracy': accuracy_score(y_test, y_pred),
+            'confusion_matrix': confusion_matrix(y_test, y_pred),
+            'fit_seconds': round(fit_seconds, 3),
+            'predict_seconds': round(predict_seconds, 3),
+            'test_matrix_mb': round(sparse_nbytes(features) / 1024 ** 2, 2),
+            'dense_equivalent_mb': round(features.shape[0] * features.shape[1] * 8 / 1024 ** 2, 2)
+        }
+
+
+class StreamingTextClassifier:
+    """
+    Out-of-core text classifier: HashingVectorizer + partial_fit over chunks
+    """
+
+    def __init__(self, model: str = 'sgd', n_features: int = 2 ** 20,
+                 ngram_range: Tuple[int, int] = (1, 1), preset: str = 'restaurant_reviews'):
+        """
+        Initialize the classifier
+
+        Args:
+            model (str): One of STREAMING_MODELS
+            n_features (int): Hash space size
+            ngram_range (Tuple[int, int]): n-gram range
+            preset (str): TextPreprocessor preset (None to use raw tokens)
+        """
+        if model not in STREAMING_MODELS:
+            raise ValueError(f"Unknown streaming model '{model}'. Choose from {list(STREAMING_MODELS)}")
+
+        tokenizer = TextPreprocessor.from_preset(preset).tokenize if preset else None
+        # Naive Bayes needs non-negative counts, so no alternating signs
+        self.vectorizer = HashingVectorizer(tokenizer=tokenizer, lowercase=tokenizer is None,
+                                            token_pattern=None if tokenizer else r"(?u)\b\w\w+\b",
+                                            n_features=n_features, ngram_range=ngram_range,
+                                            alternate_sign=False, norm=None if model != 'sgd' else 'l2',
+                                            dtype=np.float32)
+        self.model = STREAMING_MODELS[model]()
+        self.classes_ = None
+        self.n_documents_ = 0
+
+    def partial_fit(self, texts: Sequence[str], labels: Sequence,
+                    classes: Sequence = None) -> 'StreamingTextClassifier':
+        """
+        Learn from one chunk of documents
+
+        Args:
+            texts (Sequence[str]): Raw documents
+            labels (Sequence): Class labels
+            classes (Sequence): All class labels (required on the first call)
+
+        Returns:
+            StreamingTextClassifier: self
+        """
+        if self.classes_ is None:
+            if classes is None:
+                raise ValueError("classes must be given on the first partial_fit call")
+            self.classes_ = np.asarray(classes)
+
+        self.model.partial_fit(self.vectorizer.transform(texts), labels, classes=self.classes_)
+        self.n_documents_ += len(texts)
+        return self
+
+    def fit_stream(self, chunks: Iterable[Tuple[Sequence[str], Sequence]],
+                   classes: Sequence) -> 'StreamingTextClassifier':
+        """
+        Train over an iterable of (texts, labels) chunks
+
+        Args:
+            chunks (Iterable[Tuple[Sequence[str], Sequence]]): Training chunks
+            classes (Sequence): All class labels
+
+        Returns:
+            StreamingTextClassifier: self
+        """
+        for texts, labels in chunks:
+            self.partial_fit(texts, labels, classes)
+        return self
+
+    def predict(self, texts: Sequence[str]) -> np.ndarray:
+        """
+        Predict class labels
+
+        Args:
+            texts (Sequence[str]): Raw documents
+
+        Returns:
+            np.ndarray: Predicted labels
+        """
+        return self.model.predict(self.vectorizer.transform(texts))
+
+    def score_stream(self, chunks: Iterable[Tuple[Sequence[str], Sequence]]) -> float:
+        """
+        Accuracy over an iterable of (texts, labels) chunks
+
+        Args:
+            chunks (Iterable[Tuple[Sequence[str], Sequence]]): Evaluation chunks
+
+        Returns:
+            float: Accuracy
+        """
+        correct = total = 0
+        for texts, labels in chunks:
+            correct += int((self.predict(texts) == np.asarray(labels)).sum())
+            total += len(texts)
+        return correct / total if total else float('nan')
+
+
+def iter_text_chunks(path: Union[str, Path], text_column: str = 'Review', label_column: str = 'Liked',
+                     chunk_size: int = 100_000, delimiter: str = '\t',
+                     quoting: int = 3) -> Iterator[Tuple[List[str], np.ndarray]]:
+    """
+    Read a labeled text file in chunks (defaults match Restaurant_Reviews.tsv)
+
+    Args:
+        path: Delimited text file
+        text_column (str): Column holding the documents
+        label_column (str): Column holding the labels
+        chunk_size (int): Rows per chunk
+        delimiter (str): Field delimiter
+        quoting (int): csv quoting mode (3 = QUOTE_NONE, as in the notebook)
+
+    Yields:
+        Tuple[List[str], np.ndarray]: Documents and labels of one chunk
+    """
+    for chunk in pd.read_csv(path, delimiter=delimiter, quoting=quoting, chunksize=chunk_size,
+                             usecols=[text_column, label_column]):
+        chunk = chunk.dropna()
+        yield chunk[text_column].astype(str).tolist(), chunk[label_column].to_numpy()
+
+
+POSITIVE_WORDS = ("fantastic amazing great excellent superb love brilliant outstanding incredible perfect "
+                  "wonderful delicious friendly tasty best recommend").split()
+NEGATIVE_WORDS = ("terrible awful worst boring hate waste poor disappointing bad weak horrible failed "
+                  "cold overpriced slow wasted").split()
+NEUTRAL_WORDS = ("the movie film food service place was is this it and with plot acting story script "
+                 "not very really i we our time back go").split()
+
+
+def make_labeled_reviews(n_documents: int, random_state: int = 42) -> Tuple[List[str], np.ndarray]:
+    """
+    Generate synthetic labeled reviews for benchmarking
+
+    Args:
+        n_documents (int): Number of reviews
+        random_state (int): Random seed
+
+    Returns:
+        Tuple[List[str], np.ndarray]: Reviews and 0/1 labels
+    """
+    rng = np.random.default_rng(random_state)
+    labels = rng.integers(2, size=n_documents)
+    pools = [np.array(NEGATIVE_WORDS + NEUTRAL_WORDS * 2, dtype=object),
+             np.array(POSITIVE_WORDS + NEUTRAL_WORDS * 2, dtype=object)]
+
+    texts = []
+    for label, length in zip(labels, rng.integers(5, 20, size=n_documents)):
+        pool = pools[label]
+        texts.append(' '.join(pool[rng.integers(len(pool), size=length)]))
+    return texts, labels
+
+
+def main():
+    """
+    Command line entry point: sparse and streaming training on synthetic reviews
+    """
+    parser = argparse.ArgumentParser(description="Sparse and out-of-core text classification")
+    parser.add_argument('--documents', type=int, default=200_000)
+    parser.add_argument('--chunk-size', type=int, default=50_000)
+    args = parser.parse_args()
+
+    texts, labels = make_labeled_reviews(args.documents)
+    print(f"📝 {len(texts):,} synthetic reviews")
+
+    for model in ['multinomial_nb', 'logistic_regression']:
+        result = SparseTextClassifier(model=model).evaluate(texts, labels)
+        print(f"📊 Sparse {model}: accuracy {result['accuracy']:.3f} | fit {result['fit_seconds']}s | "
+              f"test matrix {result['test_matrix_mb']} MB (dense: {result['dense_equivalent_mb']} MB)")
+
+    n_train = int(len(texts) * 0.8)
+    train_chunks = ((texts[i:min(i + args.chunk_size, n_train)], labels[i:min(i + args.chunk_size, n_train)])
+                    for i in range(0, n_train, args.chunk_size))
+    start_time = time.perf_counter()
+    streaming = StreamingTextClassifier(model='sgd').fit_stream(train_chunks, classes=[0, 1])
+    fit_seconds = time.perf_counter() - start_time
+    accuracy = streaming.score_stream([(texts[n_train:], labels[n_train:])])
+    print(f"🌊 Streaming SGD: accuracy {accuracy:.3f} | fit {fit_seconds:.2f}s over "
+          f"{streaming.n_documents_:,} documents in chunks of {args.chunk_size:,}")
+
+if __name__ == "__main__":
+    main()
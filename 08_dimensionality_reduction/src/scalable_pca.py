@@ -0,0 +1,381 @@
+"""
+Scalable PCA
+
+01_principal_component_analysis.ipynb standardizes wine_data.csv and fits a
+full-SVD PCA(n_components=2) on the whole matrix in memory. This module fits
+the same projection on feature matrices that do not fit in RAM:
+
+1. Data is read in row chunks from an array, a memory-mapped .npy file, a
+   Parquet file or any iterable of chunks
+2. The StandardScaler statistics are accumulated in one streaming pass
+3. 'randomized' solver: randomized subspace iteration on the covariance
+   operator; every power iteration is one pass computing sum(A_cᵀ (A_c Q))
+   over chunks, so only d x (k + oversamples) matrices are ever held
+4. 'incremental' solver: scikit-learn's IncrementalPCA fed chunk by chunk
+5. The fitted scaler and components are a few small arrays saved to .npz,
+   so new batches are projected without touching the training data
+
+Usage:
+    python scalable_pca.py
+    python scalable_pca.py --rows 2000000 --cols 500 --components 10
+"""
+
+import time
+import argparse
+import tempfile
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from typing import Iterator, Sequence, Union
+from sklearn.decomposition import PCA, IncrementalPCA
+
+DEFAULT_DATA_PATH = Path(__file__).parent.parent / "data" / "wine_data.csv"
+
+SOLVERS = ('randomized', 'incremental', 'full')
+
+
+def iter_chunks(source, chunk_rows: int = 100_000, columns: Sequence[str] = None) -> Iterator[np.ndarray]:
+    """
+    Row chunks of a feature matrix
+
+    Args:
+        source: np.ndarray, path to a .npy (memory-mapped) or .parquet file,
+            or an iterable of 2D chunks
+        chunk_rows (int): Rows per chunk (array, .npy and Parquet sources)
+        columns (Sequence[str]): Parquet columns to read (default: all)
+
+    Returns:
+        Iterator[np.ndarray]: float64 chunks
+    """
+    if isinstance(source, (str, Path)):
+        path = Path(source)
+        if path.suffix == '.npy':
+            source = np.load(path, mmap_mode='r')
+        elif path.suffix == '.parquet':
+            import pyarrow.parquet as pq
+
+            for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_rows, columns=columns):
+                yield np.column_stack([column.to_numpy(zero_copy_only=False) for column in batch.columns]
+                                      ).astype(np.float64)
+            return
+        else:
+            raise ValueError(f"Unsupported file type '{path.suffix}' (expected .npy or .parquet)")
+
+    if isinstance(source, np.ndarray):
+        for start in range(0, len(source), chunk_rows):
+            yield np.asarray(source[start:start + chunk_rows], dtype=np.float64)
+    else:
+        for chunk in source:
+            yield np.asarray(chunk, dtype=np.float64)
+
+
+class ScalablePCA:
+    """
+    Out-of-core standardize + PCA with randomized, incremental or full solvers
+    """
+
+    def __init__(self, n_components: int = 2, solver: str = 'randomized', standardize: bool = True,
+                 chunk_rows: int = 100_000, n_oversamples: int = 10, n_iter: int = 4, random_state: int = 0):
+        """
+        Initialize the reducer
+
+        Args:
+            n_components (int): Principal components to keep
+            solver (str): 'randomized', 'incremental' or 'full' (in-memory reference)
+            standardize (bool): Scale features to unit variance first, as the notebook does
+            chunk_rows (int): Rows per chunk
+            n_oversamples (int): Extra random directions of the randomized solver
+            n_iter (int): Power iterations (data passes) of the randomized solver
+            random_state (int): Random seed
+        """
+        if solver not in SOLVERS:
+            raise ValueError(f"Unknown solver '{solver}'. Choose from {list(SOLVERS)}")
+
+        self.n_components = n_components
+        self.solver = solver
+        self.standardize = standardize
+        self.chunk_rows = chunk_rows
+        self.n_oversamples = n_oversamples
+        self.n_iter = n_iter
+        self.random_state = random_state
+
+    def _chunks(self, source, columns: Sequence[str] = None) -> Iterator[np.ndarray]:
+        """Centered (and scaled) chunks of the source"""
+        for chunk in iter_chunks(source, self.chunk_rows, columns):
+            yield (chunk - self.mean_) / self.scale_
+
+    def fit(self, source, columns: Sequence[str] = None) -> 'ScalablePCA':
+        """
+        Fit the scaler and the components
+
+        Args:
+            source: Array, .npy / .parquet path, or a re-iterable collection of chunks
+            columns (Sequence[str]): Parquet columns to use
+
+        Returns:
+            ScalablePCA: self, with mean_, scale_, components_ and explained_variance_ratio_
+        """
+        if isinstance(source, Iterator):
+            raise ValueError("Fitting reads the data several times; pass a file, "
+                             "an array or a list of chunks rather than a one-shot iterator")
+        start_time = time.perf_counter()
+        self._fit_scaler(source, columns)
+
+        if self.solver == 'full':
+            X = np.vstack(list(self._chunks(source, columns)))
+            pca = PCA(n_components=self.n_components, svd_solver='full').fit(X)
+            self.components_ = pca.components_
+            self.explained_variance_ = pca.explained_variance_
+        elif self.solver == 'incremental':
+            pca = IncrementalPCA(n_components=self.n_components)
+            # partial_fit needs at least n_components rows per call
+            for block in _min_row_blocks(self._chunks(source, columns), self.n_components):
+                if len(block) < self.n_components:
+                    raise ValueError(f"The incremental solver needs at least n_components={self.n_components} rows")
+                pca.partial_fit(block)
+            self.components_ = pca.components_
+            self.explained_variance_ = pca.explained_variance_
+        else:
+            self._fit_randomized(source, columns)
+
+        self.components_ = _flip_signs(self.components_)
+        self.explained_variance_ratio_ = self.explained_variance_ / self.total_variance_
+        self.fit_seconds_ = time.perf_counter() - start_time
+        return self
+
+    def _fit_scaler(self, source, columns: Sequence[str]):
+        """One pass: row count, mean, standard deviation and total variance"""
+        n_rows, total, squares, shift = 0, 0.0, 0.0, None
+        for chunk in iter_chunks(source, self.chunk_rows, columns):
+            if len(chunk) == 0:
+                continue
+            # Shifted sums keep the variance accurate for features far from zero
+            if shift is None:
+                shift = chunk[0]
+            centered = chunk - shift
+            n_rows += len(chunk)
+            total = total + centered.sum(axis=0)
+            squares = squares + (centered ** 2).sum(axis=0)
+
+        if n_rows < 2:
+            raise ValueError(f"PCA needs at least 2 rows, got {n_rows}")
+
+        self.n_samples_ = n_rows
+        self.mean_ = shift + total / n_rows
+        variance = np.maximum(squares / n_rows - (total / n_rows) ** 2, 0.0)
+        if self.standardize:
+            self.scale_ = np.where(variance > 0, np.sqrt(variance), 1.0)
+        else:
+            self.scale_ = np.ones_like(variance)
+        # Total variance of the (scaled) data, with PCA's n - 1 normalization
+        self.total_variance_ = float((variance / self.scale_ ** 2).sum() * n_rows / (n_rows - 1))
+
+    def _fit_randomized(self, source, columns: Sequence[str]):
+        """Randomized subspace iteration with one data pass per power iteration"""
+        rng = np.random.default_rng(self.random_state)
+        n_features = len(self.mean_)
+        width = min(self.n_components + self.n_oversamples, n_features)
+
+        Q = np.linalg.qr(rng.normal(size=(n_features, width)))[0]
+        for _ in range(self.n_iter):
+            Q = np.linalg.qr(self._covariance_product(source, columns, Q))[0]
+
+        # Rayleigh-Ritz: exact eigenpairs of the covariance restricted to span(Q)
+        projected = Q.T @ self._covariance_product(source, columns, Q)
+        eigenvalues, eigenvectors = np.linalg.eigh((projected + projected.T) / 2)
+        order = np.argsort(eigenvalues)[::-1][:self.n_components]
+        self.components_ = (Q @ eigenvectors[:, order]).T
+        self.explained_variance_ = eigenvalues[order]
+
+    def _covariance_product(self, source, columns: Sequence[str], Q: np.ndarray) -> np.ndarray:
+        """Covariance matrix times Q, accumulated chunk by chunk"""
+        product = np.zeros_like(Q)
+        for chunk in self._chunks(source, columns):
+            product += chunk.T @ (chunk @ Q)
+        return product / (self.n_samples_ - 1)
+
+    def transform(self, X: np.ndarray) -> np.ndarray:
+        """
+        Project a batch onto the components
+
+        Args:
+            X (np.ndarray): Raw (unscaled) rows
+
+        Returns:
+            np.ndarray: (n, n_components) scores
+        """
+        return ((np.asarray(X, dtype=np.float64) - self.mean_) / self.scale_) @ self.components_.T
+
+    def transform_chunks(self, source, columns: Sequence[str] = None) -> Iterator[np.ndarray]:
+        """
+        Project a large source chunk by chunk
+
+        Args:
+            source: Array, .npy / .parquet path or iterable of chunks
+            columns (Sequence[str]): Parquet columns to use
+
+        Returns:
+            Iterator[np.ndarray]: Scores per chunk
+        """
+        for chunk in iter_chunks(source, self.chunk_rows, columns):
+            yield self.transform(chunk)
+
+    def save(self, path: Union[str, Path]):
+        """
+        Save the fitted projection to an .npz file
+
+        Args:
+            path: Output file
+        """
+        np.savez(path, mean=self.mean_, scale=self.scale_, components=self.components_,
+                 explained_variance=self.explained_variance_,
+                 explained_variance_ratio=self.explained_variance_ratio_, solver=self.solver)
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> 'ScalablePCA':
+        """
+        Load a projection saved with save()
+
+        Args:
+            path: .npz file
+
+        Returns:
+            ScalablePCA: Ready to transform
+        """
+        with np.load(path) as data:
+            pca = cls(n_components=len(data['components']), solver=str(data['solver']))
+            pca.mean_, pca.scale_, pca.components_ = data['mean'], data['scale'], data['components']
+            pca.explained_variance_ = data['explained_variance']
+            pca.explained_variance_ratio_ = data['explained_variance_ratio']
+        return pca
+
+
+def _min_row_blocks(chunks: Iterator[np.ndarray], min_rows: int) -> Iterator[np.ndarray]:
+    """
+    Regroup chunks into blocks of at least min_rows rows (unless the whole source is shorter)
+
+    Short chunks are merged with the following ones, and each block is held
+    back one step so a short tail is appended to the last block instead of
+    being dropped.
+    """
+    buffered, count, held = [], 0, None
+    for chunk in chunks:
+        buffered.append(chunk)
+        count += len(chunk)
+        if count >= min_rows:
+            if held is not None:
+                yield held
+            held = np.vstack(buffered)
+            buffered, count = [], 0
+    if buffered:
+        tail = np.vstack(buffered)
+        held = tail if held is None else np.vstack([held, tail])
+    if held is not None:
+        yield held
+
+
+def _flip_signs(components: np.ndarray) -> np.ndarray:
+    """Make the largest-magnitude loading of every component positive, for comparable results"""
+    signs = np.sign(components[np.arange(len(components)), np.abs(components).argmax(axis=1)])
+    return components * signs[:, None]
+
+
+def subspace_similarity(A: np.ndarray, B: np.ndarray) -> float:
+    """
+    Mean squared cosine of the principal angles between two component sets (1.0 = same subspace)
+
+    Args:
+        A (np.ndarray): (k, d) orthonormal rows
+        B (np.ndarray): (k, d) orthonormal rows
+
+    Returns:
+        float: Similarity in [0, 1]
+    """
+    return float(np.mean(np.linalg.svd(A @ B.T, compute_uv=False) ** 2))
+
+
+def make_feature_matrix(path: Union[str, Path], n_rows: int, n_cols: int, rank: int = 20, noise: float = 0.5,
+                        chunk_rows: int = 100_000, random_state: int = 0) -> Path:
+    """
+    Write a low-rank-plus-noise float32 matrix to a .npy file chunk by chunk
+
+    Args:
+        path: Output .npy file
+        n_rows (int): Rows
+        n_cols (int): Columns
+        rank (int): Rank of the signal
+        noise (float): Noise standard deviation
+        chunk_rows (int): Rows generated at a time
+        random_state (int): Random seed
+
+    Returns:
+        Path: The written file
+    """
+    rng = np.random.default_rng(random_state)
+    loadings = rng.normal(size=(rank, n_cols)) * np.linspace(3, 0.5, rank)[:, None]
+    offsets = rng.normal(scale=10, size=n_cols)
+    matrix = np.lib.format.open_memmap(path, mode='w+', dtype=np.float32, shape=(n_rows, n_cols))
+    for start in range(0, n_rows, chunk_rows):
+        rows = min(chunk_rows, n_rows - start)
+        matrix[start:start + rows] = (rng.normal(size=(rows, rank)) @ loadings + offsets
+                                      + rng.normal(scale=noise, size=(rows, n_cols)))
+    matrix.flush()
+    return Path(path)
+
+
+def benchmark(path: Union[str, Path], n_components: int = 10, chunk_rows: int = 100_000) -> pd.DataFrame:
+    """
+    Compare the streaming solvers with the in-memory full SVD
+
+    Args:
+        path: .npy feature matrix
+        n_components (int): Components to fit
+        chunk_rows (int): Rows per chunk
+
+    Returns:
+        pd.DataFrame: Seconds, explained variance and subspace similarity to the full solver per solver
+    """
+    rows, reference = [], None
+    for solver in ('full', 'randomized', 'incremental'):
+        pca = ScalablePCA(n_components, solver=solver, chunk_rows=chunk_rows).fit(path)
+        reference = pca.components_ if reference is None else reference
+        rows.append({
+            'solver': solver,
+            'seconds': pca.fit_seconds_,
+            'explained_variance': pca.explained_variance_ratio_.sum(),
+            'similarity_to_full': subspace_similarity(pca.components_, reference)
+        })
+    return pd.DataFrame(rows).round(6)
+
+
+def main():
+    """
+    Command line entry point: the wine notebook, then a large synthetic matrix
+    """
+    parser = argparse.ArgumentParser(description="Randomized and incremental PCA on chunked data")
+    parser.add_argument('--data', default=str(DEFAULT_DATA_PATH))
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--cols', type=int, default=200)
+    parser.add_argument('--components', type=int, default=10)
+    args = parser.parse_args()
+
+    from sklearn.model_selection import train_test_split
+    from sklearn.linear_model import LogisticRegression
+
+    dataset = pd.read_csv(args.data)
+    X = dataset.iloc[:, :-1].values
+    y = dataset.iloc[:, -1].values
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=0)
+    for solver in SOLVERS:
+        pca = ScalablePCA(n_components=2, solver=solver, chunk_rows=32).fit(X_train)
+        classifier = LogisticRegression(random_state=0).fit(pca.transform(X_train), y_train)
+        print(f"🍷 Wine, {solver:<11} PCA: explained variance {pca.explained_variance_ratio_.sum():.4f}, "
+              f"accuracy {classifier.score(pca.transform(X_test), y_test):.4f}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = make_feature_matrix(Path(tmp) / 'features.npy', args.rows, args.cols)
+        print(f"📦 {args.rows:,} x {args.cols} float32 matrix ({path.stat().st_size / 1e9:.2f} GB on disk)")
+        print(benchmark(path, args.components).to_string(index=False))
+
+if __name__ == "__main__":
+    main()
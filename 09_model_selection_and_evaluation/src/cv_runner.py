@@ -0,0 +1,217 @@
+"""
+Leakage-Safe Cross-Validation Runner
+
+01_k_fold_cross_validation.ipynb scales the whole training set before
+cross_val_score(cv=10), so every validation fold has already been seen by
+the StandardScaler, and the folds are fit one after another. This runner:
+
+1. Puts the preprocessing inside a Pipeline, so each fold fits its own
+   transformers on its own training rows only
+2. Memoizes the fitted transformers per fold on disk (joblib Memory), so
+   repeated experiments on the same folds skip the preprocessing fits
+3. Runs the folds in parallel
+4. Reports per-fold fit / score wall time next to the score mean and std
+
+Usage:
+    python cv_runner.py
+    python cv_runner.py --scale 50 --workers 4
+"""
+
+import time
+import argparse
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from typing import Dict, Sequence, Tuple, Union
+from joblib import Memory, Parallel, delayed
+from sklearn.base import BaseEstimator, clone
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import StandardScaler
+from sklearn.metrics import check_scoring
+from sklearn.model_selection import check_cv, cross_val_score
+from sklearn.svm import SVC
+from sklearn.neighbors import KNeighborsClassifier
+from sklearn.linear_model import LogisticRegression
+
+try:
+    from .kernel_search import DEFAULT_DATA_PATH, load_ads
+except ImportError:
+    from kernel_search import DEFAULT_DATA_PATH, load_ads
+
+DEFAULT_CACHE_DIR = Path(__file__).parent.parent / "cache" / "cv"
+
+
+def _run_fold(pipeline: Pipeline, X: np.ndarray, y: np.ndarray, train: np.ndarray, test: np.ndarray,
+              fold: int, scoring) -> Dict:
+    """
+    Fit and score the pipeline on one fold
+
+    Returns:
+        Dict: fold, score, fit and score seconds
+    """
+    model = clone(pipeline)
+    scorer = check_scoring(model, scoring=scoring)
+
+    start_time = time.perf_counter()
+    model.fit(X[train], y[train])
+    fit_seconds = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    score = scorer(model, X[test], y[test])
+    score_seconds = time.perf_counter() - start_time
+
+    return {'fold': fold, 'score': float(score), 'fit_seconds': fit_seconds, 'score_seconds': score_seconds}
+
+
+class CrossValidationRunner:
+    """
+    Parallel k-fold cross-validation with per-fold preprocessing and a transformer cache
+    """
+
+    def __init__(self, preprocessing: Sequence[Tuple[str, BaseEstimator]] = None, cv=10, n_jobs: int = -1,
+                 scoring: str = 'accuracy', cache_dir: Union[str, Path, None] = DEFAULT_CACHE_DIR):
+        """
+        Initialize the runner
+
+        Args:
+            preprocessing: (name, transformer) steps fit inside every fold (default: StandardScaler)
+            cv: Number of folds, or a scikit-learn CV splitter
+            n_jobs (int): Folds fit in parallel, as in joblib
+            scoring (str): Scikit-learn scoring name
+            cache_dir: Directory of the fitted-transformer cache (None disables caching)
+        """
+        self.preprocessing = list(preprocessing) if preprocessing is not None else [('scaler', StandardScaler())]
+        self.cv = cv
+        self.n_jobs = n_jobs
+        self.scoring = scoring
+        self.cache_dir = cache_dir
+        self.memory = Memory(str(cache_dir), verbose=0) if cache_dir is not None else None
+        self.history = []
+
+    def pipeline(self, estimator: BaseEstimator) -> Pipeline:
+        """
+        Preprocessing steps followed by the estimator, with the transformer cache attached
+
+        Args:
+            estimator (BaseEstimator): Unfitted model
+
+        Returns:
+            Pipeline: Unfitted pipeline
+        """
+        steps = [(name, clone(step)) for name, step in self.preprocessing]
+        return Pipeline(steps + [('model', clone(estimator))], memory=self.memory)
+
+    def run(self, estimator: BaseEstimator, X: np.ndarray, y: np.ndarray, name: str = None) -> pd.DataFrame:
+        """
+        Cross-validate one estimator
+
+        Args:
+            estimator (BaseEstimator): Unfitted model
+            X (np.ndarray): Unscaled training features
+            y (np.ndarray): Training labels
+            name (str): Label in the history (default: the estimator's repr)
+
+        Returns:
+            pd.DataFrame: One row per fold with score, fit and score seconds
+        """
+        X, y = np.asarray(X), np.asarray(y)
+        folds = check_cv(self.cv, y, classifier=True).split(X, y)
+        pipeline = self.pipeline(estimator)
+
+        start_time = time.perf_counter()
+        results = Parallel(n_jobs=self.n_jobs)(
+            delayed(_run_fold)(pipeline, X, y, train, test, fold, self.scoring)
+            for fold, (train, test) in enumerate(folds))
+        wall_seconds = time.perf_counter() - start_time
+
+        results = pd.DataFrame(results)
+        results.insert(0, 'model', name or repr(estimator))
+        self.history.append({**self.summarize(results), 'wall_seconds': wall_seconds})
+        return results
+
+    @staticmethod
+    def summarize(results: pd.DataFrame) -> Dict:
+        """
+        Aggregate the folds of one run
+
+        Args:
+            results (pd.DataFrame): Output of run
+
+        Returns:
+            Dict: Score mean / std and total / mean fold times
+        """
+        return {
+            'model': results['model'].iloc[0],
+            'score_mean': results['score'].mean(),
+            'score_std': results['score'].std(ddof=0),
+            'fit_seconds_total': results['fit_seconds'].sum(),
+            'fit_seconds_mean': results['fit_seconds'].mean(),
+            'score_seconds_mean': results['score_seconds'].mean()
+        }
+
+    def report(self) -> pd.DataFrame:
+        """
+        Summaries of every run so far
+
+        Returns:
+            pd.DataFrame: One row per run
+        """
+        return pd.DataFrame(self.history).round(4)
+
+    def clear_cache(self):
+        """Delete every cached transformer"""
+        if self.memory is not None:
+            self.memory.clear(warn=False)
+
+
+def leaky_cross_val_score(estimator: BaseEstimator, X: np.ndarray, y: np.ndarray, cv=10) -> np.ndarray:
+    """
+    Reference: the notebook's approach, scaling all training rows before splitting
+
+    Args:
+        estimator (BaseEstimator): Unfitted model
+        X (np.ndarray): Unscaled training features
+        y (np.ndarray): Training labels
+        cv: Number of folds
+
+    Returns:
+        np.ndarray: Accuracy per fold
+    """
+    return cross_val_score(estimator, StandardScaler().fit_transform(X), y, cv=cv)
+
+
+def main():
+    """
+    Command line entry point: the notebook's models on Social Network Ads
+    """
+    parser = argparse.ArgumentParser(description="Leakage-safe parallel cross-validation")
+    parser.add_argument('--data', default=str(DEFAULT_DATA_PATH))
+    parser.add_argument('--scale', type=int, default=1, help="Replicate the training set (with jitter)")
+    parser.add_argument('--folds', type=int, default=10)
+    parser.add_argument('--workers', type=int, default=-1)
+    parser.add_argument('--cache-dir', default=str(DEFAULT_CACHE_DIR))
+    args = parser.parse_args()
+
+    X_train, _, y_train, _ = load_ads(args.data, scale=args.scale, standardize=False)
+    models = {
+        'Kernel SVM': SVC(kernel='rbf', random_state=0),
+        'K-NN': KNeighborsClassifier(n_neighbors=5),
+        'Logistic Regression': LogisticRegression(random_state=0)
+    }
+    print(f"📊 {len(y_train):,} training rows, {args.folds} folds")
+
+    leaky = leaky_cross_val_score(models['Kernel SVM'], X_train, y_train, args.folds)
+    print(f"⚠️ Notebook (scaler fit on all rows): {leaky.mean() * 100:.2f} % ± {leaky.std() * 100:.2f} %")
+
+    runner = CrossValidationRunner(cv=args.folds, n_jobs=args.workers, cache_dir=args.cache_dir)
+    runner.clear_cache()
+    for name, model in models.items():
+        runner.run(model, X_train, y_train, name)
+    # Repeat the experiment: the fold scalers now come from the cache
+    runner.run(models['Kernel SVM'], X_train, y_train, 'Kernel SVM (cached)')
+
+    print("✅ Leakage-safe cross-validation:")
+    print(runner.report().to_string(index=False))
+
+if __name__ == "__main__":
+    main()
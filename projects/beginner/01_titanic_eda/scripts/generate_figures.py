@@ -21,11 +21,14 @@ import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
-from scipy.stats import chi2_contingency
 import os
+import sys
 import warnings
 warnings.filterwarnings('ignore')
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+from significance import batch_chi2_test
+
 def setup_matplotlib():
     """Configure matplotlib for high-quality output"""
     plt.rcParams['figure.dpi'] = 300
@@ -184,21 +187,10 @@ def generate_statistical_summary(df_clean):
         if feature in df_clean.columns:
             categorical_features.append(feature)
     
-    chi2_results = []
-    p_values = []
-    effect_sizes = []
-
-    for feature in categorical_features:
-        contingency_table = pd.crosstab(df_clean[feature], df_clean['Survived'])
-        chi2, p_value, dof, expected = chi2_contingency(contingency_table)
-        
-        # Calculate Cramér's V (effect size)
-        n = contingency_table.sum().sum()
-        cramers_v = np.sqrt(chi2 / (n * (min(contingency_table.shape) - 1)))
-        
-        chi2_results.append(chi2)
-        p_values.append(p_value)
-        effect_sizes.append(cramers_v)
+    # One vectorized pass over all features instead of a crosstab per feature
+    results = batch_chi2_test(df_clean, categorical_features, target='Survived')
+    p_values = results['p_value'].tolist()
+    effect_sizes = results['cramers_v'].tolist()
 
     # Create visualization
     fig, axes = plt.subplots(1, 2, figsize=(14, 6))
@@ -0,0 +1,200 @@
+"""
+Titanic Dataset - Batch Significance Testing
+
+This module provides a vectorized chi-square / Cramér's V engine for screening
+many categorical features against a target in a single pass.
+
+Every feature is encoded to integer codes once, all contingency tables are
+built with one ``np.bincount`` over combined codes, and chi², p-values and
+Cramér's V are computed for all features at the same time. The results match
+``pd.crosstab`` + ``scipy.stats.chi2_contingency`` feature by feature
+(including Yates' continuity correction for 2x2 tables).
+"""
+
+import pandas as pd
+import numpy as np
+from pathlib import Path
+from scipy.stats import chi2 as chi2_distribution
+from typing import List, Optional, Tuple, Dict
+
+
+def encode_categories(df: pd.DataFrame, columns: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Encode categorical columns as integer codes
+
+    Missing values are encoded as -1 and are dropped from the contingency
+    tables, the same way ``pd.crosstab`` drops them.
+
+    Args:
+        df (pd.DataFrame): The dataset
+        columns (List[str]): Columns to encode
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: (n_rows, n_columns) code matrix and
+        the number of levels of each column
+    """
+    codes = np.empty((len(df), len(columns)), dtype=np.int64)
+    n_levels = np.empty(len(columns), dtype=np.int64)
+
+    for j, column in enumerate(columns):
+        column_codes, uniques = pd.factorize(df[column], sort=True)
+        codes[:, j] = column_codes
+        n_levels[j] = len(uniques)
+
+    return codes, n_levels
+
+
+def build_contingency_tables(codes: np.ndarray, n_levels: np.ndarray,
+                             target_codes: np.ndarray, n_target_levels: int) -> np.ndarray:
+    """
+    Build the contingency tables of every feature against the target at once
+
+    Args:
+        codes (np.ndarray): (n_rows, n_features) feature codes from encode_categories
+        n_levels (np.ndarray): Number of levels of each feature
+        target_codes (np.ndarray): (n_rows,) target codes
+        n_target_levels (int): Number of target levels
+
+    Returns:
+        np.ndarray: (n_features, max_levels, n_target_levels) table of counts,
+        zero-padded for features with fewer levels
+    """
+    n_features = codes.shape[1]
+    max_levels = int(n_levels.max()) if n_features else 0
+    cells_per_feature = max_levels * n_target_levels
+
+    valid = (codes >= 0) & (target_codes >= 0)[:, None]
+    feature_offsets = np.arange(n_features, dtype=np.int64) * cells_per_feature
+    combined = feature_offsets[None, :] + codes * n_target_levels + target_codes[:, None]
+
+    counts = np.bincount(combined[valid], minlength=n_features * cells_per_feature)
+    return counts.reshape(n_features, max_levels, n_target_levels).astype(np.float64)
+
+
+def chi2_contingency_batch(tables: np.ndarray, correction: bool = True) -> Dict[str, np.ndarray]:
+    """
+    Vectorized chi-square test of independence over a stack of tables
+
+    Empty (padding) rows and columns are ignored, matching the behaviour of
+    ``scipy.stats.chi2_contingency`` on the corresponding ``pd.crosstab``.
+
+    Args:
+        tables (np.ndarray): (n_features, n_rows, n_cols) observed counts
+        correction (bool): Apply Yates' correction when dof == 1
+
+    Returns:
+        Dict[str, np.ndarray]: chi2, p_value, dof, n and cramers_v per table
+    """
+    row_totals = tables.sum(axis=2)
+    col_totals = tables.sum(axis=1)
+    n = row_totals.sum(axis=1)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        expected = row_totals[:, :, None] * col_totals[:, None, :] / n[:, None, None]
+    expected = np.nan_to_num(expected)
+
+    observed_rows = (row_totals > 0).sum(axis=1)
+    observed_cols = (col_totals > 0).sum(axis=1)
+    dof = (observed_rows - 1) * (observed_cols - 1)
+
+    observed = tables
+    if correction:
+        # Yates' correction, applied only to tables with one degree of freedom
+        diff = expected - tables
+        adjustment = np.sign(diff) * np.minimum(0.5, np.abs(diff))
+        observed = tables + np.where((dof == 1)[:, None, None], adjustment, 0.0)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        terms = np.where(expected > 0, (observed - expected) ** 2 / expected, 0.0)
+    chi2 = terms.sum(axis=(1, 2))
+
+    chi2 = np.where(dof > 0, chi2, 0.0)
+    p_values = np.where(dof > 0, chi2_distribution.sf(chi2, np.maximum(dof, 1)), 1.0)
+
+    # Cramér's V (effect size)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        min_dim = np.minimum(observed_rows, observed_cols) - 1
+        cramers_v = np.sqrt(chi2 / (n * min_dim))
+
+    return {
+        'chi2': chi2,
+        'p_value': p_values,
+        'dof': dof,
+        'n': n,
+        'cramers_v': cramers_v
+    }
+
+
+def batch_chi2_test(df: pd.DataFrame, features: List[str], target: str = 'Survived',
+                    correction: bool = True, block_size: Optional[int] = None) -> pd.DataFrame:
+    """
+    Test every categorical feature against the target in one vectorized pass
+
+    Args:
+        df (pd.DataFrame): The dataset
+        features (List[str]): Categorical features to test
+        target (str): Target column
+        correction (bool): Apply Yates' correction to 2x2 tables
+        block_size (int): Number of features per pass. Bounds memory on very
+            wide tables; None processes all features together
+
+    Returns:
+        pd.DataFrame: One row per feature with chi2, p_value, dof, n and cramers_v
+    """
+    features = list(features)
+    target_codes, target_uniques = pd.factorize(df[target], sort=True)
+    target_codes = target_codes.astype(np.int64)
+
+    if block_size is None:
+        block_size = max(len(features), 1)
+
+    blocks = []
+    for start in range(0, len(features), block_size):
+        block = features[start:start + block_size]
+        codes, n_levels = encode_categories(df, block)
+        tables = build_contingency_tables(codes, n_levels, target_codes, len(target_uniques))
+        blocks.append(pd.DataFrame(chi2_contingency_batch(tables, correction=correction), index=block))
+
+    if not blocks:
+        return pd.DataFrame(columns=['chi2', 'p_value', 'dof', 'n', 'cramers_v'])
+
+    results = pd.concat(blocks)
+    results.index.name = 'feature'
+    return results
+
+
+def screen_features(df: pd.DataFrame, target: str = 'Survived', features: List[str] = None,
+                    alpha: float = 0.05, max_levels: int = 50,
+                    block_size: Optional[int] = 256) -> pd.DataFrame:
+    """
+    Rank candidate features by association with the target
+
+    Args:
+        df (pd.DataFrame): The dataset
+        target (str): Target column
+        features (List[str]): Features to screen (default: every column with
+            at most ``max_levels`` distinct values, excluding the target)
+        alpha (float): Significance level
+        max_levels (int): Cardinality limit for automatic feature selection
+        block_size (int): Number of features per vectorized pass
+
+    Returns:
+        pd.DataFrame: Test results sorted by Cramér's V, with a 'significant' flag
+    """
+    if features is None:
+        cardinality = df.nunique()
+        features = [col for col in df.columns
+                    if col != target and 1 < cardinality[col] <= max_levels]
+
+    results = batch_chi2_test(df, features, target=target, block_size=block_size)
+    results['significant'] = results['p_value'] < alpha
+    return results.sort_values('cramers_v', ascending=False)
+
+
+if __name__ == "__main__":
+    # Example usage
+    df = pd.read_csv(Path(__file__).parent.parent / "data" / "processed" / "titanic_cleaned.csv")
+
+    results = screen_features(df, target='Survived')
+    print("\n📊 Feature screening against 'Survived':")
+    print(results)
@@ -25,18 +25,19 @@ except ImportError:
     st.error("Please ensure all source files are in the 'src/' directory")
     st.stop()
 
+@st.cache_resource
+def get_data_manager():
+    """Share one history store (and its cached history frame) across reruns"""
+    return DataManager()
+
 class BMIApp:
     """Main BMI Calculator Application"""
     
     def __init__(self):
         self.calculator = BMICalculator()
         self.insights = HealthInsights()
-        self.data_manager = DataManager()
+        self.data_manager = get_data_manager()
         self.viz = BMIVisualizations()
-        
-        # Initialize session state
-        if 'user_data' not in st.session_state:
-            st.session_state.user_data = self.data_manager.load_user_data()
     
     def main(self):
         """Main application function"""
@@ -68,12 +69,12 @@ class BMIApp:
         st.sidebar.markdown("---")
         
         # Quick stats
-        if st.session_state.user_data:
+        summary = self.data_manager.get_summary()
+        if summary['record_count']:
             st.sidebar.subheader("📊 Quick Stats")
-            latest_record = st.session_state.user_data[-1]
-            st.sidebar.metric("Latest BMI", f"{latest_record['bmi']:.1f}")
-            st.sidebar.metric("Category", latest_record['category'])
-            st.sidebar.metric("Records", len(st.session_state.user_data))
+            st.sidebar.metric("Latest BMI", f"{summary['latest_bmi']:.1f}")
+            st.sidebar.metric("Category", summary['latest_category'])
+            st.sidebar.metric("Records", summary['record_count'])
     
     def calculator_page(self):
         """BMI Calculator main page"""
@@ -106,8 +107,8 @@ class BMIApp:
                     inches = st.number_input("Height (inches):", min_value=0, max_value=11, value=7, step=1)
                 
                 # Convert to metric
-                height_m = ((feet * 12) + inches) * 0.0254
-                weight_kg = weight_lbs * 0.453592
+                height_m = self.calculator.feet_inches_to_m(feet, inches)
+                weight_kg = self.calculator.convert_units(weight_lbs, 'lbs', 'kg')
             
             # Additional info
             age = st.number_input("Age (optional):", min_value=1, max_value=120, value=30, step=1)
@@ -168,8 +169,7 @@ class BMIApp:
             'gender': gender
         }
         
-        st.session_state.user_data.append(record)
-        self.data_manager.save_user_data(st.session_state.user_data)
+        self.data_manager.append_record(record)
         st.success("✅ Record saved to history!")
         st.rerun()
     
@@ -177,34 +177,33 @@ class BMIApp:
         """BMI tracking and history page"""
         st.title("📈 BMI Tracking Dashboard")
         
-        if not st.session_state.user_data:
+        summary = self.data_manager.get_summary()
+        if not summary['record_count']:
             st.info("🔍 No tracking data available. Calculate your BMI first to start tracking!")
             return
         
-        # Convert to DataFrame for analysis
-        df = pd.DataFrame(st.session_state.user_data)
-        df['date'] = pd.to_datetime(df['date'])
-        df = df.sort_values('date')
+        # Cached history frame, extended with new records only
+        df = self.data_manager.get_history_frame()
         
         # Display metrics
         col1, col2, col3, col4 = st.columns(4)
         
         with col1:
-            st.metric("📊 Total Records", len(df))
+            st.metric("📊 Total Records", summary['record_count'])
         
         with col2:
-            latest_bmi = df.iloc[-1]['bmi']
+            latest_bmi = summary['latest_bmi']
             st.metric("🎯 Latest BMI", f"{latest_bmi:.1f}")
         
         with col3:
-            if len(df) > 1:
-                bmi_change = df.iloc[-1]['bmi'] - df.iloc[-2]['bmi']
+            if summary['latest_change'] is not None:
+                bmi_change = summary['latest_change']
                 st.metric("📈 Change", f"{bmi_change:+.1f}", delta=f"{bmi_change:+.1f}")
             else:
                 st.metric("📈 Change", "N/A")
         
         with col4:
-            avg_bmi = df['bmi'].mean()
+            avg_bmi = summary['average_bmi']
             st.metric("📊 Average BMI", f"{avg_bmi:.1f}")
         
         # BMI history chart
@@ -238,8 +237,7 @@ class BMIApp:
         with col2:
             if st.button("🗑️ Clear All Data", type="secondary"):
                 if st.confirm("Are you sure you want to delete all data?"):
-                    st.session_state.user_data = []
-                    self.data_manager.save_user_data([])
+                    self.data_manager.clear_user_data()
                     st.success("✅ All data cleared!")
                     st.rerun()
     
@@ -0,0 +1,305 @@
+"""
+BMI Scoring API
+
+This module serves BMICalculator over HTTP without Streamlit or Plotly.
+Single-person requests are micro-batched: concurrent requests are collected
+for a few milliseconds and scored together through the vectorized batch API.
+Bulk requests are scored in chunks and streamed back as newline-delimited JSON.
+
+Endpoints:
+    GET  /health      - Liveness check
+    POST /bmi         - {"weight_kg": 70, "height_m": 1.75}
+    POST /bmi/batch   - {"records": [{"weight_kg": ..., "height_m": ...}, ...]}
+                        or one JSON record per line (read as it streams in);
+                        responds with NDJSON
+"""
+
+import json
+import math
+import asyncio
+import argparse
+import numpy as np
+from aiohttp import web
+from typing import Dict, List, Tuple
+
+try:
+    from .bmi_calculator import BMICalculator
+except ImportError:
+    from bmi_calculator import BMICalculator
+
+
+class MicroBatcher:
+    """
+    Collect concurrent single-person requests into vectorized batches
+    """
+
+    def __init__(self, calculator: BMICalculator, max_batch_size: int = 256,
+                 max_delay_ms: float = 2.0):
+        """
+        Initialize the batcher
+
+        Args:
+            calculator (BMICalculator): Calculator used for scoring
+            max_batch_size (int): Largest batch scored at once
+            max_delay_ms (float): Longest time a request waits for others to join its batch
+        """
+        self.calculator = calculator
+        self.max_batch_size = max_batch_size
+        self.max_delay = max_delay_ms / 1000
+        self._queue = None
+        self._worker = None
+
+    async def start(self):
+        """Start the background batching task"""
+        self._queue = asyncio.Queue()
+        self._worker = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Stop the background batching task"""
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+
+    async def score(self, weight_kg: float, height_m: float) -> Dict:
+        """
+        Score one person as part of the next batch
+
+        Args:
+            weight_kg (float): Weight in kilograms
+            height_m (float): Height in meters
+
+        Returns:
+            Dict: Same fields as BMICalculator.calculate_bmi
+        """
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((weight_kg, height_m, future))
+        return await future
+
+    async def _run(self):
+        """Drain the queue into batches and score them"""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_delay
+
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            weights = np.array([item[0] for item in batch], dtype=np.float64)
+            heights = np.array([item[1] for item in batch], dtype=np.float64)
+            try:
+                results = score_records(self.calculator, weights, heights)
+            except Exception as e:
+                for _, _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            for (_, _, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+
+
+def score_records(calculator: BMICalculator, weights: np.ndarray, heights: np.ndarray) -> List[Dict]:
+    """
+    Score arrays of measurements and format them like calculate_bmi
+
+    Args:
+        calculator (BMICalculator): Calculator used for scoring
+        weights (np.ndarray): Weights in kilograms
+        heights (np.ndarray): Heights in meters
+
+    Returns:
+        List[Dict]: One result per person; invalid rows carry an 'error' field
+    """
+    scores = calculator.calculate_bmi_batch(weights, heights, errors='coerce')
+    columns = {name: scores[name].tolist() for name in
+               ['bmi', 'healthy_weight_min', 'healthy_weight_max', 'weight_to_lose', 'weight_to_gain']}
+    categories = scores['category'].astype(str).tolist()
+
+    results = []
+    for i, (weight, height) in enumerate(zip(weights.tolist(), heights.tolist())):
+        # A BMI can still overflow to inf for extreme finite inputs
+        if categories[i] == 'Unknown' or not math.isfinite(columns['bmi'][i]):
+            # Non-finite inputs are sent as null: NaN and Infinity are not valid JSON
+            results.append({'weight_kg': weight if math.isfinite(weight) else None,
+                            'height_m': height if math.isfinite(height) else None,
+                            'error': 'Weight and height must be positive finite numbers'})
+            continue
+        results.append({
+            'bmi': columns['bmi'][i],
+            'category': categories[i],
+            'weight_kg': weight,
+            'height_m': height,
+            'healthy_weight_range': [columns['healthy_weight_min'][i], columns['healthy_weight_max'][i]],
+            'weight_to_lose': columns['weight_to_lose'][i],
+            'weight_to_gain': columns['weight_to_gain'][i]
+        })
+    return results
+
+
+def parse_measurements(payload: Dict) -> Tuple[float, float]:
+    """
+    Read and validate the measurements of one request
+
+    Args:
+        payload (Dict): Request JSON
+
+    Returns:
+        Tuple[float, float]: Weight in kg and height in m
+    """
+    try:
+        weight_kg = float(payload['weight_kg'])
+        height_m = float(payload['height_m'])
+    except (KeyError, TypeError, ValueError):
+        raise ValueError("Request must contain numeric 'weight_kg' and 'height_m'")
+
+    if not (math.isfinite(weight_kg) and math.isfinite(height_m)):
+        raise ValueError("Weight and height must be finite numbers")
+    if not (weight_kg > 0 and height_m > 0):
+        raise ValueError("Weight and height must be positive values")
+
+    return weight_kg, height_m
+
+
+async def handle_health(request: web.Request) -> web.Response:
+    """Liveness check"""
+    return web.json_response({'status': 'ok'})
+
+
+async def handle_bmi(request: web.Request) -> web.Response:
+    """Score a single person through the micro-batcher"""
+    try:
+        weight_kg, height_m = parse_measurements(await request.json())
+    except (ValueError, json.JSONDecodeError) as e:
+        return web.json_response({'error': str(e)}, status=400)
+
+    result = await request.app['batcher'].score(weight_kg, height_m)
+    return web.json_response(result)
+
+
+async def handle_bmi_batch(request: web.Request) -> web.StreamResponse:
+    """
+    Score many people and stream the results as NDJSON
+
+    NDJSON bodies are read line by line and scored chunk by chunk as they
+    arrive, so memory stays bounded by the chunk size. A {'records': [...]}
+    body is a single JSON document and is parsed whole.
+    """
+    chunk_size = request.app['stream_chunk_size']
+    calculator = request.app['calculator']
+
+    if request.content_type != 'application/x-ndjson':
+        try:
+            records = json.loads(await request.read())['records']
+        except (ValueError, KeyError, TypeError):
+            records = None
+        # Validate before prepare(): once headers are sent a 400 is no longer possible
+        if not isinstance(records, list):
+            return web.json_response({'error': "Body must be {'records': [...]} or NDJSON"}, status=400)
+        records = [record if isinstance(record, dict) else None for record in records]
+
+    response = web.StreamResponse(headers={'Content-Type': 'application/x-ndjson'})
+    await response.prepare(request)
+
+    async def write_chunk(chunk: List):
+        """Score one chunk of parsed records (None for unparseable lines) and send it"""
+        weights = np.array([_get_number(r, 'weight_kg') for r in chunk], dtype=np.float64)
+        heights = np.array([_get_number(r, 'height_m') for r in chunk], dtype=np.float64)
+        results = score_records(calculator, weights, heights)
+        for i, record in enumerate(chunk):
+            if record is None:
+                results[i] = {'error': 'Record is not a JSON object'}
+        await response.write(''.join(json.dumps(r, allow_nan=False) + '\n' for r in results).encode())
+
+    if request.content_type == 'application/x-ndjson':
+        chunk = []
+        async for line in request.content:
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                record = None
+            chunk.append(record if isinstance(record, dict) else None)
+            if len(chunk) == chunk_size:
+                await write_chunk(chunk)
+                chunk = []
+        if chunk:
+            await write_chunk(chunk)
+    else:
+        for start in range(0, len(records), chunk_size):
+            await write_chunk(records[start:start + chunk_size])
+
+    await response.write_eof()
+    return response
+
+
+def _get_number(record: Dict, key: str) -> float:
+    """Read a numeric field, using NaN for missing, invalid or non-finite values"""
+    try:
+        value = float(record[key])
+    except (KeyError, TypeError, ValueError):
+        return float('nan')
+    return value if math.isfinite(value) else float('nan')
+
+
+def create_app(max_batch_size: int = 256, max_delay_ms: float = 2.0,
+               stream_chunk_size: int = 10_000) -> web.Application:
+    """
+    Build the BMI scoring application
+
+    Args:
+        max_batch_size (int): Largest micro-batch for single-person requests
+        max_delay_ms (float): Longest wait for a micro-batch to fill
+        stream_chunk_size (int): Records scored per chunk in bulk requests
+
+    Returns:
+        web.Application: The aiohttp application
+    """
+    app = web.Application(client_max_size=256 * 1024 ** 2)
+    app['calculator'] = BMICalculator()
+    app['batcher'] = MicroBatcher(app['calculator'], max_batch_size, max_delay_ms)
+    app['stream_chunk_size'] = stream_chunk_size
+
+    async def start_batcher(app):
+        await app['batcher'].start()
+
+    async def stop_batcher(app):
+        await app['batcher'].stop()
+
+    app.on_startup.append(start_batcher)
+    app.on_cleanup.append(stop_batcher)
+
+    app.router.add_get('/health', handle_health)
+    app.router.add_post('/bmi', handle_bmi)
+    app.router.add_post('/bmi/batch', handle_bmi_batch)
+    return app
+
+
+def main():
+    """
+    Command line entry point for the scoring server
+    """
+    parser = argparse.ArgumentParser(description="Serve BMI scoring over HTTP")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--max-batch-size', type=int, default=256)
+    parser.add_argument('--max-delay-ms', type=float, default=2.0)
+    args = parser.parse_args()
+
+    app = create_app(max_batch_size=args.max_batch_size, max_delay_ms=args.max_delay_ms)
+    web.run_app(app, host=args.host, port=args.port)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+"""
+BMI Batch Scorer
+
+This module scores member CSV files in fixed-size chunks so that files of any
+size can be processed with bounded memory. Each chunk is converted to metric
+units and scored with the vectorized BMICalculator batch API, then appended to
+the output file before the next chunk is read.
+"""
+
+import time
+import argparse
+import pandas as pd
+from pathlib import Path
+from typing import Dict, Optional, Union
+
+try:
+    from .bmi_calculator import BMICalculator
+except ImportError:
+    from bmi_calculator import BMICalculator
+
+
+class BMIBatchScorer:
+    """
+    Stream member records through unit conversion and batch BMI scoring
+    """
+
+    # Columns written for every scored record
+    OUTPUT_COLUMNS = ['bmi', 'category', 'healthy_weight_min', 'healthy_weight_max',
+                      'weight_to_lose', 'weight_to_gain']
+
+    def __init__(self, calculator: BMICalculator = None, chunksize: int = 100_000,
+                 weight_col: str = 'weight', height_col: str = 'height',
+                 weight_unit_col: Optional[str] = 'weight_unit',
+                 height_unit_col: Optional[str] = 'height_unit',
+                 default_weight_unit: str = 'kg', default_height_unit: str = 'cm',
+                 keep_columns: bool = True):
+        """
+        Initialize the scorer
+
+        Args:
+            calculator (BMICalculator): Calculator to use (a new one by default)
+            chunksize (int): Number of rows held in memory at a time
+            weight_col (str): Column with weight values
+            height_col (str): Column with height values
+            weight_unit_col (str): Column with per-row weight units ('kg'/'lbs'),
+                or None to use default_weight_unit for every row
+            height_unit_col (str): Column with per-row height units ('m'/'cm'/'ft_in'),
+                or None to use default_height_unit for every row
+            default_weight_unit (str): Weight unit when the unit column is absent or empty
+            default_height_unit (str): Height unit when the unit column is absent or empty
+            keep_columns (bool): Copy the input columns into the output
+        """
+        self.calculator = calculator or BMICalculator()
+        self.chunksize = chunksize
+        self.weight_col = weight_col
+        self.height_col = height_col
+        self.weight_unit_col = weight_unit_col
+        self.height_unit_col = height_unit_col
+        self.default_weight_unit = default_weight_unit
+        self.default_height_unit = default_height_unit
+        self.keep_columns = keep_columns
+
+    def score_chunk(self, chunk: pd.DataFrame) -> pd.DataFrame:
+        """
+        Convert units and score one chunk of member records
+
+        Rows with missing, non-numeric or non-positive measurements, or an
+        unsupported unit, get a NaN BMI and the 'Unknown' category instead of
+        stopping the whole run.
+
+        Args:
+            chunk (pd.DataFrame): Member records
+
+        Returns:
+            pd.DataFrame: Scored records
+        """
+        weight_units = self._get_units(chunk, self.weight_unit_col, self.default_weight_unit)
+        height_units = self._get_units(chunk, self.height_unit_col, self.default_height_unit)
+
+        weight_kg = self.calculator.convert_units_batch(chunk[self.weight_col], weight_units, 'kg', errors='coerce')
+        height_m = self.calculator.convert_units_batch(chunk[self.height_col], height_units, 'm', errors='coerce')
+
+        scores = self.calculator.calculate_bmi_batch(weight_kg, height_m, errors='coerce')
+        scores.index = chunk.index
+
+        if not self.keep_columns:
+            return scores[self.OUTPUT_COLUMNS]
+
+        return pd.concat([chunk, scores[['weight_kg', 'height_m'] + self.OUTPUT_COLUMNS]], axis=1)
+
+    def score_csv(self, input_path: Union[str, Path], output_path: Union[str, Path],
+                  **read_csv_kwargs) -> Dict[str, float]:
+        """
+        Score a member CSV file chunk by chunk
+
+        Args:
+            input_path: CSV file with member records
+            output_path: CSV file to write scored records to (overwritten)
+            **read_csv_kwargs: Extra arguments passed to pd.read_csv
+
+        Returns:
+            Dict: Run summary with row counts, timing and throughput
+        """
+        output_path = Path(output_path)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+
+        start_time = time.perf_counter()
+        rows = 0
+        invalid_rows = 0
+        chunks = 0
+
+        reader = pd.read_csv(input_path, chunksize=self.chunksize, **read_csv_kwargs)
+        with open(output_path, 'w', newline='') as output_file:
+            for chunk in reader:
+                scored = self.score_chunk(chunk)
+                scored.to_csv(output_file, header=(chunks == 0), index=False)
+
+                rows += len(scored)
+                invalid_rows += int(scored['bmi'].isna().sum())
+                chunks += 1
+
+        elapsed = time.perf_counter() - start_time
+
+        return {
+            'rows': rows,
+            'invalid_rows': invalid_rows,
+            'chunks': chunks,
+            'seconds': round(elapsed, 3),
+            'rows_per_second': round(rows / elapsed, 1) if elapsed > 0 else float('inf')
+        }
+
+    def _get_units(self, chunk: pd.DataFrame, unit_col: Optional[str], default_unit: str):
+        """
+        Get the per-row units for a measurement column
+
+        Args:
+            chunk (pd.DataFrame): Member records
+            unit_col (str): Unit column name, or None
+            default_unit (str): Unit used when the column is absent or empty
+
+        Returns:
+            Unit for every row, or a single unit for the whole chunk
+        """
+        if unit_col is None or unit_col not in chunk.columns:
+            return default_unit
+
+        return chunk[unit_col].fillna(default_unit).astype(str).str.strip().to_numpy()
+
+
+def main():
+    """
+    Command line entry point for scoring a member CSV file
+    """
+    parser = argparse.ArgumentParser(description="Score BMI for every record in a CSV file")
+    parser.add_argument('input', help="Input CSV with weight/height columns")
+    parser.add_argument('output', help="Output CSV for scored records")
+    parser.add_argument('--chunksize', type=int, default=100_000, help="Rows per chunk")
+    parser.add_argument('--weight-col', default='weight')
+    parser.add_argument('--height-col', default='height')
+    parser.add_argument('--weight-unit', default='kg', help="Default weight unit (kg or lbs)")
+    parser.add_argument('--height-unit', default='cm', help="Default height unit (m, cm or ft_in)")
+    args = parser.parse_args()
+
+    scorer = BMIBatchScorer(chunksize=args.chunksize,
+                            weight_col=args.weight_col, height_col=args.height_col,
+                            default_weight_unit=args.weight_unit,
+                            default_height_unit=args.height_unit)
+    summary = scorer.score_csv(args.input, args.output)
+
+    print(f"✅ Scored {summary['rows']:,} records in {summary['chunks']} chunks")
+    print(f"⚠️ Invalid records: {summary['invalid_rows']:,}")
+    print(f"⏱️ {summary['seconds']}s ({summary['rows_per_second']:,.0f} rows/s)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+"""
+BMI API Latency Benchmark
+
+This script starts the BMI scoring API on a local port, fires concurrent
+single-person requests at it and reports p50/p99 latency and throughput.
+It then sends one bulk request and checks the streamed results against
+BMICalculator.calculate_bmi.
+
+Usage:
+    python benchmark_api.py --requests 5000 --concurrency 64
+"""
+
+import time
+import json
+import asyncio
+import argparse
+import numpy as np
+import aiohttp
+from aiohttp import web
+from typing import Dict, List
+
+try:
+    from .api import create_app
+    from .bmi_calculator import BMICalculator
+except ImportError:
+    from api import create_app
+    from bmi_calculator import BMICalculator
+
+
+def summarize_latencies(latencies: List[float], elapsed: float) -> Dict[str, float]:
+    """
+    Summarize request latencies
+
+    Args:
+        latencies (List[float]): Per-request latencies in seconds
+        elapsed (float): Wall time of the whole run in seconds
+
+    Returns:
+        Dict: p50/p90/p99/max latency in ms and requests per second
+    """
+    latencies_ms = np.array(latencies) * 1000
+    return {
+        'requests': len(latencies),
+        'p50_ms': round(float(np.percentile(latencies_ms, 50)), 3),
+        'p90_ms': round(float(np.percentile(latencies_ms, 90)), 3),
+        'p99_ms': round(float(np.percentile(latencies_ms, 99)), 3),
+        'max_ms': round(float(latencies_ms.max()), 3),
+        'requests_per_second': round(len(latencies) / elapsed, 1)
+    }
+
+
+async def run_single_requests(base_url: str, weights: np.ndarray, heights: np.ndarray,
+                              concurrency: int) -> Dict[str, float]:
+    """
+    Send single-person requests from concurrent clients
+
+    Args:
+        base_url (str): Server URL
+        weights (np.ndarray): Weights in kilograms
+        heights (np.ndarray): Heights in meters
+        concurrency (int): Number of concurrent clients
+
+    Returns:
+        Dict: Latency summary
+    """
+    latencies = []
+    next_index = 0
+    connector = aiohttp.TCPConnector(limit=concurrency)
+
+    async with aiohttp.ClientSession(connector=connector) as session:
+        async def client():
+            nonlocal next_index
+            while next_index < len(weights):
+                i = next_index
+                next_index += 1
+                payload = {'weight_kg': float(weights[i]), 'height_m': float(heights[i])}
+
+                start = time.perf_counter()
+                async with session.post(f"{base_url}/bmi", json=payload) as response:
+                    await response.json()
+                latencies.append(time.perf_counter() - start)
+
+        start_time = time.perf_counter()
+        await asyncio.gather(*(client() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start_time
+
+    return summarize_latencies(latencies, elapsed)
+
+
+async def run_bulk_request(base_url: str, weights: np.ndarray, heights: np.ndarray) -> Dict[str, float]:
+    """
+    Send one bulk request and verify the streamed results
+
+    Args:
+        base_url (str): Server URL
+        weights (np.ndarray): Weights in kilograms
+        heights (np.ndarray): Heights in meters
+
+    Returns:
+        Dict: Record count, mismatches against the scalar API and throughput
+    """
+    records = [{'weight_kg': float(w), 'height_m': float(h)} for w, h in zip(weights, heights)]
+    results = []
+
+    async with aiohttp.ClientSession() as session:
+        start_time = time.perf_counter()
+        async with session.post(f"{base_url}/bmi/batch", json={'records': records}) as response:
+            async for line in response.content:
+                if line.strip():
+                    results.append(json.loads(line))
+        elapsed = time.perf_counter() - start_time
+
+    calculator = BMICalculator()
+    mismatches = 0
+    for record, result in zip(records, results):
+        expected = calculator.calculate_bmi(record['weight_kg'], record['height_m'])
+        expected['healthy_weight_range'] = list(expected['healthy_weight_range'])
+        if expected != result:
+            mismatches += 1
+
+    return {
+        'records': len(results),
+        'mismatches': mismatches + abs(len(records) - len(results)),
+        'records_per_second': round(len(results) / elapsed, 1)
+    }
+
+
+async def run_benchmark(n_requests: int = 5000, concurrency: int = 64, n_bulk: int = 100_000,
+                        max_batch_size: int = 256, max_delay_ms: float = 2.0,
+                        port: int = 0, seed: int = 42) -> Dict[str, Dict]:
+    """
+    Start a local server and benchmark it
+
+    Args:
+        n_requests (int): Number of single-person requests
+        concurrency (int): Number of concurrent clients
+        n_bulk (int): Records in the bulk request
+        max_batch_size (int): Server micro-batch size
+        max_delay_ms (float): Server micro-batch delay
+        port (int): Port to listen on (0 picks a free port)
+        seed (int): Random seed for the generated measurements
+
+    Returns:
+        Dict: Single-request and bulk-request summaries
+    """
+    rng = np.random.default_rng(seed)
+    weights = rng.uniform(40, 150, max(n_requests, n_bulk)).round(1)
+    heights = rng.uniform(1.4, 2.1, max(n_requests, n_bulk)).round(2)
+
+    runner = web.AppRunner(create_app(max_batch_size=max_batch_size, max_delay_ms=max_delay_ms))
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', port)
+    await site.start()
+    base_url = f"http://127.0.0.1:{runner.addresses[0][1]}"
+
+    try:
+        single = await run_single_requests(base_url, weights[:n_requests], heights[:n_requests], concurrency)
+        bulk = await run_bulk_request(base_url, weights[:n_bulk], heights[:n_bulk])
+    finally:
+        await runner.cleanup()
+
+    return {'single': single, 'bulk': bulk}
+
+
+def main():
+    """
+    Command line entry point for the benchmark
+    """
+    parser = argparse.ArgumentParser(description="Benchmark the BMI scoring API on a local server")
+    parser.add_argument('--requests', type=int, default=5000)
+    parser.add_argument('--concurrency', type=int, default=64)
+    parser.add_argument('--bulk', type=int, default=100_000)
+    parser.add_argument('--max-batch-size', type=int, default=256)
+    parser.add_argument('--max-delay-ms', type=float, default=2.0)
+    args = parser.parse_args()
+
+    results = asyncio.run(run_benchmark(args.requests, args.concurrency, args.bulk,
+                                        args.max_batch_size, args.max_delay_ms))
+
+    single, bulk = results['single'], results['bulk']
+    print(f"📊 Single requests: {single['requests']:,} @ concurrency {args.concurrency}")
+    print(f"   p50: {single['p50_ms']} ms | p90: {single['p90_ms']} ms | p99: {single['p99_ms']} ms")
+    print(f"   Throughput: {single['requests_per_second']:,.0f} requests/s")
+    print(f"📦 Bulk request: {bulk['records']:,} records at {bulk['records_per_second']:,.0f} records/s")
+
+    if bulk['mismatches']:
+        print(f"❌ {bulk['mismatches']} results differ from BMICalculator.calculate_bmi")
+    else:
+        print("✅ Streamed results match BMICalculator.calculate_bmi")
+
+if __name__ == "__main__":
+    main()
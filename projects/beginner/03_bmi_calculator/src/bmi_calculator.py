@@ -5,7 +5,36 @@ This module contains the BMI calculation functions and related utilities.
 """
 
 import math
-from typing import Dict, Tuple
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from functools import lru_cache
+from scipy.special import ndtr, ndtri
+from typing import Dict, Tuple, Union
+
+ArrayLike = Union[np.ndarray, pd.Series, list, float]
+
+# CDC 2000 BMI-for-age LMS parameters (2-20 years) with the 2022 extended
+# percentile sigma, stored as a (sex, age, [age_months, L, M, S, sigma]) array
+# with sex 0 = male and 1 = female
+REFERENCE_TABLE_PATH = Path(__file__).parent.parent / "data" / "cdc_bmi_for_age_lms.npy"
+
+Z_95TH_PERCENTILE = 1.6448536269514722
+
+@lru_cache(maxsize=None)
+def load_bmi_reference_tables(path: str = str(REFERENCE_TABLE_PATH)) -> np.ndarray:
+    """
+    Load the BMI-for-age reference tables (cached once per process)
+    
+    Args:
+        path (str): Path to the .npy reference table
+        
+    Returns:
+        np.ndarray: Read-only (2, n_ages, 5) LMS table
+    """
+    tables = np.load(path)
+    tables.setflags(write=False)
+    return tables
 
 class BMICalculator:
     """
@@ -22,6 +51,11 @@ class BMICalculator:
         'Obesity Class III': (40.0, float('inf'))
     }
     
+    # Precomputed lookup tables for the vectorized batch API
+    CATEGORY_NAMES = tuple(BMI_CATEGORIES)
+    CATEGORY_EDGES = np.array([max_val for _, max_val in BMI_CATEGORIES.values()][:-1])
+    UNKNOWN_CATEGORY_CODE = -1
+    
     def __init__(self):
         pass
     
@@ -60,6 +94,96 @@ class BMICalculator:
         
         return result
     
+    def calculate_bmi_batch(self, weight_kg: Union[ArrayLike, pd.DataFrame], height_m: ArrayLike = None,
+                            weight_col: str = 'weight_kg', height_col: str = 'height_m',
+                            errors: str = 'raise') -> pd.DataFrame:
+        """
+        Calculate BMI and health categories for many people at once
+        
+        Every output column is computed with whole-array NumPy operations and
+        matches ``calculate_bmi`` for the same inputs exactly.
+        
+        Args:
+            weight_kg: Weights in kilograms, or a DataFrame holding both columns
+            height_m: Heights in meters (ignored when a DataFrame is passed)
+            weight_col (str): Weight column name when a DataFrame is passed
+            height_col (str): Height column name when a DataFrame is passed
+            errors (str): 'raise' to reject non-positive values like the scalar
+                API, 'coerce' to return NaN / 'Unknown' for those rows
+            
+        Returns:
+            pd.DataFrame: One row per person with bmi, category, category_code,
+            healthy weight range and weight to lose/gain
+        """
+        index = None
+        if isinstance(weight_kg, pd.DataFrame):
+            index = weight_kg.index
+            weight_kg, height_m = weight_kg[weight_col], weight_kg[height_col]
+        elif isinstance(weight_kg, pd.Series):
+            index = weight_kg.index
+        
+        weight = np.asarray(weight_kg, dtype=np.float64).ravel()
+        height = np.asarray(height_m, dtype=np.float64).ravel()
+        if weight.shape != height.shape:
+            raise ValueError("Weight and height arrays must have the same length")
+        
+        invalid = ~((weight > 0) & (height > 0))
+        if invalid.any():
+            if errors == 'raise':
+                raise ValueError(f"Weight and height must be positive values "
+                                 f"({int(invalid.sum())} invalid rows)")
+            weight = np.where(invalid, np.nan, weight)
+            height = np.where(invalid, np.nan, height)
+        
+        height_sq = height ** 2
+        bmi = weight / height_sq
+        category_codes = self.get_bmi_category_codes(bmi)
+        
+        weight_to_lose = np.where(bmi > 25, _round_half_even(weight - 24.9 * height_sq, 1), 0.0)
+        weight_to_gain = np.where(bmi < 18.5, _round_half_even(18.5 * height_sq - weight, 1), 0.0)
+        
+        return pd.DataFrame({
+            'bmi': _round_half_even(bmi, 1),
+            'category': self.get_bmi_category_labels(category_codes),
+            'category_code': category_codes,
+            'weight_kg': weight,
+            'height_m': height,
+            'healthy_weight_min': _round_half_even(18.5 * height_sq, 1),
+            'healthy_weight_max': _round_half_even(24.9 * height_sq, 1),
+            'weight_to_lose': weight_to_lose,
+            'weight_to_gain': weight_to_gain
+        }, index=index)
+    
+    def get_bmi_category_codes(self, bmi: ArrayLike) -> np.ndarray:
+        """
+        Vectorized BMI category lookup
+        
+        Args:
+            bmi: Unrounded BMI values
+            
+        Returns:
+            np.ndarray: Index into CATEGORY_NAMES for each value, or
+            UNKNOWN_CATEGORY_CODE for NaN and negative values
+        """
+        bmi = np.asarray(bmi, dtype=np.float64)
+        codes = np.searchsorted(self.CATEGORY_EDGES, bmi, side='right').astype(np.int8)
+        codes[~(bmi >= 0)] = self.UNKNOWN_CATEGORY_CODE
+        return codes
+    
+    def get_bmi_category_labels(self, category_codes: np.ndarray) -> pd.Categorical:
+        """
+        Convert category codes into a categorical array of names
+        
+        Args:
+            category_codes (np.ndarray): Codes from get_bmi_category_codes
+            
+        Returns:
+            pd.Categorical: Category names, including 'Unknown' for invalid rows
+        """
+        categories = list(self.CATEGORY_NAMES) + ['Unknown']
+        codes = np.where(category_codes < 0, len(self.CATEGORY_NAMES), category_codes)
+        return pd.Categorical.from_codes(codes, categories=categories)
+    
     def _get_bmi_category(self, bmi: float) -> str:
         """
         Determine BMI category based on value
@@ -115,69 +239,273 @@ class BMICalculator:
         else:
             return 0.0
     
-    def convert_units(self, value: float, from_unit: str, to_unit: str) -> float:
+    # Unit conversion factors: (from_unit, to_unit) -> (factor, divide)
+    UNIT_CONVERSIONS = {
+        ('lbs', 'kg'): (0.453592, False),
+        ('kg', 'lbs'): (0.453592, True),
+        ('ft_in', 'm'): (0.0254, False),  # value should be total inches
+        ('m', 'ft_in'): (0.0254, True),   # returns total inches
+        ('cm', 'm'): (100, True),
+        ('m', 'cm'): (100, False)
+    }
+    
+    def convert_units(self, value: ArrayLike, from_unit: str, to_unit: str) -> ArrayLike:
         """
         Convert between different units
         
         Args:
-            value (float): Value to convert
+            value: Value (or list / NumPy array of values) to convert
             from_unit (str): Source unit
             to_unit (str): Target unit
             
         Returns:
-            float: Converted value
-        """
-        conversions = {
-            ('lbs', 'kg'): lambda x: x * 0.453592,
-            ('kg', 'lbs'): lambda x: x / 0.453592,
-            ('ft_in', 'm'): lambda x: x * 0.0254,  # x should be total inches
-            ('m', 'ft_in'): lambda x: x / 0.0254,  # returns total inches
-            ('cm', 'm'): lambda x: x / 100,
-            ('m', 'cm'): lambda x: x * 100
-        }
+            Converted value, with the same shape as the input (lists become arrays)
+        """
+        if not np.isscalar(value):
+            value = np.asarray(value, dtype=np.float64)
+        factor, divide = self._get_conversion(from_unit, to_unit)
+        return value / factor if divide else value * factor
+    
+    def convert_units_batch(self, values: ArrayLike, from_units: Union[str, ArrayLike],
+                            to_unit: str, errors: str = 'raise') -> np.ndarray:
+        """
+        Convert a whole column of values that may be in mixed units
+        
+        Each distinct source unit is looked up once, so the cost does not
+        depend on the number of rows.
+        
+        Args:
+            values: Values to convert
+            from_units: Source unit for every value, or a single unit for all
+            to_unit (str): Target unit
+            errors (str): 'raise' to reject missing or unsupported units and
+                non-numeric values, 'coerce' to return NaN for those rows
+            
+        Returns:
+            np.ndarray: Converted values
+        """
+        if errors == 'coerce':
+            values = pd.to_numeric(pd.Series(np.asarray(values, dtype=object).ravel()), errors='coerce')
+            values = values.to_numpy(dtype=np.float64)
+        else:
+            values = np.asarray(values, dtype=np.float64)
+        if isinstance(from_units, str):
+            try:
+                return self.convert_units(values, from_units, to_unit)
+            except ValueError:
+                if errors == 'raise':
+                    raise
+                return np.full(values.shape, np.nan)
+        
+        unit_codes, units = pd.factorize(np.asarray(from_units).ravel())
+        if errors == 'raise' and (unit_codes < 0).any():
+            raise ValueError("Missing unit for some values")
+        
+        multipliers = np.full(len(units) + 1, np.nan)
+        divisors = np.ones(len(units) + 1)
+        for i, unit in enumerate(units):
+            try:
+                factor, divide = self._get_conversion(unit, to_unit)
+            except ValueError:
+                if errors == 'raise':
+                    raise
+                continue
+            multipliers[i], divisors[i] = (1.0, factor) if divide else (factor, 1.0)
+        
+        # Code -1 (missing unit) picks the trailing NaN slot
+        return values * multipliers[unit_codes] / divisors[unit_codes]
+    
+    def feet_inches_to_m(self, feet: ArrayLike, inches: ArrayLike) -> ArrayLike:
+        """
+        Convert a height given in feet and inches to meters
+        
+        Args:
+            feet: Whole feet
+            inches: Remaining inches
+            
+        Returns:
+            Height in meters
+        """
+        return self.convert_units((feet * 12) + inches, 'ft_in', 'm')
+    
+    def _get_conversion(self, from_unit: str, to_unit: str) -> Tuple[float, bool]:
+        """
+        Look up the precomputed conversion factor between two units
+        
+        Args:
+            from_unit (str): Source unit
+            to_unit (str): Target unit
+            
+        Returns:
+            Tuple[float, bool]: Factor and whether to divide by it
+        """
+        if from_unit == to_unit:
+            return (1.0, False)
         
         key = (from_unit, to_unit)
-        if key in conversions:
-            return conversions[key](value)
+        if key in self.UNIT_CONVERSIONS:
+            return self.UNIT_CONVERSIONS[key]
         else:
             raise ValueError(f"Conversion from {from_unit} to {to_unit} not supported")
     
-    def get_bmi_percentile(self, bmi: float, age: int, gender: str) -> Dict[str, any]:
+    # Rough adult percentile per BMI category (no adult reference table)
+    ADULT_CATEGORY_PERCENTILES = np.array([5, 50, 75, 85, 95, 99], dtype=np.float64)
+    
+    # CDC BMI-for-age percentile cut-offs for children and teens
+    CHILD_PERCENTILE_EDGES = np.array([5.0, 85.0, 95.0])
+    CHILD_CATEGORY_NAMES = ('Underweight', 'Healthy weight', 'Overweight', 'Obesity')
+    
+    def get_bmi_percentile(self, bmi: float, age: float, gender: str) -> Dict[str, any]:
         """
-        Get BMI percentile based on age and gender (simplified version)
+        Get BMI percentile based on age and gender
+        
+        Ages 2-19 use the CDC BMI-for-age reference; adults, and 18-19 year
+        olds without a Male/Female reference, get an estimate from their BMI
+        category.
         
         Args:
             bmi (float): BMI value
-            age (int): Age in years
-            gender (str): Gender ('Male', 'Female', or other)
+            age (float): Age in years
+            gender (str): Gender ('Male', 'Female', or other; other genders aged
+                18-19 get the adult estimate)
             
         Returns:
             Dict: Percentile information
         """
-        # This is a simplified implementation
-        # In a real application, you would use actual percentile data
+        result = self.get_bmi_percentile_batch([bmi], [age], [gender])
+        percentile = result['percentile'].iat[0]
+        reference = result['reference'].iat[0]
         
-        if age < 18:
-            return {'percentile': None, 'note': 'Percentile calculation not available for under 18'}
+        if reference != 'unavailable' and np.isnan(percentile):
+            return {'percentile': None, 'note': 'Percentile calculation requires a valid BMI'}
         
-        # Rough estimates for adult percentiles
-        percentile_ranges = {
-            'Underweight': 5,
-            'Normal weight': 50,
-            'Overweight': 75,
-            'Obesity Class I': 85,
-            'Obesity Class II': 95,
-            'Obesity Class III': 99
-        }
+        if reference == 'cdc_2000':
+            group = 'boys' if self._encode_sex([gender])[0] == 0 else 'girls'
+            return {
+                'percentile': round(float(percentile), 1),
+                'z_score': round(float(result['z_score'].iat[0]), 2),
+                'category': result['child_category'].iat[0],
+                'note': 'CDC BMI-for-age percentile',
+                'interpretation': f'Your BMI is higher than approximately {percentile:.0f}% of {group} your age'
+            }
         
-        category = self._get_bmi_category(bmi)
-        estimated_percentile = percentile_ranges.get(category, 50)
+        if reference == 'adult_estimate':
+            estimated_percentile = int(percentile)
+            return {
+                'percentile': estimated_percentile,
+                'note': 'Estimated percentile for adults',
+                'interpretation': f'Your BMI is higher than approximately {estimated_percentile}% of adults'
+            }
         
-        return {
-            'percentile': estimated_percentile,
-            'note': 'Estimated percentile for adults',
-            'interpretation': f'Your BMI is higher than approximately {estimated_percentile}% of adults'
-        }
+        if age < 2:
+            return {'percentile': None, 'note': 'Percentile calculation not available for under 2'}
+        return {'percentile': None, 'note': 'Percentile calculation for ages 2-17 requires Male or Female gender'}
+    
+    def get_bmi_percentile_batch(self, bmi: ArrayLike, age: ArrayLike, gender: ArrayLike) -> pd.DataFrame:
+        """
+        Vectorized BMI percentiles for many people at once
+        
+        LMS parameters are found by binary search on the age grid and
+        linearly interpolated between the neighbouring ages. BMIs above the
+        95th percentile use the CDC 2022 extended percentiles.
+        
+        Args:
+            bmi: BMI values
+            age: Ages in years
+            gender: Genders ('Male'/'Female'; anything else has no child percentile)
+            
+        Returns:
+            pd.DataFrame: percentile, z_score, child_category and reference
+            ('cdc_2000', 'adult_estimate' or 'unavailable') per person
+        """
+        bmi = np.asarray(bmi, dtype=np.float64).ravel()
+        age_months = np.asarray(age, dtype=np.float64).ravel() * 12
+        sex = self._encode_sex(gender)
+        
+        tables = load_bmi_reference_tables()
+        age_grid = tables[0, :, 0]
+        
+        # 18-19 year olds without a Male/Female reference keep the adult estimate
+        is_adult = (age_months >= 240) | ((age_months >= 216) & (sex < 0))
+        is_child = (age_months >= age_grid[0]) & ~is_adult & (sex >= 0)
+        
+        # Binary search on the age grid and interpolate L, M, S and sigma
+        months = np.clip(age_months, age_grid[0], age_grid[-1])
+        upper = np.clip(np.searchsorted(age_grid, months, side='right'), 1, len(age_grid) - 1)
+        lower = upper - 1
+        weight = ((months - age_grid[lower]) / (age_grid[upper] - age_grid[lower]))[:, None]
+        
+        sex_index = np.where(sex >= 0, sex, 0)
+        params = tables[sex_index, lower, 1:] * (1 - weight) + tables[sex_index, upper, 1:] * weight
+        L, M, S, sigma = params.T
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            z_scores = np.where(L != 0, ((bmi / M) ** L - 1) / (L * S), np.log(bmi / M) / S)
+            percentiles = ndtr(z_scores) * 100
+            
+            bmi_95th = M * (1 + L * S * Z_95TH_PERCENTILE) ** (1 / L)
+            extended = bmi >= bmi_95th
+            percentiles = np.where(extended, 90 + 10 * ndtr((bmi - bmi_95th) / sigma), percentiles)
+            z_scores = np.where(extended, ndtri(np.minimum(percentiles / 100, np.nextafter(1, 0))), z_scores)
+        
+        category_codes = self.get_bmi_category_codes(bmi)
+        adult_percentiles = np.where(category_codes >= 0,
+                                     self.ADULT_CATEGORY_PERCENTILES[np.clip(category_codes, 0, None)],
+                                     np.nan)
+        
+        percentiles = np.select([is_child, is_adult], [percentiles, adult_percentiles], np.nan)
+        z_scores = np.where(is_child, z_scores, np.nan)
+        
+        child_codes = np.where(is_child & np.isfinite(percentiles), np.searchsorted(self.CHILD_PERCENTILE_EDGES, percentiles, side='right'), -1)
+        reference_codes = np.select([is_child, is_adult], [0, 1], 2)
+        
+        return pd.DataFrame({
+            'percentile': percentiles,
+            'z_score': z_scores,
+            'child_category': pd.Categorical.from_codes(child_codes, categories=list(self.CHILD_CATEGORY_NAMES)),
+            'reference': pd.Categorical.from_codes(reference_codes,
+                                                   categories=['cdc_2000', 'adult_estimate', 'unavailable'])
+        })
+    
+    def _encode_sex(self, gender: ArrayLike) -> np.ndarray:
+        """
+        Encode genders as reference table rows
+        
+        Args:
+            gender: Gender labels
+            
+        Returns:
+            np.ndarray: 0 for male, 1 for female, -1 otherwise
+        """
+        labels = pd.Series(np.asarray(gender, dtype=object).ravel()).astype(str).str.strip().str.lower()
+        return labels.map({'male': 0, 'm': 0, 'female': 1, 'f': 1}).fillna(-1).to_numpy(dtype=np.int64)
+
+def _round_half_even(values: np.ndarray, decimals: int) -> np.ndarray:
+    """
+    Round an array exactly like Python's built-in round()
+    
+    np.round scales by 10**decimals before rounding, which can disagree with
+    round() for values sitting next to a .5 boundary. Those few values are
+    re-rounded with round() so batch results always match the scalar API.
+    
+    Args:
+        values (np.ndarray): Values to round
+        decimals (int): Number of decimal places
+        
+    Returns:
+        np.ndarray: Rounded values
+    """
+    values = np.asarray(values, dtype=np.float64)
+    rounded = np.round(values, decimals)
+    
+    scaled = values * 10 ** decimals
+    near_tie = np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6
+    if near_tie.any():
+        rounded[near_tie] = [round(float(v), decimals) for v in values[near_tie]]
+    
+    return rounded
+
+_default_calculator = BMICalculator()
 
 def calculate_bmi_simple(weight_kg: float, height_m: float) -> float:
     """
@@ -190,8 +518,7 @@ def calculate_bmi_simple(weight_kg: float, height_m: float) -> float:
     Returns:
         float: BMI value
     """
-    calculator = BMICalculator()
-    result = calculator.calculate_bmi(weight_kg, height_m)
+    result = _default_calculator.calculate_bmi(weight_kg, height_m)
     return result['bmi']
 
 if __name__ == "__main__":
@@ -210,4 +537,10 @@ if __name__ == "__main__":
     result3 = calculator.calculate_bmi(50, 1.75)
     print(f"Test 3 - BMI: {result3['bmi']}, Category: {result3['category']}")
     
+    # Test case 4: Batch API matches the scalar API
+    batch = calculator.calculate_bmi_batch([70, 85, 50], [1.75, 1.75, 1.75])
+    assert list(batch['bmi']) == [result1['bmi'], result2['bmi'], result3['bmi']]
+    assert list(batch['category']) == [result1['category'], result2['category'], result3['category']]
+    print(f"Test 4 - Batch BMI: {list(batch['bmi'])}")
+    
     print("✅ BMI Calculator tests completed!")
\ No newline at end of file
@@ -0,0 +1,313 @@
+"""
+BMI History Data Manager
+
+This module stores the user's BMI history in an append-only SQLite database
+(WAL mode) indexed by date. Saving a record is a single insert, summary
+statistics are maintained incrementally on every insert, and the history
+DataFrame is extended with new rows only instead of being rebuilt.
+"""
+
+import json
+import sqlite3
+import threading
+import pandas as pd
+from pathlib import Path
+from datetime import datetime
+from typing import Dict, List, Optional, Union
+
+DEFAULT_DATA_DIR = Path(__file__).parent.parent / "data"
+
+
+class DataManager:
+    """
+    A class to handle storage and retrieval of BMI history
+    """
+
+    # Number of records in the precomputed rolling BMI mean
+    ROLLING_WINDOW = 7
+
+    RECORD_FIELDS = ['date', 'bmi', 'category', 'age', 'gender']
+
+    def __init__(self, db_path: Union[str, Path] = None, legacy_json_path: Union[str, Path] = None):
+        """
+        Initialize the data manager
+
+        Args:
+            db_path: SQLite database file (default: data/user_data.db)
+            legacy_json_path: JSON history imported once into an empty
+                database (default: data/user_data.json)
+        """
+        self.db_path = Path(db_path) if db_path else DEFAULT_DATA_DIR / "user_data.db"
+        self.legacy_json_path = Path(legacy_json_path) if legacy_json_path else DEFAULT_DATA_DIR / "user_data.json"
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._create_schema()
+
+        # Incrementally maintained history frame
+        self._history = None
+        self._history_last_id = 0
+
+        self._import_legacy_json()
+
+    def _create_schema(self):
+        """Create the records and summary tables if they don't exist"""
+        with self._lock, self._conn:
+            self._conn.executescript("""
+                CREATE TABLE IF NOT EXISTS records (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    date TEXT NOT NULL,
+                    bmi REAL NOT NULL,
+                    category TEXT,
+                    age INTEGER,
+                    gender TEXT,
+                    bmi_change REAL,
+                    rolling_bmi_mean REAL
+                );
+                CREATE INDEX IF NOT EXISTS idx_records_date ON records (date);
+                CREATE TABLE IF NOT EXISTS summary (
+                    id INTEGER PRIMARY KEY CHECK (id = 1),
+                    record_count INTEGER NOT NULL,
+                    bmi_sum REAL NOT NULL,
+                    bmi_min REAL,
+                    bmi_max REAL,
+                    latest_bmi REAL,
+                    latest_category TEXT,
+                    latest_change REAL,
+                    latest_date TEXT
+                );
+                INSERT OR IGNORE INTO summary (id, record_count, bmi_sum) VALUES (1, 0, 0.0);
+            """)
+
+    def _import_legacy_json(self):
+        """Import an existing JSON history once, if the database is empty"""
+        if self.get_summary()['record_count'] > 0 or not self.legacy_json_path.exists():
+            return
+
+        try:
+            with open(self.legacy_json_path, 'r') as f:
+                records = json.load(f)
+        except (json.JSONDecodeError, OSError):
+            return
+
+        self.append_records(records)
+
+    def append_record(self, record: Dict) -> int:
+        """
+        Append one BMI record to the history
+
+        Args:
+            record (Dict): Record with date, bmi, category, age and gender
+
+        Returns:
+            int: Id of the stored record
+        """
+        return self.append_records([record])[-1]
+
+    def append_records(self, records: List[Dict]) -> List[int]:
+        """
+        Append BMI records in a single transaction
+
+        The change from the previous record, the rolling BMI mean and the
+        summary row are updated as each record is inserted, so reads never
+        have to scan the history. "Previous" means previous by date, so a
+        back-dated record also refreshes the records that follow it.
+
+        Args:
+            records (List[Dict]): Records to append, oldest first
+
+        Returns:
+            List[int]: Ids of the stored records
+        """
+        ids = []
+        with self._lock, self._conn:
+            for record in records:
+                record_date = record.get('date') or datetime.now().isoformat()
+                if isinstance(record_date, datetime):
+                    record_date = record_date.isoformat()
+                bmi = float(record['bmi'])
+
+                cursor = self._conn.execute(
+                    "INSERT INTO records (date, bmi, category, age, gender) VALUES (?, ?, ?, ?, ?)",
+                    (record_date, bmi, record.get('category'), record.get('age'), record.get('gender'))
+                )
+                self._update_derived(record_date, cursor.lastrowid)
+                self._conn.execute(
+                    """
+                    UPDATE summary SET
+                        record_count = record_count + 1,
+                        bmi_sum = bmi_sum + :bmi,
+                        bmi_min = MIN(COALESCE(bmi_min, :bmi), :bmi),
+                        bmi_max = MAX(COALESCE(bmi_max, :bmi), :bmi)
+                    WHERE id = 1
+                    """,
+                    {'bmi': bmi}
+                )
+                ids.append(cursor.lastrowid)
+
+            if ids:
+                # The latest record by date, which is not necessarily the last inserted
+                latest = self._conn.execute(
+                    "SELECT bmi, category, bmi_change, date FROM records ORDER BY date DESC, id DESC LIMIT 1"
+                ).fetchone()
+                self._conn.execute(
+                    "UPDATE summary SET latest_bmi = ?, latest_category = ?, latest_change = ?, latest_date = ? "
+                    "WHERE id = 1", tuple(latest)
+                )
+
+        return ids
+
+    def _update_derived(self, record_date: str, record_id: int):
+        """
+        Compute bmi_change and rolling_bmi_mean for a new record and the records after it
+
+        Records are ordered by (date, id). For a record appended in date order
+        only the record itself is updated; a back-dated record also changes the
+        next ROLLING_WINDOW - 1 records, whose windows now include it.
+        """
+        affected = self._conn.execute(
+            "SELECT id, date, bmi FROM records WHERE date > ? OR (date = ? AND id >= ?) "
+            "ORDER BY date, id LIMIT ?",
+            (record_date, record_date, record_id, self.ROLLING_WINDOW)
+        ).fetchall()
+
+        for row in affected:
+            recent = [previous['bmi'] for previous in self._conn.execute(
+                "SELECT bmi FROM records WHERE date < ? OR (date = ? AND id < ?) "
+                "ORDER BY date DESC, id DESC LIMIT ?",
+                (row['date'], row['date'], row['id'], self.ROLLING_WINDOW - 1)
+            )]
+            bmi_change = row['bmi'] - recent[0] if recent else None
+            rolling_mean = (row['bmi'] + sum(recent)) / (len(recent) + 1)
+            self._conn.execute("UPDATE records SET bmi_change = ?, rolling_bmi_mean = ? WHERE id = ?",
+                               (bmi_change, rolling_mean, row['id']))
+
+    def load_user_data(self) -> List[Dict]:
+        """
+        Load the full BMI history as a list of records
+
+        Returns:
+            List[Dict]: Records ordered by date
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {', '.join(self.RECORD_FIELDS)} FROM records ORDER BY date, id"
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def save_user_data(self, records: List[Dict]):
+        """
+        Replace the whole history with the given records
+
+        Use append_record for new measurements; this is only needed when
+        rewriting history, e.g. to clear it.
+
+        Args:
+            records (List[Dict]): Records to store
+        """
+        self.clear_user_data()
+        if records:
+            self.append_records(records)
+
+    def clear_user_data(self):
+        """Delete all stored records"""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM records")
+            self._conn.execute(
+                "UPDATE summary SET record_count = 0, bmi_sum = 0.0, bmi_min = NULL, bmi_max = NULL, "
+                "latest_bmi = NULL, latest_category = NULL, latest_change = NULL, latest_date = NULL "
+                "WHERE id = 1"
+            )
+            self._history = None
+            self._history_last_id = 0
+
+    def get_summary(self) -> Dict:
+        """
+        Get the precomputed history summary
+
+        Returns:
+            Dict: record_count, average_bmi, min/max BMI and the latest record's
+            BMI, category, change and date
+        """
+        with self._lock:
+            row = dict(self._conn.execute("SELECT * FROM summary WHERE id = 1").fetchone())
+
+        row.pop('id')
+        bmi_sum = row.pop('bmi_sum')
+        row['average_bmi'] = bmi_sum / row['record_count'] if row['record_count'] else None
+        return row
+
+    def query_range(self, start: Optional[Union[str, datetime]] = None,
+                    end: Optional[Union[str, datetime]] = None) -> pd.DataFrame:
+        """
+        Get the records between two dates using the date index
+
+        Args:
+            start: Earliest date (inclusive), or None for no lower bound
+            end: Latest date (exclusive), or None for no upper bound
+
+        Returns:
+            pd.DataFrame: Matching records ordered by date
+        """
+        conditions, params = [], []
+        if start is not None:
+            conditions.append("date >= ?")
+            params.append(start.isoformat() if isinstance(start, datetime) else str(start))
+        if end is not None:
+            conditions.append("date < ?")
+            params.append(end.isoformat() if isinstance(end, datetime) else str(end))
+
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        with self._lock:
+            df = pd.read_sql_query(f"SELECT * FROM records {where} ORDER BY date, id",
+                                   self._conn, params=params)
+        return self._parse_dates(df)
+
+    def get_history_frame(self) -> pd.DataFrame:
+        """
+        Get the full history as a DataFrame with parsed dates
+
+        The frame is cached and only records added since the last call are
+        read and parsed. If a new record is dated before the cached rows, the
+        frame is reloaded, since the change and rolling mean of the rows after
+        it were recomputed. The whole read-modify-write holds the lock, so
+        sessions sharing this manager never append the same rows twice.
+
+        Returns:
+            pd.DataFrame: History ordered by date, including bmi_change and
+            rolling_bmi_mean
+        """
+        with self._lock:
+            new_rows = pd.read_sql_query("SELECT * FROM records WHERE id > ? ORDER BY id",
+                                         self._conn, params=(self._history_last_id,))
+
+            if self._history is None or not new_rows.empty:
+                new_rows = self._parse_dates(new_rows)
+                if self._history is None or self._history.empty:
+                    history = new_rows
+                elif new_rows['date'].min() < self._history['date'].iloc[-1]:
+                    history = self._parse_dates(pd.read_sql_query("SELECT * FROM records", self._conn))
+                else:
+                    history = pd.concat([self._history, new_rows], ignore_index=True)
+
+                if not new_rows.empty:
+                    self._history_last_id = int(new_rows['id'].max())
+                    if not history['date'].is_monotonic_increasing:
+                        history = history.sort_values(['date', 'id'], ignore_index=True)
+                self._history = history
+
+            return self._history
+
+    def _parse_dates(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Parse the ISO date column (date-only legacy values mix with full timestamps)"""
+        df['date'] = pd.to_datetime(df['date'], format='ISO8601')
+        return df
+
+    def close(self):
+        """Close the database connection"""
+        with self._lock:
+            self._conn.close()